@@ -1,8 +1,10 @@
 from dpongpy.model import Pong, Config, Direction
 from dpongpy.log import logger, logging
-from dpongpy.view import ShowNothingPongView
+from dpongpy.view import PongView, ShowNothingPongView, ScreenPongView, FramePublisher
+from dpongpy.controller import EventQueue
 from dpongpy.controller.local import ActionMap
 import pygame
+import threading
 from dataclasses import dataclass, field
 from typing import Optional, Collection, Iterable
 
@@ -15,8 +17,50 @@ class Settings:
     fps: int = 60
     host: Optional[str] = None
     port: Optional[int] = None
+    codec: str = 'json'
+    keyframe_interval: int = 60 # snapshots between two full snapshots sent to all peers
+    snapshot_rate: Optional[int] = None # if None, the coordinator sends a snapshot at each frame
+    interpolation_delay: Optional[float] = None # if not None, terminals render remote objects this many seconds in the past
     initial_paddles: Collection[Direction] = (Direction.LEFT, Direction.RIGHT)
     gui: bool = True
+    dirty_rects: bool = False # if True, only the regions of the screen where objects moved are redrawn at each frame
+    pipelined: bool = False # if True, the game runs in a thread of its own, while the main thread shows its frames
+    tick_rate: Optional[int] = None # if None, the game is updated once per frame, with variable time steps
+    max_ticks_per_frame: int = 5
+    max_lag_compensation: float = 0.2 # how far back in time (seconds) the coordinator may apply paddle inputs
+    client_prediction: bool = True # if True, terminals move their own paddle without waiting for the coordinator
+    max_rooms: int = 0 # if positive, the coordinator hosts up to this many independent matches (rooms) at once
+    workers: int = 0 # if positive, rooms are spread among this many coordinator processes
+    directory: Optional[str] = None # host:port of the directory which coordinators report to, and terminals ask for rooms
+    room: Optional[str] = None # the room terminals join, on multi-room coordinators
+    upstream: Optional[str] = None # host:port of the coordinator (or relay) which relays follow
+    journal: Optional[str] = None # file which coordinators record matches into (prefix of one file per match, for multi-room ones)
+    ingress_capacity: int = 1024 # events the coordinator may buffer between two frames, before refusing paddle moves
+    use_asyncio: bool = False # if True, the coordinator serves the network and the game loop with a single asyncio event loop
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate: float, max_ticks_per_frame: int = 5):
+        assert tick_rate > 0, "Tick rate must be positive"
+        assert max_ticks_per_frame > 0, "Max ticks per frame must be positive"
+        self.step = 1 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+
+    def advance(self, dt: float) -> int:
+        self.accumulator += dt
+        ticks = int(self.accumulator // self.step)
+        if ticks > self.max_ticks_per_frame:
+            # too far behind: drop the backlog, rather than spiralling into ever longer frames
+            ticks = self.max_ticks_per_frame
+            self.accumulator %= self.step
+        else:
+            self.accumulator -= ticks * self.step
+        return ticks
+
+    @property
+    def interpolation(self) -> float:
+        return min(self.accumulator / self.step, 1.0)
 
 
 class PongGame:
@@ -28,16 +72,26 @@ class PongGame:
             paddles=self.settings.initial_paddles
         )
         self.dt = None
-        self.view = self.create_view() if self.settings.gui else ShowNothingPongView(self.pong) 
+        self.timestep = FixedTimestep(self.settings.tick_rate, self.settings.max_ticks_per_frame) \
+            if self.settings.tick_rate else None
+        self.view: PongView
+        self.screen: Optional[ScreenPongView] = None
+        if self.settings.pipelined and self.settings.gui:
+            # the game is rendered into frames, which are shown on a private copy of the game
+            self.view = FramePublisher(self.pong)
+            self.screen = self.create_view(Pong(self.pong.size, self.pong.config, paddles=[]))
+        else:
+            self.view = self.create_view() if self.settings.gui else ShowNothingPongView(self.pong)
         self.clock = pygame.time.Clock()
         self.running = True
         self.controller = self.create_controller(self.settings.initial_paddles)
+        if self.screen is not None:
+            self.controller.input_queue = self.controller.event_queue = EventQueue(pump=False)
         if self.settings.debug:
             logger.setLevel(logging.DEBUG)
 
-    def create_view(self):
-        from dpongpy.view import ScreenPongView
-        return ScreenPongView(self.pong, debug=self.settings.debug)
+    def create_view(self, pong: Pong = None):
+        return ScreenPongView(pong or self.pong, debug=self.settings.debug, dirty_rects=self.settings.dirty_rects)
 
     def create_controller(game, paddle_commands: dict[Direction, ActionMap] | Iterable[Direction]):
         from dpongpy.controller.local import PongLocalController
@@ -59,20 +113,63 @@ class PongGame:
 
     def at_each_run(self):
         if self.settings.gui:
-            pygame.display.flip()
+            self.view.update_display()
 
     def run(self):
         try:
             self.dt = 0
             self.before_run()
+            if self.screen is not None:
+                self.run_pipelined()
+            else:
+                self.run_game()
+        finally:
+            self.after_run()
+
+    def run_pipelined(self):
+        # SDL wants the window and the OS events to be handled by the main thread: the game runs in another one,
+        # so that showing frames never waits for the game (e.g. for the network), and vice versa
+        game = threading.Thread(target=self.run_game, name="game", daemon=True)
+        game.start()
+        clock = pygame.time.Clock()
+        try:
+            while self.running and game.is_alive():
+                pygame.event.pump()
+                frame = self.view.take()
+                if frame is not None:
+                    self.screen.show(frame)
+                    self.screen.update_display()
+                clock.tick(self.settings.fps)
+        finally:
+            self.running = False
+            game.join()
+
+    def run_game(self):
+        try:
             while self.running:
-                self.controller.handle_inputs(self.dt)
-                self.controller.handle_events()
-                self.view.render()
-                self.at_each_run()
+                self.run_frame()
                 self.dt = self.clock.tick(self.settings.fps) / 1000
         finally:
-            self.after_run()
+            self.running = False # also stops showing frames, if the game fails
+
+    def run_frame(self):
+        if self.timestep is None:
+            self.controller.handle_inputs(self.dt)
+            self.controller.handle_events()
+            self.view.render()
+        else:
+            self.run_fixed_ticks()
+        self.at_each_run()
+
+    def run_fixed_ticks(self):
+        ticks = self.timestep.advance(self.dt)
+        self.controller.handle_inputs()
+        self.controller.handle_events()
+        for _ in range(ticks):
+            self.view.before_update()
+            self.controller.time_elapsed(self.timestep.step)
+            self.controller.handle_events()
+        self.view.render(self.timestep.interpolation)
 
     def stop(self):
         self.running = False
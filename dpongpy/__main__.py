@@ -7,13 +7,38 @@ def arg_parser():
     ap = argparse.ArgumentParser()
     ap.prog = "python -m " + dpongpy.__name__
     mode = ap.add_argument_group("mode")
-    mode.add_argument("--mode", '-m', choices=['local', 'centralised'],
-                      help="Run the game in local or centralised mode")
-    mode.add_argument("--role", '-r', required=False, choices=['coordinator', 'terminal'],
-                      help="Run the game with a central coordinator, in either coordinator or terminal role")
+    mode.add_argument("--mode", '-m', choices=['local', 'centralised', 'replay'],
+                      help="Run the game in local or centralised mode, or replay a match recorded by a coordinator")
+    mode.add_argument("--role", '-r', required=False,
+                      choices=['coordinator', 'terminal', 'spectator', 'relay', 'directory'],
+                      help="Run the game with a central coordinator, in either coordinator or terminal role, " +
+                           "or watch it as a spectator (possibly through relays, re-broadcasting it to spectators), " +
+                           "or run a directory, balancing terminals among coordinators")
     networking = ap.add_argument_group("networking")
     networking.add_argument("--host", '-H', help="Host to connect to", type=str, default="localhost")
     networking.add_argument("--port", '-p', help="Port to connect to", type=int, default=None)
+    networking.add_argument("--codec", '-c', choices=['json', 'binary'], default='json',
+                            help="Format of messages exchanged over the network (must be the same for all peers)")
+    networking.add_argument("--asyncio", help="Let the coordinator serve the network and the game with a single asyncio event loop",
+                            action="store_true", default=False)
+    networking.add_argument("--max-rooms", type=int, default=0,
+                            help="Let the coordinator host up to this many independent matches (rooms) at once")
+    networking.add_argument("--workers", type=int, default=0,
+                            help="Spread rooms among this many coordinator processes (--max-rooms applies to each of them)")
+    networking.add_argument("--directory", '-D', type=str, default=None,
+                            help="Directory (host:port) which coordinators report to, and terminals ask for a room")
+    networking.add_argument("--room", type=str, default=None,
+                            help="Room to join, on multi-room coordinators")
+    networking.add_argument("--upstream", '-U', type=str, default=None,
+                            help="Coordinator (or relay) which relays follow, as host:port")
+    networking.add_argument("--keyframe-interval", '-K', type=int, default=60,
+                            help="Number of state snapshots between two full ones (the others only carry changes)")
+    networking.add_argument("--snapshot-rate", '-R', type=int, default=None,
+                            help="State snapshots sent by the coordinator per second (default: one per frame), " +
+                                 "or asked for by spectators and relays")
+    networking.add_argument("--interpolation-delay", '-I', type=float, default=None,
+                            help="Let terminals render remote objects this many seconds in the past, " +
+                                 "interpolating between snapshots (e.g. 0.1 for 20 snapshots per second)")
     game = ap.add_argument_group("game")
     game.add_argument("--side", '-s', 
                       choices=[dir.name.lower() for dir in Direction.values() if dir != Direction.NONE],
@@ -24,7 +49,25 @@ def arg_parser():
     game.add_argument("--debug", '-d', help="Enable debug mode", action="store_true")
     game.add_argument("--size", '-S', help="Size of the game window", type=int, nargs=2, default=[900, 600])
     game.add_argument("--fps", '-f', help="Frames per second", type=int, default=60)
+    game.add_argument("--tick-rate", '-t', help="Game updates per second (default: one update per frame)",
+                      type=int, default=None)
     game.add_argument("--no-gui", help="Disable GUI", action="store_true", default=False)
+    game.add_argument("--journal", '-J', type=str, default=None,
+                      help="Let coordinators record matches into this file, never overwriting it " +
+                           "(multi-room ones use it as a prefix, followed by room and start time). " +
+                           "In replay mode, the file to replay")
+    game.add_argument("--seek", type=int, default=0, help="Tick to start replaying from, in replay mode")
+    game.add_argument("--pipelined", help="Run the game in a thread of its own, so that showing frames never waits for it " +
+                                          "(e.g. for the network)", action="store_true", default=False)
+    game.add_argument("--dirty-rects", help="Only redraw the regions of the window where objects moved, at each frame",
+                      action="store_true", default=False)
+    game.add_argument("--no-prediction", help="Let terminals wait for the coordinator before moving their own paddle",
+                      action="store_true", default=False)
+    game.add_argument("--max-lag-compensation", '-L', type=float, default=0.2,
+                      help="How far back in time (seconds) the coordinator may apply paddle inputs, " +
+                           "according to when terminals issued them (0 disables lag compensation)")
+    game.add_argument("--swept-collisions", help="Enable continuous collision detection (avoids tunnelling at low fps)",
+                      action="store_true", default=False)
     return ap
 
 
@@ -32,9 +75,22 @@ def args_to_settings(args):
     settings = dpongpy.Settings()
     settings.host = args.host
     settings.port = args.port
+    settings.codec = args.codec
+    settings.keyframe_interval = args.keyframe_interval
+    settings.snapshot_rate = args.snapshot_rate
+    settings.interpolation_delay = args.interpolation_delay
+    settings.use_asyncio = args.asyncio
+    settings.max_rooms = args.max_rooms
+    settings.workers = args.workers
+    settings.room = args.room
+    settings.directory = args.directory
+    settings.upstream = args.upstream
+    settings.journal = args.journal
     settings.debug = args.debug
     settings.size = tuple(args.size)
     settings.fps = args.fps
+    settings.tick_rate = args.tick_rate
+    settings.config.swept_collisions = args.swept_collisions
     if args.keys is None:
         args.keys = list(dpongpy.controller.ActionMap.all_mappings().keys())[:len(args.sides)]
     assert len(args.sides) == len(args.keys), "Number of sides and keymaps must match"
@@ -43,6 +99,10 @@ def args_to_settings(args):
         for direction, keymap in zip(args.sides, args.keys)
     }
     settings.gui = not args.no_gui
+    settings.dirty_rects = args.dirty_rects
+    settings.pipelined = args.pipelined
+    settings.client_prediction = not args.no_prediction
+    settings.max_lag_compensation = args.max_lag_compensation
     return settings
 
 
@@ -54,6 +114,10 @@ if args.mode == 'local':
         settings.initial_paddles = [Direction.LEFT, Direction.RIGHT]
     dpongpy.main(settings)
     exit(0)
+if args.mode == 'replay':
+    import dpongpy.journal
+    dpongpy.journal.main_replay(settings, args.seek)
+    exit(0)
 if args.mode == 'centralised':
     import dpongpy.remote.centralised
     if args.role == 'coordinator':
@@ -62,6 +126,15 @@ if args.mode == 'centralised':
     if args.role == 'terminal':
         dpongpy.remote.centralised.main_terminal(settings)
         exit(0)
-    print(f"Invalid role: {args.role}. Must be either 'coordinator' or 'terminal'")
+    if args.role == 'spectator':
+        dpongpy.remote.centralised.main_spectator(settings)
+        exit(0)
+    if args.role == 'relay':
+        dpongpy.remote.centralised.main_relay(settings)
+        exit(0)
+    if args.role == 'directory':
+        dpongpy.remote.centralised.main_directory(settings)
+        exit(0)
+    print(f"Invalid role: {args.role}. Must be one of 'coordinator', 'terminal', 'spectator', 'relay' or 'directory'")
 parser.print_help()
 exit(1)
@@ -0,0 +1,183 @@
+import numpy as np
+from dpongpy.model import Pong, Config, Direction, Paddle, Vector2
+from typing import Iterable
+
+
+# same order as Pong.paddles (anticlockwise, starting from left)
+PADDLE_SIDES = tuple(sorted(Paddle._admissible_directions, key=lambda side: -side.value.as_polar()[1]))
+# same order as Board.walls
+WALL_SIDES = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+
+_X, _Y = 0, 1
+
+# outcomes of Rectangle.hits, indexed by the branch of the if-elif chain which is taken (0 means no hit)
+_HIT_Y = np.array([0, -1, -1, 1, 1, 1, -1, 0, 0], dtype=float) # -1 is UP, 1 is DOWN
+_HIT_X = np.array([0, -1, 1, -1, 1, 0, 0, 1, -1], dtype=float) # -1 is LEFT, 1 is RIGHT
+
+
+def _boxes(position: np.ndarray, size: np.ndarray) -> np.ndarray:
+    half_size = size / 2
+    return np.concatenate([position - half_size, position + half_size], axis=-1)
+
+
+def _hits(subject: np.ndarray, other: np.ndarray, active: np.ndarray):
+    sl, st, sr, sb = (subject[..., i] for i in range(4))
+    ol, ot, or_, ob = (other[..., i] for i in range(4))
+    overlap = active & (sl <= or_) & (sr >= ol) & (st <= ob) & (sb >= ot)
+
+    def inside(x, y):
+        return (sl <= x) & (x <= sr) & (st <= y) & (y <= sb)
+
+    tl, tr, br, bl = inside(ol, ot), inside(or_, ot), inside(or_, ob), inside(ol, ob)
+    branch = np.select(
+        [
+            br & ~(tl | tr | bl),
+            bl & ~(tr | tl | br),
+            tr & ~(bl | br | tl),
+            tl & ~(br | bl | tr),
+            (tl & tr & ~(bl | br)) | ((st <= ot) & (ot <= sb) & (sb < ob)),
+            (bl & br & ~(tl | tr)) | ((ot < st) & (st <= ob) & (ob <= sb)),
+            (tl & bl & ~(tr | br)) | ((sl <= ol) & (ol <= sr) & (sr < or_)),
+            (tr & br & ~(tl | bl)) | ((ol < sl) & (sl <= or_) & (or_ <= sr)),
+        ],
+        range(1, 9),
+        default=0
+    )
+    branch = np.where(overlap, branch, 0)
+    if np.any(overlap & (branch == 0)):
+        raise ValueError("Invalid collision, this is likely a bug")
+    width = np.minimum(sr, or_) - np.maximum(sl, ol)
+    height = np.minimum(sb, ob) - np.maximum(st, ot)
+    return _HIT_X[branch], width, _HIT_Y[branch], height
+
+
+def _bounce(position: np.ndarray, speed: np.ndarray, subject: np.ndarray, other: np.ndarray, active: np.ndarray):
+    direction_x, width, direction_y, height = _hits(subject, other, active)
+    for axis, direction, delta in ((_Y, direction_y, height), (_X, direction_x, width)):
+        bounces = (direction != 0) & (delta > 0.0)
+        position[..., axis] = np.where(bounces, position[..., axis] - direction * delta, position[..., axis])
+        speed[..., axis] = np.where(bounces, -speed[..., axis], speed[..., axis])
+
+
+class BatchPong:
+    def __init__(self, count: int, size=(800, 600), config=None, paddles=None, random=None):
+        self._allocate(count)
+        for index in range(count):
+            self.load(index, Pong(size, config, paddles, random))
+
+    @classmethod
+    def from_pongs(cls, pongs: Iterable[Pong]) -> 'BatchPong':
+        pongs = list(pongs)
+        batch = cls.__new__(cls)
+        batch._allocate(len(pongs))
+        for index, pong in enumerate(pongs):
+            batch.load(index, pong)
+        return batch
+
+    def _allocate(self, count: int):
+        self.size = np.zeros((count, 2))
+        self.time = np.zeros(count)
+        self.updates = np.zeros(count, dtype=np.int64)
+        self.ball_size = np.zeros((count, 2))
+        self.ball_position = np.zeros((count, 2))
+        self.ball_speed = np.zeros((count, 2))
+        self.paddle_size = np.zeros((count, len(PADDLE_SIDES), 2))
+        self.paddle_position = np.zeros((count, len(PADDLE_SIDES), 2))
+        self.paddle_speed = np.zeros((count, len(PADDLE_SIDES), 2))
+        self.paddle_mask = np.zeros((count, len(PADDLE_SIDES)), dtype=bool)
+        self.walls = np.zeros((count, len(WALL_SIDES), 4))
+        self.configs: list[Config] = [Config()] * count
+
+    def __len__(self):
+        return len(self.configs)
+
+    def __repr__(self):
+        return f'<{type(self).__name__}(id={id(self)}, matches={len(self)})>'
+
+    def load(self, index: int, pong: Pong):
+        if pong.config.swept_collisions:
+            raise ValueError(f"{type(self).__name__} does not support swept collisions")
+        self.size[index] = pong.size
+        self.time[index] = pong.time
+        self.updates[index] = pong.updates
+        self.configs[index] = pong.config
+        self.ball_size[index] = pong.ball.size
+        self.ball_position[index] = pong.ball.position
+        self.ball_speed[index] = pong.ball.speed
+        self.paddle_mask[index] = False
+        for slot, side in enumerate(PADDLE_SIDES):
+            if pong.has_paddle(side):
+                paddle = pong.paddle(side)
+                self.paddle_size[index, slot] = paddle.size
+                self.paddle_position[index, slot] = paddle.position
+                self.paddle_speed[index, slot] = paddle.speed
+                self.paddle_mask[index, slot] = True
+        for slot, side in enumerate(WALL_SIDES):
+            wall = pong.board.walls[side]
+            self.walls[index, slot] = _boxes(np.array(wall.position), np.array(wall.size))
+
+    def to_pong(self, index: int) -> Pong:
+        pong = Pong(size=self.size[index].tolist(), config=self.configs[index], paddles=[])
+        pong.ball.size = Vector2(self.ball_size[index].tolist())
+        pong.ball.position = Vector2(self.ball_position[index].tolist())
+        pong.ball.speed = Vector2(self.ball_speed[index].tolist())
+        for slot, side in enumerate(PADDLE_SIDES):
+            if self.paddle_mask[index, slot]:
+                pong.add_paddle(side, Paddle(
+                    size=self.paddle_size[index, slot].tolist(),
+                    side=side,
+                    position=self.paddle_position[index, slot].tolist(),
+                    speed=self.paddle_speed[index, slot].tolist()
+                ))
+        pong.time = self.time[index].item()
+        pong.updates = self.updates[index].item()
+        return pong
+
+    def to_pongs(self) -> list[Pong]:
+        return [self.to_pong(index) for index in range(len(self))]
+
+    def move_paddle(self, index, side: Direction, direction: Direction):
+        slot = PADDLE_SIDES.index(side)
+        indexes = np.atleast_1d(np.arange(len(self))[index])
+        if not np.all(self.paddle_mask[indexes, slot]):
+            raise KeyError("No such a paddle: " + str(side))
+        if side.is_horizontal and direction.is_vertical:
+            axis = _Y
+        elif side.is_vertical and direction.is_horizontal:
+            axis = _X
+        elif direction == Direction.NONE:
+            self.paddle_speed[indexes, slot] = 0
+            return
+        else:
+            return
+        ratios = np.array([self.configs[i].paddle_speed_ratio for i in indexes])
+        self.paddle_speed[indexes, slot] = (self.size[indexes, axis] * ratios)[:, np.newaxis] * np.array(direction.value)
+
+    def stop_paddle(self, index, side: Direction):
+        self.move_paddle(index, side, Direction.NONE)
+
+    def update(self, delta_time):
+        delta_time = np.asarray(delta_time, dtype=float)
+        self.updates += 1
+        self.time += delta_time
+        delta_time = delta_time[..., np.newaxis]
+        self.ball_position += self.ball_speed * delta_time
+        self.paddle_position += self.paddle_speed * delta_time[..., np.newaxis]
+        self._handle_ball_collisions()
+        self._handle_paddle_collisions()
+
+    def _handle_ball_collisions(self):
+        everywhere = np.ones(len(self), dtype=bool)
+        for slot in range(len(PADDLE_SIDES)):
+            paddles = _boxes(self.paddle_position[:, slot], self.paddle_size[:, slot])
+            ball = _boxes(self.ball_position, self.ball_size)
+            _bounce(self.ball_position, self.ball_speed, ball, paddles, self.paddle_mask[:, slot])
+        for slot in range(len(WALL_SIDES)):
+            ball = _boxes(self.ball_position, self.ball_size)
+            _bounce(self.ball_position, self.ball_speed, ball, self.walls[:, slot], everywhere)
+
+    def _handle_paddle_collisions(self):
+        for slot in range(len(WALL_SIDES)):
+            paddles = _boxes(self.paddle_position, self.paddle_size)
+            walls = self.walls[:, np.newaxis, slot]
+            _bounce(self.paddle_position, self.paddle_speed, paddles, walls, self.paddle_mask)
@@ -1,7 +1,9 @@
 import pygame
 from dpongpy.model import *
 from dataclasses import dataclass
+from collections import deque
 from enum import Enum
+from typing import Callable, Optional
 
 
 class ControlEvent(Enum):
@@ -11,6 +13,12 @@ class ControlEvent(Enum):
     GAME_OVER = pygame.QUIT
     PADDLE_MOVE = pygame.event.custom_type()
     TIME_ELAPSED = pygame.event.custom_type()
+    SNAPSHOT_ACK = pygame.event.custom_type()
+    COORDINATOR_REPORT = pygame.event.custom_type()
+    ROOM_REQUEST = pygame.event.custom_type()
+    ROOM_ASSIGNMENT = pygame.event.custom_type()
+    PADDLE_INPUTS = pygame.event.custom_type()
+    SPECTATE = pygame.event.custom_type()
 
     @classmethod
     def all(cls) -> set['ControlEvent']:
@@ -18,18 +26,18 @@ class ControlEvent(Enum):
 
     @classmethod
     def all_types(cls) -> set[int]:
-        return {event.value for event in cls.all()}
+        return set(_CONTROL_EVENTS_BY_VALUE.keys())
 
     @classmethod
     def is_control_event(cls, event: pygame.event.Event) -> bool:
-        return any(control_event.matches(event) for control_event in cls.all())
+        return isinstance(event, pygame.event.Event) and event.type in _CONTROL_EVENTS_BY_VALUE
 
     @classmethod
     def by_value(cls, value: int) -> 'ControlEvent':
-        for control_event in cls.all():
-            if control_event.value == value:
-                return control_event
-        raise KeyError(f"{cls.__name__} with value {value} not found")
+        try:
+            return _CONTROL_EVENTS_BY_VALUE[value]
+        except KeyError:
+            raise KeyError(f"{cls.__name__} with value {value} not found")
 
     def matches(self, event) -> bool:
         if isinstance(event, pygame.event.Event):
@@ -41,6 +49,9 @@ class ControlEvent(Enum):
         return False
 
 
+_CONTROL_EVENTS_BY_VALUE: dict[int, ControlEvent] = {event.value: event for event in ControlEvent}
+
+
 class PlayerAction(Enum):
     MOVE_UP = 0
     MOVE_DOWN = 1
@@ -104,8 +115,8 @@ class ActionMap:
 def create_event(event: pygame.event.Event | ControlEvent, **kwargs):
     if isinstance(event, ControlEvent):
         event = pygame.event.Event(event.value, **kwargs)
-    elif isinstance(event, pygame.event.Event) and event.dict != kwargs:
-        data = event.dict
+    elif kwargs and isinstance(event, pygame.event.Event): # events are only copied if there is something to add
+        data = dict(event.dict)
         data.update(kwargs)
         event = pygame.event.Event(event.type, data)
     return event
@@ -117,14 +128,52 @@ def post_event(event: pygame.event.Event | ControlEvent, **kwargs):
     return event
 
 
+class EventQueue:
+    # pygame's global event queue: there is only one per process.
+    # SDL only lets the main thread pump events from the OS: other threads should read the queue with pump=False
+    def __init__(self, pump: bool = True):
+        self.pump = pump
+
+    def post(self, event: pygame.event.Event):
+        pygame.event.post(event)
+
+    def get(self, types: tuple[int, ...]) -> list[pygame.event.Event]:
+        return pygame.event.get(types, pump=self.pump)
+
+
+class LocalEventQueue(EventQueue):
+    # a private event queue, for running many games in the same process
+    def __init__(self):
+        self._events: deque[pygame.event.Event] = deque()
+
+    def __len__(self):
+        return len(self._events)
+
+    def post(self, event: pygame.event.Event):
+        self._events.append(event)
+
+    def get(self, types: tuple[int, ...]) -> list[pygame.event.Event]:
+        result: list[pygame.event.Event] = []
+        others: list[pygame.event.Event] = []
+        while self._events:
+            event = self._events.popleft()
+            (result if event.type in types else others).append(event)
+        self._events.extend(others)
+        return result
+
+
 class InputHandler:
     INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+    input_queue: EventQueue = EventQueue() # where keyboard events come from
+    event_queue: EventQueue = EventQueue()
 
     def create_event(self, event: pygame.event.Event | ControlEvent, **kwargs):
         return create_event(event, **kwargs)
 
     def post_event(self, event: pygame.event.Event | ControlEvent, **kwargs):
-        return post_event(event, **kwargs)
+        event = create_event(event, **kwargs)
+        self.event_queue.post(event)
+        return event
 
     def key_pressed(self, key: int):
         pass
@@ -141,24 +190,24 @@ class InputHandler:
 
 class EventHandler:
     GAME_EVENTS = tuple(ControlEvent.all_types())
+    event_queue: EventQueue = EventQueue()
+    # if not None, events are dispatched through the recorder, e.g. a journal recording them along with their effects
+    recorder: Optional[Callable[[Pong, pygame.event.Event, Callable[[pygame.event.Event], None]], None]] = None
 
     def __init__(self, pong: Pong):
         self._pong = pong
 
     def handle_events(self):
-        for event in pygame.event.get(self.GAME_EVENTS):
-            if ControlEvent.PLAYER_JOIN.matches(event):
-                self.on_player_join(self._pong, **event.dict)
-            elif ControlEvent.PLAYER_LEAVE.matches(event):
-                self.on_player_leave(self._pong, **event.dict)
-            elif ControlEvent.GAME_START.matches(event):
-                self.on_game_start(self._pong)
-            elif ControlEvent.GAME_OVER.matches(event):
-                self.on_game_over(self._pong)
-            elif ControlEvent.PADDLE_MOVE.matches(event):
-                self.on_paddle_move(self._pong, **event.dict)
-            elif ControlEvent.TIME_ELAPSED.matches(event):
-                self.on_time_elapsed(self._pong, **event.dict)
+        for event in self.event_queue.get(self.GAME_EVENTS):
+            if self.recorder is None:
+                self.dispatch(event)
+            else:
+                self.recorder(self._pong, event, self.dispatch)
+
+    def dispatch(self, event: pygame.event.Event):
+        handler = _HANDLERS.get(event.type)
+        if handler is not None:
+            handler(self, event)
 
     def on_player_join(self, pong: Pong, paddle_index: Direction):
         pass
@@ -177,3 +226,15 @@ class EventHandler:
 
     def on_time_elapsed(self, pong: Pong, dt: float):
         pass
+
+
+# event type -> how to hand events of that type to an EventHandler.
+# handlers are looked up by name upon each call, so that subclasses can override them
+_HANDLERS: dict[int, Callable[[EventHandler, pygame.event.Event], None]] = {
+    ControlEvent.PLAYER_JOIN.value: lambda handler, event: handler.on_player_join(handler._pong, **event.dict),
+    ControlEvent.PLAYER_LEAVE.value: lambda handler, event: handler.on_player_leave(handler._pong, **event.dict),
+    ControlEvent.GAME_START.value: lambda handler, event: handler.on_game_start(handler._pong),
+    ControlEvent.GAME_OVER.value: lambda handler, event: handler.on_game_over(handler._pong),
+    ControlEvent.PADDLE_MOVE.value: lambda handler, event: handler.on_paddle_move(handler._pong, **event.dict),
+    ControlEvent.TIME_ELAPSED.value: lambda handler, event: handler.on_time_elapsed(handler._pong, **event.dict),
+}
@@ -0,0 +1,246 @@
+import bisect
+import mmap
+import os
+import re
+import struct
+import time
+import pygame
+from pygame.event import Event
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent, EventHandler
+from dpongpy.remote.presentation import serialize, deserialize, BINARY_SERIALIZER, BINARY_DESERIALIZER
+from dpongpy.remote.delta import flatten, to_pong, apply, diff, patch
+from dpongpy.log import logger
+from typing import BinaryIO, Callable, Optional
+
+
+# a journal is a header, followed by records: each record is a kind, the tick (i.e. the number of updates of the game)
+# it was written at, and the length of its payload. ticks are just re-simulated, while other events come with their
+# effects on the game (as deltas of its state), so that randomness or lag compensation need not be re-enacted.
+# keyframes carry the whole state of the game, and a separate index file maps their ticks to their offsets
+JOURNAL_MAGIC = b'DPJ\x01'
+DEFAULT_JOURNAL_KEYFRAME_INTERVAL = 600 # ticks
+INDEX_SUFFIX = '.idx'
+
+KEYFRAME = 0
+TICK = 1
+EVENT = 2
+
+_RECORD = struct.Struct('<BII') # kind, tick, payload length
+_DT = struct.Struct('<d')
+_INDEX_ENTRY = struct.Struct('<IQ') # tick, offset
+_UNSAFE_CHARACTERS = re.compile(r'[^A-Za-z0-9_-]')
+MAX_ROOM_NAME = 64
+
+
+class MatchJournal:
+    # records the events dispatched by an event handler, once attached to it
+
+    def __init__(self, path: str, keyframe_interval: int = DEFAULT_JOURNAL_KEYFRAME_INTERVAL):
+        assert keyframe_interval > 0, "Keyframe interval must be positive"
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        # journals are never overwritten
+        self._file: BinaryIO = open(path, 'xb')
+        try:
+            self._index: BinaryIO = open(path + INDEX_SUFFIX, 'xb')
+        except OSError:
+            self._file.close()
+            os.remove(path)
+            raise
+        self._file.write(JOURNAL_MAGIC)
+        self._last_keyframe: Optional[int] = None
+        self.records = 0
+
+    def attach(self, handler: EventHandler):
+        handler.recorder = self.record
+
+    def record(self, pong: Pong, event: Event, dispatch: Callable[[Event], None]):
+        if self._last_keyframe is None:
+            self._write_keyframe(pong)
+        if ControlEvent.TIME_ELAPSED.matches(event):
+            dispatch(event)
+            self._write(TICK, pong.updates, _DT.pack(event.dt))
+            if pong.updates - self._last_keyframe >= self.keyframe_interval:
+                self._write_keyframe(pong)
+            self.flush() # a crash loses at most the events of the current tick
+        else:
+            before = flatten(pong)
+            dispatch(event)
+            effect = diff(before, flatten(pong))
+            self._write(EVENT, pong.updates, serialize([event, effect], BINARY_SERIALIZER))
+
+    def _write_keyframe(self, pong: Pong):
+        self._index.write(_INDEX_ENTRY.pack(pong.updates, self._file.tell()))
+        self._write(KEYFRAME, pong.updates, serialize(flatten(pong), BINARY_SERIALIZER))
+        self._last_keyframe = pong.updates
+
+    def _write(self, kind: int, tick: int, payload: bytes):
+        self._file.write(_RECORD.pack(kind, tick, len(payload)))
+        self._file.write(payload)
+        self.records += 1
+
+    def flush(self):
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            self._index.close()
+            logger.info(f"Journal {self.path}: {self.records} records")
+
+
+def room_journal(prefix: str, room_id: str, keyframe_interval: int = DEFAULT_JOURNAL_KEYFRAME_INTERVAL) -> MatchJournal:
+    # rooms come and go (and so do their coordinators), hence each match is named after when it started.
+    # room ids come from the network: they are stripped of anything which could escape the journals' directory
+    room = _UNSAFE_CHARACTERS.sub('_', room_id)[:MAX_ROOM_NAME]
+    name = f"{prefix}.{room}.{time.strftime('%Y%m%d-%H%M%S')}"
+    path, attempt = name, 0
+    while True:
+        try:
+            return MatchJournal(path, keyframe_interval)
+        except FileExistsError: # another match of the same room started within the same second
+            attempt += 1
+            path = f"{name}.{attempt}"
+
+
+class MatchReplay:
+    # re-simulates recorded matches, from the keyframe preceding any tick
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(JOURNAL_MAGIC)] != JOURNAL_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a match journal")
+        self.keyframes = self._load_index()
+        if not self.keyframes:
+            self.keyframes = self._scan_keyframes()
+        if not self.keyframes:
+            self.close()
+            raise ValueError(f"{path} has no keyframes")
+        self._keyframe_ticks = [tick for tick, _ in self.keyframes]
+        self.pong: Optional[Pong] = None
+        self._offset = len(JOURNAL_MAGIC)
+
+    def _load_index(self) -> list[tuple[int, int]]:
+        try:
+            with open(self.path + INDEX_SUFFIX, 'rb') as index:
+                data = index.read()
+        except FileNotFoundError:
+            return []
+        entries = [_INDEX_ENTRY.unpack_from(data, offset) # a crash may have truncated the last entry
+                   for offset in range(0, len(data) - _INDEX_ENTRY.size + 1, _INDEX_ENTRY.size)]
+        return [(tick, offset) for tick, offset in entries if self._is_complete(offset)]
+
+    def _scan_keyframes(self) -> list[tuple[int, int]]:
+        keyframes = []
+        offset = len(JOURNAL_MAGIC)
+        while self._is_complete(offset):
+            kind, tick, length = _RECORD.unpack_from(self._data, offset)
+            if kind == KEYFRAME:
+                keyframes.append((tick, offset))
+            offset += _RECORD.size + length
+        return keyframes
+
+    def _is_complete(self, offset: int) -> bool:
+        # records may be truncated by crashes
+        if offset + _RECORD.size > len(self._data):
+            return False
+        _, _, length = _RECORD.unpack_from(self._data, offset)
+        return offset + _RECORD.size + length <= len(self._data)
+
+    @property
+    def tick(self) -> Optional[int]:
+        return self.pong.updates if self.pong is not None else None
+
+    def seek(self, tick: int) -> Pong:
+        index = max(bisect.bisect_right(self._keyframe_ticks, tick) - 1, 0)
+        self.pong, self._offset = None, self.keyframes[index][1]
+        self._apply_next() # the keyframe, even if it follows tick
+        while (next_tick := self._peek_tick()) is not None and next_tick <= tick:
+            self._apply_next()
+        assert self.pong is not None
+        return self.pong
+
+    def step(self) -> bool:
+        # applies the records of the next tick, returning False once the journal is over
+        if self.pong is None:
+            self.seek(0)
+        target = self._peek_tick()
+        if target is None:
+            return False
+        while self._peek_tick() == target:
+            self._apply_next()
+        return True
+
+    def _peek_tick(self) -> Optional[int]:
+        if not self._is_complete(self._offset):
+            return None
+        _, tick, _ = _RECORD.unpack_from(self._data, self._offset)
+        return tick
+
+    def _apply_next(self):
+        kind, tick, length = _RECORD.unpack_from(self._data, self._offset)
+        start = self._offset + _RECORD.size
+        payload = self._data[start:start + length]
+        self._offset = start + length
+        if kind == KEYFRAME:
+            state = deserialize(payload, BINARY_DESERIALIZER)
+            self.pong = to_pong(state) if self.pong is None else apply(self.pong, state)
+        elif self.pong is None:
+            pass # records preceding the first keyframe cannot be applied
+        elif kind == TICK:
+            self.pong.update(_DT.unpack(payload)[0])
+        elif kind == EVENT:
+            _, effect = deserialize(payload, BINARY_DESERIALIZER)
+            apply(self.pong, patch(flatten(self.pong), effect))
+        else:
+            raise ValueError(f"Unknown record kind {kind} at offset {start - _RECORD.size} of {self.path}")
+
+    def events(self) -> list[tuple[int, Event]]:
+        # all recorded events, with the ticks they happened at
+        events = []
+        offset = len(JOURNAL_MAGIC)
+        while self._is_complete(offset):
+            kind, tick, length = _RECORD.unpack_from(self._data, offset)
+            offset += _RECORD.size
+            if kind == EVENT:
+                event, _ = deserialize(self._data[offset:offset + length], BINARY_DESERIALIZER)
+                events.append((tick, event))
+            offset += length
+        return events
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+
+def main_replay(settings = None, start: int = 0):
+    from dpongpy import Settings
+    from dpongpy.view import ScreenPongView, ShowNothingPongView
+    settings = settings or Settings()
+    assert settings.journal, "A journal to replay is required"
+    replay = MatchReplay(settings.journal)
+    pygame.init()
+    try:
+        pong = replay.seek(start)
+        first_tick, first_time, started = pong.updates, pong.time, time.perf_counter()
+        # without GUI, matches are replayed as fast as possible
+        view = ScreenPongView(pong, debug=settings.debug) if settings.gui else ShowNothingPongView(pong)
+        clock = pygame.time.Clock()
+        while replay.step():
+            if settings.gui:
+                if pygame.event.get(pygame.QUIT):
+                    break
+                view.render()
+                view.update_display()
+                clock.tick(settings.fps)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Replayed ticks {first_tick}..{pong.updates} ({pong.time - first_time:.1f} s of game) " +
+                    f"in {elapsed:.2f} s: {pong}")
+    finally:
+        replay.close()
+        pygame.quit()
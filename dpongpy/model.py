@@ -1,5 +1,5 @@
 from pygame.math import Vector2
-from .log import logger
+from .log import logger, logging
 from dataclasses import dataclass, field
 from random import Random
 from enum import Enum
@@ -33,6 +33,7 @@ class Direction(Enum):
 
 
 class Sized:
+    __slots__ = ()
 
     @property
     def width(self) -> float:
@@ -44,6 +45,7 @@ class Sized:
 
 
 class Positioned:
+    __slots__ = ()
 
     @property
     def x(self) -> float:
@@ -54,15 +56,15 @@ class Positioned:
         return self.position.y # type: ignore[attr-defined]
 
 
-@dataclass
+@dataclass(slots=True)
 class Rectangle(Sized, Positioned):
     top_left: Vector2
     bottom_right: Vector2
 
     def __post_init__(self):
-        fst, snd = Vector2(self.top_left), Vector2(self.bottom_right)
-        self.top_left = Vector2(min(fst.x, snd.x), min(fst.y, snd.y))
-        self.bottom_right = Vector2(max(fst.x, snd.x), max(fst.y, snd.y))
+        (x1, y1), (x2, y2) = self.top_left, self.bottom_right
+        self.top_left = Vector2(min(x1, x2), min(y1, y2))
+        self.bottom_right = Vector2(max(x1, x2), max(y1, y2))
 
     @property
     def top(self) -> float:
@@ -114,7 +116,10 @@ class Rectangle(Sized, Positioned):
             return other.top_left in self and other.bottom_right in self
         else:
             x, y = other
-            return self.left <= x <= self.right and self.top <= y <= self.bottom
+            return self._contains_point(x, y)
+
+    def _contains_point(self, x: float, y: float) -> bool:
+        return self.top_left.x <= x <= self.bottom_right.x and self.top_left.y <= y <= self.bottom_right.y
 
     def intersection_with(self, other: 'Rectangle') -> Optional['Rectangle']:
         if self.overlaps(other):
@@ -132,39 +137,76 @@ class Rectangle(Sized, Positioned):
 
     def hits(self, other: 'Rectangle') -> dict[Direction, float]:
         result = dict()
-        intersection = self.intersection_with(other)
-        if intersection is not None:
-            tl, tr, br, bl = tuple([corner in self for corner in other.corners])
+        (left, top), (right, bottom) = self.top_left, self.bottom_right
+        (other_left, other_top), (other_right, other_bottom) = other.top_left, other.bottom_right
+        if left <= other_right and right >= other_left and top <= other_bottom and bottom >= other_top:
+            # size of the intersection, computed without building it
+            width = min(right, other_right) - max(left, other_left)
+            height = min(bottom, other_bottom) - max(top, other_top)
+            tl = self._contains_point(other_left, other_top)
+            tr = self._contains_point(other_right, other_top)
+            br = self._contains_point(other_right, other_bottom)
+            bl = self._contains_point(other_left, other_bottom)
             if br and not(tl or tr or bl):
-                result[Direction.UP] = intersection.height
-                result[Direction.LEFT] = intersection.width
+                result[Direction.UP] = height
+                result[Direction.LEFT] = width
             elif bl and not(tr or tl or br):
-                result[Direction.UP] = intersection.height
-                result[Direction.RIGHT] = intersection.width
+                result[Direction.UP] = height
+                result[Direction.RIGHT] = width
             elif tr and not(bl or br or tl):
-                result[Direction.DOWN] = intersection.height
-                result[Direction.LEFT] = intersection.width
+                result[Direction.DOWN] = height
+                result[Direction.LEFT] = width
             elif tl and not(br or bl or tr):
-                result[Direction.DOWN] = intersection.height
-                result[Direction.RIGHT] = intersection.width
-            elif (tl and tr and not (bl or br)) or (self.top <= other.top <= self.bottom < other.bottom):
-                result[Direction.DOWN] = intersection.height
-            elif (bl and br and not (tl or tr)) or (other.top < self.top <= other.bottom <= self.bottom):
-                result[Direction.UP] = intersection.height
-            elif (tl and bl and not (tr or br)) or (self.left <= other.left <= self.right < other.right):
-                result[Direction.RIGHT] = intersection.width
-            elif (tr and br and not (tl or bl)) or (other.left < self.left <= other.right <= self.right):
-                result[Direction.LEFT] = intersection.width
+                result[Direction.DOWN] = height
+                result[Direction.RIGHT] = width
+            elif (tl and tr and not (bl or br)) or (top <= other_top <= bottom < other_bottom):
+                result[Direction.DOWN] = height
+            elif (bl and br and not (tl or tr)) or (other_top < top <= other_bottom <= bottom):
+                result[Direction.UP] = height
+            elif (tl and bl and not (tr or br)) or (left <= other_left <= right < other_right):
+                result[Direction.RIGHT] = width
+            elif (tr and br and not (tl or bl)) or (other_left < left <= other_right <= right):
+                result[Direction.LEFT] = width
             else:
                 raise ValueError("Invalid collision, this is likely a bug")
         return result
 
+    def sweep(self, other: 'Rectangle', displacement: Vector2) -> Optional[tuple[float, Direction]]:
+        entry, exit, direction = float('-inf'), float('inf'), None
+        axes = [
+            (displacement.x, self.left, self.right, other.left, other.right, Direction.LEFT, Direction.RIGHT),
+            (displacement.y, self.top, self.bottom, other.top, other.bottom, Direction.UP, Direction.DOWN),
+        ]
+        for delta, low, high, other_low, other_high, backward, forward in axes:
+            if delta == 0:
+                if high <= other_low or low >= other_high:
+                    return None
+                continue
+            if delta > 0:
+                axis_entry, axis_exit = (other_low - high) / delta, (other_high - low) / delta
+            else:
+                axis_entry, axis_exit = (other_high - low) / delta, (other_low - high) / delta
+            if axis_entry > entry:
+                entry, direction = axis_entry, forward if delta > 0 else backward
+            exit = min(exit, axis_exit)
+        if direction is None or entry < 0 or entry > 1 or entry >= exit:
+            return None
+        return entry, direction
+
+
+def _vector(value) -> Vector2:
+    # vectors are never modified in place, hence they can be shared rather than copied
+    return value if isinstance(value, Vector2) else Vector2(value)
+
 
 class GameObject(Sized, Positioned):
+    __slots__ = ('_size', '_position', '_speed', '_bounding_box', 'name')
+
     def __init__(self, size, position=None, speed=None, name=None):
         self._size = Vector2(size)
         self._position = Vector2(position) if position is not None else Vector2()
         self._speed = Vector2(speed) if speed is not None else Vector2()
+        self._bounding_box: Optional[Rectangle] = None
         self.name = name or self.__class__.__name__.lower()
 
     def __eq__(self, other):
@@ -190,8 +232,9 @@ class GameObject(Sized, Positioned):
     @size.setter
     def size(self, value: Vector2):
         old = self._size
-        self._size = Vector2(value)
-        if old is not None and old != self._size:
+        self._size = _vector(value)
+        self._bounding_box = None
+        if logger.isEnabledFor(logging.DEBUG) and old != self._size:
             logger.debug(f"{self} resized: {old} -> {self._size}")
 
     @property
@@ -201,8 +244,9 @@ class GameObject(Sized, Positioned):
     @position.setter
     def position(self, value: Vector2):
         old = self._position
-        self._position = Vector2(value)
-        if old is not None and old != self._position:
+        self._position = _vector(value)
+        self._bounding_box = None
+        if logger.isEnabledFor(logging.DEBUG) and old != self._position:
             logger.debug(f"{self} moves: {old} -> {self._position}")
 
     @property
@@ -212,17 +256,20 @@ class GameObject(Sized, Positioned):
     @speed.setter
     def speed(self, value: Vector2):
         old = self._speed
-        self._speed = Vector2(value)
-        if old is not None and old != self._speed:
+        self._speed = _vector(value)
+        if logger.isEnabledFor(logging.DEBUG) and old != self._speed:
             logger.debug(f"{self} accelerates: {old} -> {self._speed}")
 
     @property
     def bounding_box(self) -> Rectangle:
-        half_size = self.size / 2
-        return Rectangle(self.position - half_size, self.position + half_size)
+        if self._bounding_box is None:
+            half_size = self.size / 2
+            self._bounding_box = Rectangle(self.position - half_size, self.position + half_size)
+        return self._bounding_box
 
     def update(self, delta_time: float):
-        self.position = self.position + self.speed * delta_time
+        if self._speed.x or self._speed.y:
+            self.position = self.position + self.speed * delta_time
 
     def override(self, other: 'GameObject'):
         assert isinstance(other, type(self)) and other.name == self.name, f"Invalid override: {other} -> {self}"
@@ -231,19 +278,26 @@ class GameObject(Sized, Positioned):
         self.speed = other.speed
 
 
-for method_name in ['overlaps', 'is_inside', '__contains__', 'intersection_with', 'hits']:
-    def method(self: GameObject, other: GameObject | Rectangle):
+def _delegate_to_bounding_box(method_name: str):
+    function = getattr(Rectangle, method_name)
+
+    def method(self: GameObject, other: GameObject | Rectangle, *args):
         if isinstance(other, GameObject):
             other = other.bounding_box
-        return getattr(Rectangle, method_name)(self.bounding_box, other)
-    setattr(GameObject, method_name, method)
+        return function(self.bounding_box, other, *args)
+    return method
+
+
+for method_name in ['overlaps', 'is_inside', '__contains__', 'intersection_with', 'hits', 'sweep']:
+    setattr(GameObject, method_name, _delegate_to_bounding_box(method_name))
 
 
 class Ball(GameObject):
-    pass
+    __slots__ = ()
 
 
 class Paddle(GameObject):
+    __slots__ = ('side',)
     _admissible_directions = set(Direction.values()) - {Direction.NONE}
 
     def __init__(self, size, side: Direction, position=None, speed=None, name=None):
@@ -272,6 +326,7 @@ class Config:
     ball_speed_ratio: float = 0.2
     paddle_speed_ratio: float = 0.2
     paddle_padding: float = 0.05
+    swept_collisions: bool = False
 
 
 @dataclass
@@ -293,7 +348,13 @@ class Board(Sized):
                 name=f"wall_{dir.name.lower()}"
             )
 
+# paddles are sorted by angle (anticlockwise, starting from left)
+_PADDLES_ORDER = {side: -side.value.as_polar()[1] for side in Direction.values()}
+
+
 class Pong(Sized):
+    max_bounces = 4
+
     def __init__(self, size, config=None, paddles=None, random=None):
         self.size = Vector2(size)
         self.config = config or Config()
@@ -322,9 +383,7 @@ class Pong(Sized):
 
     @property
     def paddles(self) -> list[Paddle]:
-        result = list(self._paddles.values())
-        result.sort(key=lambda p: -p.side.value.as_polar()[1]) # sort by angle (anticlockwise, starting from left)
-        return result
+        return self._sorted_paddles
 
     @paddles.setter
     def paddles(self, paddles):
@@ -332,6 +391,22 @@ class Pong(Sized):
         for paddle in paddles:
             assert isinstance(paddle, Paddle), f"Invalid paddle: {paddle}"
             self._paddles[paddle.side] = paddle
+        self._sort_paddles()
+
+    def _sort_paddles(self):
+        # a new list is created whenever paddles change, so lists returned by Pong.paddles are never modified
+        self._paddles = {side: self._paddles[side] for side in sorted(self._paddles, key=_PADDLES_ORDER.__getitem__)}
+        self._sorted_paddles = list(self._paddles.values())
+        self._hittables = None
+
+    @property
+    def board(self) -> Board:
+        return self._board
+
+    @board.setter
+    def board(self, board: Board):
+        self._board = board
+        self._hittables = None
 
     def __repr__(self):
         return (f'<{type(self).__name__}('
@@ -346,7 +421,9 @@ class Pong(Sized):
 
     @property
     def _hittable_objects(self) -> list[GameObject]:
-        return self.paddles + list(self.board.walls.values())
+        if self._hittables is None:
+            self._hittables = self.paddles + list(self.board.walls.values())
+        return self._hittables
 
     def reset_ball(self, speed: Vector2 = None):
         min_dimension = min(*self.size)
@@ -383,6 +460,7 @@ class Pong(Sized):
                 position = Vector2(padding, self.height / 2)
             paddle = Paddle(size=paddle_size, side=side, position=position)
         self._paddles[side] = paddle
+        self._sort_paddles()
         logger.debug(f"Added paddle {paddle} to {self} on side {paddle.side.name}")
 
     def paddle(self, side: Direction):
@@ -397,6 +475,7 @@ class Pong(Sized):
     def remove_paddle(self, side: Direction):
         if side in self._paddles:
             del self._paddles[side]
+            self._sort_paddles()
             logger.debug(f"Removed paddle from {self} on side {side}")
         else:
             raise KeyError(f"No such a paddle: {side}")
@@ -409,7 +488,11 @@ class Pong(Sized):
     def update(self, delta_time: float):
         self.updates += 1
         self.time += delta_time
-        logger.debug(f"Update {self.updates} (time: {self.time})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Update {self.updates} (time: {self.time})")
+        if self.config.swept_collisions:
+            self._swept_update(delta_time)
+            return
         self.ball.update(delta_time)
         for paddle in self.paddles:
             paddle.update(delta_time)
@@ -417,6 +500,40 @@ class Pong(Sized):
         for paddle in self.paddles:
             self._handle_collisions(paddle, self.board.walls.values())
 
+    def update_paddle(self, side: Direction, delta_time: float):
+        paddle = self.paddle(side)
+        paddle.update(delta_time)
+        self._handle_collisions(paddle, self.board.walls.values())
+
+    def _swept_update(self, delta_time: float):
+        for paddle in self.paddles:
+            paddle.update(delta_time)
+            self._handle_collisions(paddle, self.board.walls.values())
+        self._handle_sweep(self.ball, self._hittable_objects, delta_time)
+        # overlaps which cannot be swept (e.g. paddles moving onto the ball) are resolved as usual
+        self._handle_collisions(self.ball, self._hittable_objects)
+
+    def _handle_sweep(self, subject, objects, delta_time: float):
+        remaining = delta_time
+        for _ in range(self.max_bounces):
+            earliest = None
+            for hittable in objects:
+                hit = subject.sweep(hittable, subject.speed * remaining)
+                if hit is not None and (earliest is None or hit[0] < earliest[0]):
+                    earliest = (*hit, hittable)
+            if earliest is None:
+                break
+            fraction, direction, hittable = earliest
+            time = fraction * remaining
+            logger.debug(f"{subject} hits {hittable} in direction {direction.name}, after {time}")
+            subject.position = subject.position + subject.speed * time
+            if direction.is_horizontal:
+                subject.speed = Vector2(-subject.speed.x, subject.speed.y)
+            if direction.is_vertical:
+                subject.speed = Vector2(subject.speed.x, -subject.speed.y)
+            remaining -= time
+        subject.position = subject.position + subject.speed * remaining
+
     def _handle_collisions(self, subject, objects):
         for hittable in objects:
             hits = subject.hits(hittable)
@@ -441,7 +558,7 @@ class Pong(Sized):
         elif selected.side.is_vertical and direction.is_horizontal:
             selected.speed = direction.value * self.width * self.config.paddle_speed_ratio
         elif direction == Direction.NONE:
-            selected.speed = direction.value
+            selected.speed = Vector2(direction.value)
         else:
             logger.debug(f"Ignored attempt to move {paddle} in {direction}")
 
@@ -1,5 +1,6 @@
 import socket
-from typing import Protocol
+from dpongpy.log import logger
+from typing import Callable, Protocol
 from dataclasses import dataclass, field
 
 
@@ -64,7 +65,7 @@ class Session(Protocol):
     def send(self, payload: bytes | str):
         ...
 
-    def receive(self, decode=True):
+    def receive(self, decode=True, timeout: float | None = None):
         ...
 
     def close(self):
@@ -84,7 +85,7 @@ class Server(Protocol):
     def listen(self) -> Session:
         ...
 
-    def receive(self, decode=True) -> tuple[str | bytes | None, Address | None]:
+    def receive(self, decode=True, timeout: float | None = None) -> tuple[str | bytes | None, Address | None]:
         ...
 
     def send(self, address: Address, payload: bytes | str):
@@ -103,3 +104,11 @@ class Server(Protocol):
 class Client(Session):
     def __init__(self, remote_address: Address):
         ...
+
+
+def handle_safely(handle: Callable[[bytes, Address], None], message: bytes, sender: Address):
+    # a malformed datagram (e.g. a stray packet, or one from an incompatible peer) must not stop the receiver
+    try:
+        handle(message, sender)
+    except Exception as e:
+        logger.warning(f"Discarding malformed message from {sender}: {e!r}")
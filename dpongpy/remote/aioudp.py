@@ -0,0 +1,132 @@
+from dpongpy.log import logger
+from dpongpy.remote import *
+from dpongpy.remote.udp import udp_socket, udp_send
+import asyncio
+
+
+class _DatagramQueue(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.datagrams: asyncio.Queue[tuple[bytes, Address]] = asyncio.Queue()
+
+    def datagram_received(self, data: bytes, addr: tuple):
+        self.datagrams.put_nowait((data, Address(*addr)))
+
+    def error_received(self, exc: Exception):
+        logger.warning(f"Error on UDP socket: {exc}")
+
+
+class AsyncUdpEndpoint:
+    def __init__(self, socket: socket.socket):
+        assert socket is not None, "Socket must not be None"
+        self._socket = socket
+        self._transport: asyncio.DatagramTransport | None = None
+        self._protocol: _DatagramQueue | None = None
+
+    @property
+    def local_address(self):
+        return Address(*self._socket.getsockname())
+
+    async def _datagrams(self) -> asyncio.Queue:
+        # the socket is handed over to the event loop lazily, upon first reception
+        if self._protocol is None:
+            loop = asyncio.get_running_loop()
+            self._transport, self._protocol = await loop.create_datagram_endpoint(_DatagramQueue, sock=self._socket)
+        return self._protocol.datagrams
+
+    async def _receive(self, decode=True, timeout: float | None = None) -> tuple[str | bytes | None, Address | None]:
+        datagrams = await self._datagrams()
+        if timeout is None:
+            payload, address = await datagrams.get()
+        elif not datagrams.empty():
+            payload, address = datagrams.get_nowait()
+        else:
+            try:
+                payload, address = await asyncio.wait_for(datagrams.get(), timeout)
+            except asyncio.TimeoutError:
+                return None, None
+        logger.debug(f"Received {len(payload)} bytes from {address}: {payload!r}")
+        if decode:
+            payload = payload.decode() # type: ignore[assignment]
+        return payload, address
+
+    def _send(self, address: Address, payload: bytes | str):
+        return udp_send(self._transport or self._socket, address, payload)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+        else:
+            self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncUdpSession(AsyncUdpEndpoint):
+    def __init__(self,
+                 socket: socket.socket,
+                 remote_address: Address | tuple,
+                 first_message: str | bytes | None = None):
+        super().__init__(socket)
+        assert remote_address is not None, "Remote address must not be None"
+        self._remote_address = Address(*remote_address) if isinstance(remote_address, tuple) else remote_address
+        self._received_messages = 0 if first_message is None else 1
+        self._first_message = first_message
+
+    @property
+    def remote_address(self):
+        return self._remote_address
+
+    def send(self, payload: bytes | str):
+        return self._send(self.remote_address, payload)
+
+    async def receive(self, decode=True, timeout: float | None = None):
+        if self._first_message is not None:
+            payload = self._first_message
+            if decode and isinstance(payload, bytes):
+                payload = payload.decode()
+            self._first_message = None
+            return payload
+        payload, address = await self._receive(decode, timeout)
+        if address is None:
+            return None
+        if self._received_messages == 0:
+            self._remote_address = address
+        self._received_messages += 1
+        assert address.equivalent_to(self.remote_address), f"Received packet from unexpected party {address}"
+        return payload
+
+
+class AsyncUdpServer(AsyncUdpEndpoint):
+    def __init__(self, port: int):
+        self._address = Address.local_port_on_any_interface(port)
+        super().__init__(udp_socket(self._address))
+
+    async def listen(self) -> AsyncUdpSession:
+        payload, address = await self._receive(True)
+        assert address is not None, "Receiving without timeout always yields a sender"
+        return AsyncUdpSession(
+            socket=udp_socket(),
+            remote_address=address,
+            first_message=payload
+        )
+
+    async def receive(self, decode=True, timeout: float | None = None) -> tuple[str | bytes | None, Address | None]:
+        return await self._receive(decode, timeout)
+
+    def send(self, address: Address, payload: bytes | str):
+        return self._send(address, payload)
+
+
+class AsyncUdpClient(AsyncUdpSession):
+    def __init__(self, remote_address: Address):
+        super().__init__(udp_socket(), remote_address)
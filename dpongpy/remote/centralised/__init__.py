@@ -1,16 +1,53 @@
 from pygame.event import Event
 import pygame
-from dpongpy import PongGame, Settings
+from dpongpy import PongGame, Settings, FixedTimestep
 from dpongpy.model import *
 from dpongpy.controller import ControlEvent
 from dpongpy.model import Direction, Pong
+from dpongpy.remote import handle_safely
 from dpongpy.remote.udp import UdpClient, UdpServer, Address
-from dpongpy.remote.presentation import serialize, deserialize
+from dpongpy.remote.aioudp import AsyncUdpServer
+from dpongpy.remote.presentation import serialize, deserialize, deserialize_event, CODECS
+from dpongpy.remote.delta import SnapshotEncoder, SnapshotDecoder, apply, is_restart, INPUT_KEYS
+from dpongpy.remote.prediction import PaddlePredictor
+from dpongpy.remote.inputs import InputBatcher, is_packet, MIN_RESEND_INTERVAL
+from dpongpy.remote.interpolation import InterpolationBuffer
+from dpongpy.remote.compensation import LagCompensator
+from dpongpy.remote.ingress import IngressQueue
+from dpongpy.journal import MatchJournal
+from dpongpy.log import logger
+from dataclasses import dataclass
+from typing import Callable, Optional
+import asyncio
 import threading
 
 
 DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 12345
+RATE_TOLERANCE = 1e-6 # seconds
+
+
+def _is_side(value) -> bool:
+    return isinstance(value, Direction) and value != Direction.NONE
+
+
+# the events peers may hand to the game loop of coordinators, and how to check each of their fields
+# (optional fields are the ones accepting None): anything else would make the game loop fail
+_GAME_EVENT_FIELDS: dict[int, dict[str, Callable[[object], bool]]] = {
+    ControlEvent.PLAYER_JOIN.value: dict(paddle_index=_is_side),
+    ControlEvent.PLAYER_LEAVE.value: dict(paddle_index=_is_side),
+    ControlEvent.PADDLE_MOVE.value: dict(paddle_index=_is_side,
+                                         direction=lambda value: isinstance(value, Direction),
+                                         input_seq=lambda value: value is None or isinstance(value, int),
+                                         input_time=lambda value: value is None or isinstance(value, (int, float))),
+}
+
+
+def check_game_event(event: Event):
+    fields = _GAME_EVENT_FIELDS.get(event.type)
+    if fields is None or not event.dict.keys() <= fields.keys() or \
+            not all(check(event.dict.get(key)) for key, check in fields.items()):
+        raise ValueError(f"Unexpected event from peer: {event}")
 
 
 class PongCoordinator(PongGame):
@@ -18,22 +55,45 @@ class PongCoordinator(PongGame):
     def __init__(self, settings: Settings = None):
         settings = settings or Settings()
         settings.initial_paddles = []
+        settings.pipelined = False # coordinators show nothing
         super().__init__(settings)
         self.pong.reset_ball(Vector2(0))
-        self.server = UdpServer(self.settings.port or DEFAULT_PORT)
-        self._thread_receiver = threading.Thread(target=self._handle_ingoing_messages, daemon=True)
-        self._thread_receiver.start()
+        self.ingress = IngressQueue(self.settings.ingress_capacity)
+        self.controller.event_queue = self.ingress
+        self._serializer, self._deserializer = CODECS[self.settings.codec]
+        self.server = self.create_server()
         self._peers: set[Address] = set()
+        self._acks: dict[Address, int] = dict()
+        self._intervals: dict[Address, float] = dict() # minimum time between snapshots, for peers asking for less
+        self._next_due: dict[Address, float] = dict()
+        self._snapshots = SnapshotEncoder(self.settings.keyframe_interval)
+        self._snapshot_timestep = FixedTimestep(self.settings.snapshot_rate, max_ticks_per_frame=1) \
+            if self.settings.snapshot_rate else None
+        self._processed_inputs: dict[Direction, int] = dict()
+        self._lag_compensator = LagCompensator(self.settings.max_lag_compensation)
+        self.journal = self.create_journal()
+        if self.journal is not None:
+            self.journal.attach(self.controller)
         self._lock = threading.RLock()
+        self.start_receiving()
+
+    def create_server(self):
+        return UdpServer(self.settings.port or DEFAULT_PORT)
 
-    def create_view(coordinator):
+    def create_journal(self) -> Optional[MatchJournal]:
+        return MatchJournal(self.settings.journal) if self.settings.journal else None
+
+    def start_receiving(self):
+        self._thread_receiver = threading.Thread(target=self._handle_ingoing_messages, daemon=True)
+        self._thread_receiver.start()
+
+    def create_view(coordinator, pong: Pong = None):
         from dpongpy.view import ShowNothingPongView
-        from dpongpy.controller.local import ControlEvent
 
         class SendToPeersPongView(ShowNothingPongView):
-            def render(self):
-                event = coordinator.controller.create_event(ControlEvent.TIME_ELAPSED, dt=coordinator.dt, status=self._pong)
-                coordinator._broadcast_to_all_peers(event)
+            def render(self, interpolation: float = 1.0):
+                if coordinator._snapshot_due():
+                    coordinator._broadcast_snapshot()
 
         return SendToPeersPongView(coordinator.pong)
 
@@ -45,10 +105,30 @@ class PongCoordinator(PongGame):
                 PongEventHandler.__init__(self, pong)
 
             def on_player_join(self, pong: Pong, paddle_index: Direction):
+                if pong.has_paddle(paddle_index):
+                    logger.warning(f"Ignoring join for paddle {paddle_index}, which is already in the game")
+                    return # e.g. a join being resent
                 super().on_player_join(pong, paddle_index)
+                coordinator._processed_inputs.pop(paddle_index, None)
+                coordinator._lag_compensator.forget(paddle_index)
                 pong.reset_ball()
 
+            def on_paddle_move(self, pong: Pong, paddle_index: Direction, direction: Direction,
+                               input_seq: int = None, input_time: float = None):
+                if input_seq is not None:
+                    if input_seq <= coordinator._processed_inputs.get(paddle_index, 0):
+                        return # duplicated or superseded by a newer input
+                    coordinator._processed_inputs[paddle_index] = input_seq
+                if pong.has_paddle(paddle_index):
+                    coordinator._lag_compensator.move_paddle(pong, paddle_index, direction, input_time)
+
+            def on_time_elapsed(self, pong: Pong, dt: float):
+                super().on_time_elapsed(pong, dt)
+                coordinator._lag_compensator.record(pong)
+
             def on_player_leave(self, pong: Pong, paddle_index: Direction):
+                coordinator._processed_inputs.pop(paddle_index, None)
+                coordinator._lag_compensator.forget(paddle_index)
                 if pong.has_paddle(paddle_index):
                     pong.remove_paddle(paddle_index)
                 if len(pong.paddles) == 0:
@@ -60,7 +140,8 @@ class PongCoordinator(PongGame):
                 coordinator.stop()
 
             def handle_inputs(self, dt=None):
-                self.time_elapsed(dt)
+                if dt is not None:
+                    self.time_elapsed(dt)
 
         return Controller(coordinator.pong)
 
@@ -68,6 +149,9 @@ class PongCoordinator(PongGame):
         pass
 
     def after_run(self):
+        logger.info(f"Ingress: {self.ingress.stats}")
+        if self.journal is not None:
+            self.journal.close()
         super().after_run()
         self.server.close()
 
@@ -85,27 +169,150 @@ class PongCoordinator(PongGame):
         with self._lock:
             self._peers.add(peer)
 
-    def _broadcast_to_all_peers(self, message):
-        event = serialize(message)
-        for peer in self.peers:
-            self.server.send(payload=event, address=peer)
+    def subscribe(self, peer, rate: Optional[float] = None):
+        with self._lock:
+            self._peers.add(peer)
+            if rate:
+                self._intervals[peer] = 1 / rate
+            else:
+                self._intervals.pop(peer, None)
+
+    def acknowledge(self, peer, seq: int):
+        with self._lock:
+            if seq > self._acks.get(peer, -1):
+                self._acks[peer] = seq
+
+    def _snapshot_due(self) -> bool:
+        return self._snapshot_timestep is None or self._snapshot_timestep.advance(self.dt or 0) > 0
+
+    def _broadcast_snapshot(self):
+        seq = self._snapshots.push(self.pong, self._processed_inputs)
+        with self._lock:
+            acks = {peer: self._acks.get(peer) for peer in self._peers if self._is_due(peer)}
+        payloads = dict()
+        for peer, acked in acks.items():
+            # each peer only receives the changes since the last snapshot it acknowledged
+            base = self._snapshots.base_for(acked)
+            if base not in payloads:
+                event = self.controller.create_event(ControlEvent.TIME_ELAPSED, dt=self.dt, seq=seq, base=base,
+                                                     delta=self._snapshots.delta(base))
+                payloads[base] = serialize(event, self._serializer)
+            self.server.send(payload=payloads[base], address=peer)
+
+    def _is_due(self, peer) -> bool:
+        interval = self._intervals.get(peer)
+        if interval is None:
+            return True
+        now, due = self.pong.time, self._next_due.get(peer)
+        if due is not None and 0 < due - now - RATE_TOLERANCE < interval: # otherwise, the game time went back
+            return False
+        # snapshots keep their pace, unless late by more than an interval
+        self._next_due[peer] = due + interval if due is not None and now - due < interval else now + interval
+        return True
 
     def _handle_ingoing_messages(self):
         while self.running:
-            message, sender = self.server.receive()
-            self.add_peer(sender)
-            message = deserialize(message)
-            assert isinstance(message, pygame.event.Event), f"Expected {pygame.event.Event}, got {type(message)}"
-            pygame.event.post(message)
+            message, sender = self.server.receive(decode=False)
+            handle_safely(self._handle_ingoing_message, message, sender)
+
+    def _handle_ingoing_message(self, message: bytes, sender: Address):
+        self._handle_ingoing_event(deserialize_event(message, self._deserializer), sender)
+
+    def _handle_ingoing_event(self, event: Event, sender: Address):
+        self.add_peer(sender)
+        if ControlEvent.SNAPSHOT_ACK.matches(event):
+            self.acknowledge(sender, event.seq)
+        elif ControlEvent.SPECTATE.matches(event):
+            self.subscribe(sender, event.dict.get('rate'))
+        elif ControlEvent.PADDLE_INPUTS.matches(event):
+            self._unpack_inputs(event)
+        else:
+            check_game_event(event)
+            self.ingress.post(event)
+
+    def _unpack_inputs(self, event: Event):
+        # inputs come from oldest to newest, and most of them were already received with previous packets
+        if not isinstance(event.dict.get('paddle_index'), Direction) or not is_packet(event.dict.get('inputs')):
+            raise ValueError(f"Malformed inputs: {event}")
+        processed = self._processed_inputs.get(event.paddle_index, 0)
+        for seq, direction, stamp in event.inputs:
+            if seq > processed:
+                self.ingress.post(self.controller.create_event(ControlEvent.PADDLE_MOVE, paddle_index=event.paddle_index,
+                                                               direction=direction, input_seq=seq, input_time=stamp))
+
+
+class AsyncPongCoordinator(PongCoordinator):
+    # a single event loop receives messages, runs the game and broadcasts snapshots: no threads are involved
+
+    def create_server(self):
+        return AsyncUdpServer(self.settings.port or DEFAULT_PORT)
+
+    def start_receiving(self):
+        pass # messages are received by a task of the event loop, created in run_async
+
+    def run(self):
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
+        loop = asyncio.get_running_loop()
+        receiver = None
+        try:
+            self.dt = 0
+            self.before_run()
+            receiver = asyncio.create_task(self._receive_ingoing_messages())
+            last_frame = loop.time()
+            while self.running:
+                self.run_frame()
+                await asyncio.sleep(max(0.0, last_frame + 1 / self.settings.fps - loop.time()))
+                now = loop.time()
+                self.dt = now - last_frame
+                last_frame = now
+        finally:
+            if receiver is not None:
+                receiver.cancel()
+            self.after_run()
+
+    async def _receive_ingoing_messages(self):
+        while self.running:
+            message, sender = await self.server.receive(decode=False)
+            handle_safely(self._handle_ingoing_message, message, sender)
+
+
+@dataclass
+class SnapshotStats:
+    received: int = 0
+    skipped: int = 0 # superseded by a newer snapshot received in the same frame
+    dropped: int = 0 # never received, according to gaps in sequence numbers
+    duplicated: int = 0 # received more than once
+    reordered: int = 0 # received after a newer snapshot
+    stale: int = 0 # discarded, as older than the last applied snapshot
+
+
+SEEN_SNAPSHOTS_WINDOW = 64
 
 
 class PongTerminal(PongGame):
+    controlled_paddles = 1
 
     def __init__(self, settings: Settings = None):
         settings = settings or Settings()
-        assert len(settings.initial_paddles) == 1, "Only one paddle is allowed in terminal mode"
+        assert len(settings.initial_paddles) == self.controlled_paddles, \
+            f"Only {self.controlled_paddles} paddle(s) allowed in {type(self).__name__}"
+        settings.tick_rate = None # terminals do not simulate the game, they just show the coordinator's state
         super().__init__(settings)
         self.pong.reset_ball(Vector2(0))
+        self._serializer, self._deserializer = CODECS[self.settings.codec]
+        self._snapshots = SnapshotDecoder()
+        self._first_seq: Optional[int] = None
+        self._last_seq: Optional[int] = None
+        self._applied_seq: Optional[int] = None
+        self._seen_seqs: set[int] = set()
+        self.stats = SnapshotStats()
+        self._predictor = PaddlePredictor(self.side) if self.settings.client_prediction else None
+        self._interpolation = InterpolationBuffer(self.settings.interpolation_delay) \
+            if self.settings.interpolation_delay is not None else None
+        self._server_time: Optional[float] = None # estimate of the coordinator's game time
+        self._inputs = InputBatcher()
         self.client = UdpClient(Address(self.settings.host or DEFAULT_HOST, self.settings.port or DEFAULT_PORT))
 
     def create_controller(terminal, paddle_commands = None):
@@ -116,32 +323,148 @@ class PongTerminal(PongGame):
                 PongInputHandler.__init__(self, pong, paddle_commands)
 
             def post_event(self, event: Event | ControlEvent, **kwargs):
+                if ControlEvent.PADDLE_MOVE.matches(event):
+                    stamp, seq = terminal._server_time, None
+                    if terminal._predictor is not None:
+                        seq = terminal._predictor.input(terminal.pong, kwargs['direction'], stamp)
+                    terminal._inputs.input(kwargs['direction'], stamp, seq) # sent at the end of the frame
+                    return super().post_event(event, **kwargs)
                 event = super().post_event(event, **kwargs)
                 if not ControlEvent.TIME_ELAPSED.matches(event):
-                    terminal.client.send(serialize(event))
+                    terminal._send(event)
                 return event
 
             def handle_inputs(self, dt=None):
-                return super().handle_inputs(dt=None) # just handle input events, do not handle time elapsed
+                if terminal._server_time is not None:
+                    terminal._server_time += dt or 0
+                if terminal._predictor is not None:
+                    terminal._predictor.advance(terminal.pong, dt or 0)
+                if terminal._interpolation is not None:
+                    terminal._interpolation.advance(dt or 0)
+                terminal._inputs.advance(dt or 0)
+                super().handle_inputs(dt=None) # just handle input events, do not handle time elapsed
+                terminal._send_inputs()
             
             def handle_events(self):
                 terminal._handle_ingoing_messages()
                 super().handle_events()
+                if terminal._interpolation is not None:
+                    terminal._interpolate()
             
-            def on_time_elapsed(self, pong: Pong, dt: float, status: Pong): # type: ignore[override]
-                pong.override(status)
+            def on_time_elapsed(self, pong: Pong, dt: float, seq: int, base: int, delta: dict): # type: ignore[override]
+                if terminal._applied_seq is not None and seq <= terminal._applied_seq:
+                    return
+                state = terminal._snapshots.decode(seq, base, delta)
+                if state is not None:
+                    apply(pong, state)
+                    terminal._applied_seq = seq
+                    terminal._sync_server_time(state['time'])
+                    if terminal._interpolation is not None:
+                        terminal._interpolation.push(state)
+                    terminal._acknowledge_inputs(state)
+                    terminal._acknowledge(seq)
+
+            def on_paddle_move(self, pong: Pong, paddle_index: Direction, direction: Direction,
+                               input_seq: int = None, input_time: float = None):
+                pass # the coordinator is in charge of moving paddles, possibly anticipated by the predictor
 
             def on_player_leave(self, pong: Pong, paddle_index: Direction):
                 terminal.stop()
+
+            def on_game_over(self, pong: Pong):
+                terminal.on_game_over()
         
         return Controller(terminal.pong, paddle_commands)
+
+    def on_game_over(self):
+        pass # players leave by pressing their quit key, which lets the coordinator know
     
     def _handle_ingoing_messages(self):
-        if self.running:
-            message = self.client.receive()
-            message = deserialize(message)
+        # drains pending datagrams without blocking: all control events are forwarded, but only the latest snapshot
+        snapshot = None
+        while self.running:
+            message = self.client.receive(decode=False, timeout=0)
+            if message is None:
+                break
+            message = deserialize(message, self._deserializer)
             assert isinstance(message, pygame.event.Event), f"Expected {pygame.event.Event}, got {type(message)}"
-            pygame.event.post(message)
+            if ControlEvent.TIME_ELAPSED.matches(message):
+                if is_restart(message.seq, message.base, self._last_seq):
+                    logger.info(f"Coordinator restarted: snapshots start over from {message.seq}")
+                    self._forget_snapshots()
+                    snapshot = None
+                if not self._count_snapshot(message.seq):
+                    continue
+                if self._applied_seq is not None and message.seq <= self._applied_seq:
+                    self.stats.stale += 1
+                    continue
+                if snapshot is not None:
+                    self.stats.skipped += 1
+                if snapshot is None or message.seq > snapshot.seq:
+                    snapshot = message
+            else:
+                pygame.event.post(message)
+        if snapshot is not None:
+            pygame.event.post(snapshot)
+
+    def _count_snapshot(self, seq: int) -> bool:
+        # returns False for duplicates, which should be ignored
+        if seq in self._seen_seqs:
+            self.stats.duplicated += 1
+            return False
+        self.stats.received += 1
+        self._seen_seqs.add(seq)
+        if self._last_seq is None:
+            self._first_seq = self._last_seq = seq
+        elif seq > self._last_seq:
+            self.stats.dropped += seq - self._last_seq - 1
+            self._last_seq = seq
+        else:
+            self.stats.reordered += 1
+            if self._first_seq is not None and seq > self._first_seq:
+                self.stats.dropped -= 1 # it was counted as dropped, when a newer snapshot arrived
+        if len(self._seen_seqs) > 2 * SEEN_SNAPSHOTS_WINDOW:
+            self._seen_seqs = {seen for seen in self._seen_seqs if seen > self._last_seq - SEEN_SNAPSHOTS_WINDOW}
+        return True
+
+    def _forget_snapshots(self):
+        self._snapshots = SnapshotDecoder()
+        self._first_seq = self._last_seq = self._applied_seq = None
+        self._seen_seqs = set()
+
+    @property
+    def side(self) -> Direction:
+        return self.pong.paddles[0].side
+
+    def _acknowledge_inputs(self, state: dict):
+        processed_input = state.get(INPUT_KEYS[self.side], 0)
+        self._inputs.acknowledge(processed_input)
+        if self._predictor is not None:
+            self._predictor.reconcile(self.pong, processed_input)
+
+    def _send_inputs(self):
+        rtt = self._predictor.rtt if self._predictor is not None else None
+        inputs = self._inputs.packet(max(MIN_RESEND_INTERVAL, 2 * (rtt or 0)))
+        if inputs is not None:
+            self._send(self.controller.create_event(ControlEvent.PADDLE_INPUTS, paddle_index=self.side, inputs=inputs))
+
+    def _sync_server_time(self, snapshot_time: float):
+        # snapshots took (roughly) half a round trip to get here
+        latency = self._predictor.rtt / 2 if self._predictor is not None and self._predictor.rtt is not None else 0
+        self._server_time = snapshot_time + latency
+
+    def _interpolate(self):
+        # the own paddle is left alone if it is predicted, as it would otherwise lag behind inputs
+        own_paddles = [self._predictor.side] if self._predictor is not None else []
+        self._interpolation.interpolate(self.pong, exclude=own_paddles)
+
+    def _acknowledge(self, seq: int):
+        self._send(self.controller.create_event(ControlEvent.SNAPSHOT_ACK, seq=seq))
+
+    def _send(self, event: Event):
+        if self.settings.room is not None: # lets multi-room coordinators route the event
+            event = self.controller.create_event(event, room=self.settings.room)
+        self.client.send(serialize(event, self._serializer))
 
     def before_run(self):
         super().before_run()
@@ -149,13 +472,50 @@ class PongTerminal(PongGame):
             self.controller.post_event(ControlEvent.PLAYER_JOIN, paddle_index=paddle.side)
 
     def after_run(self):
+        logger.info(f"Snapshots: {self.stats}")
+        logger.info(f"Input packets: {self._inputs.packets}")
+        if self._interpolation is not None:
+            logger.info(f"Frames extrapolated for lack of snapshots: {self._interpolation.extrapolated}")
         self.client.close()
         super().after_run()
 
 
 def main_coordinator(settings = None):
-    PongCoordinator(settings).run()
+    settings = settings or Settings()
+    if settings.workers > 0:
+        from dpongpy.remote.centralised.workers import ShardedCoordinator
+        ShardedCoordinator(settings).run()
+        return
+    if settings.max_rooms > 0 or settings.directory:
+        from dpongpy.remote.centralised.rooms import MultiRoomCoordinator
+        settings.max_rooms = settings.max_rooms or 1 # rooms are named by the directory
+        MultiRoomCoordinator(settings).run()
+        return
+    coordinator = AsyncPongCoordinator if settings.use_asyncio else PongCoordinator
+    coordinator(settings).run()
 
 
 def main_terminal(settings = None):
+    settings = settings or Settings()
+    if settings.directory:
+        from dpongpy.remote.centralised.directory import request_room
+        coordinator, settings.room = request_room(Address.parse(settings.directory), settings.room, settings.codec)
+        settings.host, settings.port = coordinator.host, coordinator.port
+        logger.info(f"Directory assigned room {settings.room} on {coordinator}")
     PongTerminal(settings).run()
+
+
+def main_spectator(settings = None):
+    from dpongpy.remote.centralised.spectators import PongSpectator
+    PongSpectator(settings or Settings()).run()
+
+
+def main_relay(settings = None):
+    from dpongpy.remote.centralised.spectators import PongRelay
+    PongRelay(settings or Settings()).run()
+
+
+def main_directory(settings = None):
+    from dpongpy.remote.centralised.directory import Directory, DEFAULT_DIRECTORY_PORT
+    settings = settings or Settings()
+    Directory(settings.port or DEFAULT_DIRECTORY_PORT, settings.codec).run()
@@ -0,0 +1,147 @@
+from pygame.event import Event
+from dpongpy.controller import ControlEvent, create_event
+from dpongpy.remote import Server, handle_safely
+from dpongpy.remote.udp import UdpServer, UdpClient, Address
+from dpongpy.remote.presentation import serialize, deserialize, deserialize_event, CODECS
+from dpongpy.log import logger
+from dataclasses import dataclass
+from typing import Optional
+import time
+
+
+DEFAULT_DIRECTORY_PORT = 12300
+REPORT_INTERVAL = 1.0
+REPORT_TIMEOUT = 3.0 # coordinators not reporting for this long are forgotten
+PLAYERS_PER_ROOM = 2
+REQUEST_TIMEOUT = 1.0
+REQUEST_ATTEMPTS = 3
+
+
+@dataclass
+class CoordinatorStatus:
+    address: Address
+    rooms: dict[str, int] # players in each room
+    capacity: int # maximum number of rooms
+    load: float # fraction of the frame budget spent computing
+    last_seen: float
+
+    @property
+    def players(self) -> int:
+        return sum(self.rooms.values())
+
+    @property
+    def full(self) -> bool:
+        return len(self.rooms) >= self.capacity
+
+
+class Directory:
+    # keeps track of the coordinators reporting to it, and tells terminals which coordinator and room to join:
+    # rooms waiting for players are filled first, then new rooms are opened on the least loaded coordinator
+
+    def __init__(self, port: int = DEFAULT_DIRECTORY_PORT, codec: str = 'json'):
+        self._serializer, self._deserializer = CODECS[codec]
+        self.server = UdpServer(port)
+        self.coordinators: dict[Address, CoordinatorStatus] = dict()
+        self._opened_rooms = 0
+        self.running = True
+
+    def run(self):
+        try:
+            while self.running:
+                message, sender = self.server.receive(decode=False, timeout=REPORT_INTERVAL)
+                if message is not None:
+                    handle_safely(self._handle_ingoing_message, message, sender)
+                self.expire()
+        finally:
+            self.server.close()
+
+    def stop(self):
+        self.running = False
+
+    def _handle_ingoing_message(self, message: bytes, sender: Address):
+        event = deserialize_event(message, self._deserializer)
+        if ControlEvent.COORDINATOR_REPORT.matches(event):
+            rooms, capacity, load = event.dict.get('rooms'), event.dict.get('capacity'), event.dict.get('load')
+            # reports are kept until they expire: a malformed one would make any later assignment fail
+            if not isinstance(rooms, dict) or not all(isinstance(room, str) and isinstance(players, int)
+                                                      for room, players in rooms.items()) \
+                    or not isinstance(capacity, int) or not isinstance(load, (int, float)):
+                raise ValueError(f"Malformed report: {event}")
+            self.update(sender, rooms, capacity, load)
+        elif ControlEvent.ROOM_REQUEST.matches(event):
+            room = event.dict.get('room')
+            if room is not None and not isinstance(room, str):
+                raise ValueError(f"Invalid room {room!r}")
+            assignment = self.assign(room)
+            host, port, room = (None, None, None) if assignment is None else \
+                (assignment[0].host, assignment[0].port, assignment[1])
+            reply = create_event(ControlEvent.ROOM_ASSIGNMENT, host=host, port=port, room=room)
+            self.server.send(sender, serialize(reply, self._serializer))
+        else:
+            logger.debug(f"Ignoring {event} from {sender}")
+
+    def update(self, address: Address, rooms: dict[str, int], capacity: int, load: float, now: float = None):
+        now = time.monotonic() if now is None else now
+        if address not in self.coordinators:
+            logger.info(f"Coordinator {address} registered")
+        self.coordinators[address] = CoordinatorStatus(address, dict(rooms), capacity, load, now)
+
+    def expire(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        for address, status in list(self.coordinators.items()):
+            if now - status.last_seen > REPORT_TIMEOUT:
+                logger.warning(f"Coordinator {address} stopped reporting, forgetting it")
+                del self.coordinators[address]
+
+    def assign(self, room: Optional[str] = None, now: float = None) -> Optional[tuple[Address, str]]:
+        # seats are reserved until the next report of the chosen coordinator, which supersedes them
+        self.expire(now)
+        coordinators = sorted(self.coordinators.values(), key=lambda status: (status.load, status.players))
+        if room is not None:
+            for status in coordinators:
+                if room in status.rooms:
+                    return self._seat(status, room)
+        else:
+            for status in coordinators:
+                for waiting, players in status.rooms.items():
+                    if 0 < players < PLAYERS_PER_ROOM:
+                        return self._seat(status, waiting)
+        for status in coordinators:
+            if not status.full:
+                return self._seat(status, room if room is not None else self._new_room())
+        return None
+
+    def _new_room(self) -> str:
+        # the counter starts over when the directory is restarted, while coordinators may still host its rooms
+        existing = {room for status in self.coordinators.values() for room in status.rooms}
+        while True:
+            self._opened_rooms += 1
+            room = f"room-{self._opened_rooms}"
+            if room not in existing:
+                return room
+
+    def _seat(self, status: CoordinatorStatus, room: str) -> tuple[Address, str]:
+        status.rooms[room] = status.rooms.get(room, 0) + 1
+        return status.address, room
+
+
+def report(server: Server, directory: Address, serializer, rooms: dict[str, int], capacity: int, load: float):
+    # sent through the coordinator's own server, so that the directory gets to know the address to hand out
+    event = create_event(ControlEvent.COORDINATOR_REPORT, rooms=rooms, capacity=capacity, load=load)
+    server.send(directory, serialize(event, serializer))
+
+
+def request_room(directory: Address, room: Optional[str] = None, codec: str = 'json') -> tuple[Address, str]:
+    serializer, deserializer = CODECS[codec]
+    request = serialize(create_event(ControlEvent.ROOM_REQUEST, room=room), serializer)
+    with UdpClient(directory) as client:
+        for _ in range(REQUEST_ATTEMPTS):
+            client.send(request)
+            reply = client.receive(decode=False, timeout=REQUEST_TIMEOUT)
+            if reply is None:
+                continue
+            assignment: Event = deserialize(reply, deserializer)
+            if assignment.host is None:
+                raise ConnectionError(f"No coordinator available, according to directory {directory}")
+            return Address(assignment.host, assignment.port), assignment.room
+    raise ConnectionError(f"No answer from directory {directory}")
@@ -0,0 +1,138 @@
+from pygame.event import Event
+import pygame
+from dpongpy import Settings, FixedTimestep
+from dpongpy.controller import ControlEvent
+from dpongpy.remote import handle_safely
+from dpongpy.remote.udp import UdpServer, Address
+from dpongpy.remote.presentation import deserialize_event, CODECS
+from dpongpy.remote.centralised import PongCoordinator, check_game_event, DEFAULT_PORT
+from dpongpy.remote.centralised.directory import report, REPORT_INTERVAL
+from dpongpy.journal import MatchJournal, room_journal
+from dpongpy.log import logger
+from typing import Optional
+import time
+
+
+DEFAULT_ROOM = "default"
+LOAD_SMOOTHING = 0.05
+
+
+def room_of(event: Event) -> str:
+    room = event.dict.get('room') or DEFAULT_ROOM
+    if not isinstance(room, str):
+        raise ValueError(f"Invalid room {room!r}")
+    return room
+
+
+class Room(PongCoordinator):
+    # a match hosted by a MultiRoomCoordinator: it shares the coordinator's server, while events go to its own queue
+
+    def __init__(self, room_id: str, server: UdpServer, settings: Settings):
+        self.room_id = room_id
+        self._shared_server = server
+        super().__init__(settings)
+
+    def create_server(self):
+        return self._shared_server
+
+    def create_journal(self) -> Optional[MatchJournal]:
+        # one journal per match, named after the room: settings.journal is their common prefix
+        if not self.settings.journal:
+            return None
+        try:
+            return room_journal(self.settings.journal, self.room_id)
+        except OSError as e:
+            logger.error(f"Room {self.room_id} is not recorded, as its journal could not be opened: {e}")
+            return None
+
+    def start_receiving(self):
+        pass # the multi-room coordinator receives messages on behalf of all rooms
+
+    def after_run(self):
+        # the server is shared, and pygame is still in use by other rooms
+        if self.journal is not None:
+            self.journal.close()
+
+
+class MultiRoomCoordinator:
+    # hosts many independent matches in one process: datagrams are routed to rooms according to their room id,
+    # and all rooms are stepped by the same loop, one frame each
+
+    def __init__(self, settings: Settings = None):
+        self.settings = settings or Settings()
+        assert self.settings.max_rooms > 0, "At least one room must be allowed"
+        self._serializer, self._deserializer = CODECS[self.settings.codec]
+        self.server = self.create_server()
+        self.rooms: dict[str, Room] = dict()
+        self.clock = pygame.time.Clock()
+        self.dt = None
+        self.load = 0.0 # fraction of the frame budget spent computing
+        self._directory = Address.parse(self.settings.directory) if self.settings.directory else None
+        self._reports = FixedTimestep(1 / REPORT_INTERVAL, max_ticks_per_frame=1)
+        self.running = True
+
+    def create_server(self):
+        return UdpServer(self.settings.port or DEFAULT_PORT)
+
+    def run(self):
+        try:
+            self.dt = 0
+            pygame.init()
+            while self.running:
+                self.run_frame()
+                self.dt = self.clock.tick(self.settings.fps) / 1000
+        finally:
+            for room in self.rooms.values():
+                room.after_run()
+            self.server.close()
+            pygame.quit()
+
+    def run_frame(self):
+        if pygame.event.get(pygame.QUIT): # e.g. SIGTERM, as translated by SDL
+            self.stop()
+            return
+        start = time.perf_counter()
+        self._handle_ingoing_messages()
+        for room_id, room in list(self.rooms.items()):
+            room.dt = self.dt
+            room.run_frame()
+            if not room.running:
+                room.after_run()
+                del self.rooms[room_id]
+                logger.info(f"Room {room_id} closed, {len(self.rooms)} rooms left")
+        self.load += LOAD_SMOOTHING * ((time.perf_counter() - start) * self.settings.fps - self.load)
+        if self._directory is not None and self._reports.advance(self.dt or 0) > 0:
+            self._report()
+
+    def _report(self):
+        players = {room_id: len(room.pong.paddles) for room_id, room in self.rooms.items()}
+        report(self.server, self._directory, self._serializer, players, self.settings.max_rooms, self.load)
+
+    def stop(self):
+        self.running = False
+
+    def _handle_ingoing_messages(self):
+        while self.running:
+            message, sender = self.server.receive(decode=False, timeout=0)
+            if message is None:
+                break
+            handle_safely(self._handle_ingoing_message, message, sender)
+
+    def _handle_ingoing_message(self, message: bytes, sender: Address):
+        self._route(deserialize_event(message, self._deserializer), sender)
+
+    def _route(self, event: Event, sender: Address):
+        room_id = room_of(event)
+        event = Event(event.type, {key: value for key, value in event.dict.items() if key != 'room'})
+        room = self.rooms.get(room_id)
+        if room is None:
+            if not ControlEvent.PLAYER_JOIN.matches(event):
+                logger.debug(f"Ignoring {event} from {sender}, as room {room_id} does not exist")
+                return
+            check_game_event(event) # malformed joins must not open rooms
+            if len(self.rooms) >= self.settings.max_rooms:
+                logger.warning(f"Refusing {sender} in room {room_id}, as {len(self.rooms)} rooms are already open")
+                return
+            room = self.rooms[room_id] = Room(room_id, self.server, self.settings)
+            logger.info(f"Room {room_id} opened, {len(self.rooms)} rooms in total")
+        room._handle_ingoing_event(event, sender)
@@ -0,0 +1,140 @@
+from pygame.event import Event
+from dpongpy import Settings
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent
+from dpongpy.remote.udp import UdpClient, Address
+from dpongpy.remote.presentation import serialize, deserialize
+from dpongpy.remote.delta import SnapshotDecoder, apply, is_restart, INPUT_KEYS
+from dpongpy.remote.centralised import PongCoordinator, PongTerminal
+from dpongpy.log import logger
+from typing import Optional
+
+
+SUBSCRIPTION_INTERVAL = 1.0 # seconds without snapshots, before subscribing again
+
+
+class Subscription:
+    # subscriptions are resent until snapshots flow, as they may get lost (or the upstream may be restarted)
+
+    def __init__(self, interval: float = SUBSCRIPTION_INTERVAL):
+        self.interval = interval
+        self._silence = interval # the first subscription is due at once
+
+    def received(self):
+        self._silence = 0.0
+
+    def due(self, dt: float) -> bool:
+        self._silence += dt
+        if self._silence < self.interval:
+            return False
+        self._silence = 0.0
+        return True
+
+
+class PongSpectator(PongTerminal):
+    # a read-only terminal: it controls no paddle, and may ask for fewer snapshots than players get
+    controlled_paddles = 0
+
+    def __init__(self, settings: Settings = None):
+        settings = settings or Settings()
+        settings.initial_paddles = []
+        settings.client_prediction = False
+        if settings.snapshot_rate and settings.interpolation_delay is None:
+            settings.interpolation_delay = 2 / settings.snapshot_rate # few snapshots would make for a jerky game
+        super().__init__(settings)
+        self._subscription = Subscription()
+        self._received = 0
+
+    def on_game_over(self):
+        self.stop()
+
+    def _acknowledge_inputs(self, state: dict):
+        pass
+
+    def _send_inputs(self):
+        # spectators have no inputs to send: they just keep their subscription alive
+        if self.stats.received > self._received:
+            self._received = self.stats.received
+            self._subscription.received()
+        if self._subscription.due(self.dt or 0):
+            self._send(self.controller.create_event(ControlEvent.SPECTATE, rate=self.settings.snapshot_rate))
+
+
+class PongRelay(PongCoordinator):
+    # follows an upstream coordinator (or relay) as one spectator, and re-broadcasts its snapshots to spectators
+    # of its own: relays may follow relays, so that audiences of any size add no load to the upstream coordinator
+
+    def __init__(self, settings: Settings = None):
+        settings = settings or Settings()
+        assert settings.upstream, "Relays need an upstream coordinator (or relay) to follow"
+        settings.tick_rate = None # relays do not simulate the game, they just forward the upstream's state
+        settings.journal = None # the upstream coordinator is the one recording the match
+        super().__init__(settings)
+        self.upstream = UdpClient(Address.parse(settings.upstream))
+        self._upstream_snapshots = SnapshotDecoder()
+        self._upstream_seq: Optional[int] = None
+        self._subscription = Subscription()
+        self._fresh = False # whether the upstream's state changed since the last broadcast
+
+    def create_controller(relay, paddle_commands):
+        from dpongpy.controller.local import EventHandler, InputHandler
+
+        class Controller(EventHandler, InputHandler):
+            def handle_inputs(self, dt=None):
+                relay._follow_upstream(dt or 0)
+
+            def on_game_over(self, pong: Pong):
+                relay.stop()
+
+        return Controller(relay.pong)
+
+    def _follow_upstream(self, dt: float):
+        if self._subscription.due(dt):
+            self._send_upstream(self.controller.create_event(ControlEvent.SPECTATE, rate=self.settings.snapshot_rate))
+        snapshot = None
+        while self.running:
+            message = self.upstream.receive(decode=False, timeout=0)
+            if message is None:
+                break
+            event = deserialize(message, self._deserializer)
+            if not ControlEvent.TIME_ELAPSED.matches(event):
+                continue
+            if is_restart(event.seq, event.base, self._upstream_seq):
+                logger.info(f"Upstream restarted: snapshots start over from {event.seq}")
+                self._upstream_snapshots, self._upstream_seq, snapshot = SnapshotDecoder(), None, None
+            if snapshot is None or event.seq > snapshot.seq:
+                snapshot = event
+        if snapshot is None or (self._upstream_seq is not None and snapshot.seq <= self._upstream_seq):
+            return
+        self._subscription.received()
+        state = self._upstream_snapshots.decode(snapshot.seq, snapshot.base, snapshot.delta)
+        if state is not None:
+            apply(self.pong, state)
+            self._processed_inputs = {side: state[key] for side, key in INPUT_KEYS.items() if key in state}
+            self._upstream_seq = snapshot.seq
+            self._fresh = True
+            self._send_upstream(self.controller.create_event(ControlEvent.SNAPSHOT_ACK, seq=snapshot.seq))
+
+    def _send_upstream(self, event: Event):
+        if self.settings.room is not None:
+            event = self.controller.create_event(event, room=self.settings.room)
+        self.upstream.send(serialize(event, self._serializer))
+
+    def _snapshot_due(self) -> bool:
+        due = super()._snapshot_due()
+        if due and self._fresh:
+            self._fresh = False
+            return True
+        return False
+
+    def _handle_ingoing_event(self, event: Event, sender: Address):
+        if ControlEvent.SPECTATE.matches(event):
+            self.subscribe(sender, event.dict.get('rate'))
+        elif ControlEvent.SNAPSHOT_ACK.matches(event):
+            self.acknowledge(sender, event.seq)
+        else:
+            logger.debug(f"Ignoring {event} from {sender}, as spectators are read-only")
+
+    def after_run(self):
+        super().after_run()
+        self.upstream.close()
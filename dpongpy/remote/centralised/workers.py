@@ -0,0 +1,140 @@
+from dpongpy import Settings
+from dpongpy.remote import handle_safely
+from dpongpy.remote.udp import UdpServer, Address
+from dpongpy.remote.presentation import deserialize_event, CODECS
+from dpongpy.remote.centralised import DEFAULT_PORT
+from dpongpy.remote.centralised.rooms import MultiRoomCoordinator, room_of
+from dpongpy.log import logger
+from dataclasses import replace
+from multiprocessing.connection import Connection
+import multiprocessing
+import time
+import zlib
+
+
+DEFAULT_ROOMS_PER_WORKER = 64
+SUPERVISION_INTERVAL = 0.1
+RESTART_DELAY = 1.0 # minimum time between two starts of the same worker, to avoid restarting a failing one in a loop
+STOP_TIMEOUT = 1.0
+# workers are spawned rather than forked: otherwise they would inherit the dispatcher's socket and the pipes
+# of their siblings, hence they would never notice that the dispatcher is gone
+_PROCESSES = multiprocessing.get_context('spawn')
+
+
+def worker_port(port: int, index: int) -> int:
+    return port + 1 + index
+
+
+def shard_for(room_id: str, workers: int) -> int:
+    # stable across processes and restarts, unlike hash()
+    return zlib.crc32(room_id.encode()) % workers
+
+
+class WorkerCoordinator(MultiRoomCoordinator):
+    # a multi-room coordinator, which also receives the datagrams forwarded by the dispatcher:
+    # peers are answered from the worker's own port, hence they talk to the worker directly from then on
+
+    def __init__(self, settings: Settings, port: int, inbox: Connection):
+        self._port = port
+        self._inbox = inbox
+        super().__init__(settings)
+
+    def create_server(self):
+        return UdpServer(self._port)
+
+    def _handle_ingoing_messages(self):
+        try:
+            while self._inbox.poll():
+                message, sender = self._inbox.recv()
+                handle_safely(self._handle_ingoing_message, message, sender)
+        except EOFError:
+            logger.warning("Dispatcher is gone, stopping")
+            self.stop()
+        super()._handle_ingoing_messages()
+
+
+def run_worker(settings: Settings, port: int, inbox: Connection):
+    WorkerCoordinator(settings, port, inbox).run()
+
+
+class ShardedCoordinator:
+    # spreads rooms among worker processes, each one hosting its rooms on its own port (next to the public one).
+    # the public port is served by a dispatcher, forwarding datagrams to the worker in charge of their room:
+    # as workers answer from their own port, only the first datagrams of each peer go through the dispatcher.
+    # the dispatcher also supervises workers, restarting them if they die
+
+    def __init__(self, settings: Settings = None):
+        settings = settings or Settings()
+        assert settings.workers > 0, "At least one worker is required"
+        self.settings = replace(settings, max_rooms=settings.max_rooms or DEFAULT_ROOMS_PER_WORKER)
+        self.port = self.settings.port or DEFAULT_PORT
+        self._deserializer = CODECS[self.settings.codec][1]
+        self.server = UdpServer(self.port)
+        self._workers: list[multiprocessing.process.BaseProcess | None] = [None] * self.settings.workers
+        self._inboxes: list[Connection | None] = [None] * self.settings.workers
+        self._started_at = [0.0] * self.settings.workers
+        self.restarts = 0
+        self.running = True
+
+    def run(self):
+        try:
+            for index in range(len(self._workers)):
+                self._start_worker(index)
+            while self.running:
+                message, sender = self.server.receive(decode=False, timeout=SUPERVISION_INTERVAL)
+                if message is not None:
+                    handle_safely(self._dispatch, message, sender)
+                self._supervise()
+        finally:
+            self._stop_workers()
+            self.server.close()
+
+    def stop(self):
+        self.running = False
+
+    def _start_worker(self, index: int):
+        inbox, outbox = _PROCESSES.Pipe(duplex=False)
+        settings = replace(self.settings, port=worker_port(self.port, index))
+        worker = _PROCESSES.Process(target=run_worker, args=(settings, settings.port, inbox),
+                                    name=f"dpongpy-worker-{index}", daemon=True)
+        worker.start()
+        inbox.close() # only the worker reads from the pipe
+        self._workers[index], self._inboxes[index] = worker, outbox
+        self._started_at[index] = time.monotonic()
+        logger.info(f"Worker {index} started on port {settings.port} (pid {worker.pid})")
+
+    def _supervise(self):
+        for index, worker in enumerate(self._workers):
+            assert worker is not None, f"Worker {index} was never started"
+            if worker.is_alive() or time.monotonic() - self._started_at[index] < RESTART_DELAY:
+                continue
+            logger.warning(f"Worker {index} exited with code {worker.exitcode}, restarting it")
+            worker.join()
+            inbox = self._inboxes[index]
+            if inbox is not None:
+                inbox.close()
+            self._start_worker(index)
+            self.restarts += 1 # only once the new worker is in place, as restarts are observed by other threads
+
+    def _dispatch(self, message: bytes, sender: Address):
+        # room_of checks that rooms are strings, as they are sharded by their encoding
+        index = shard_for(room_of(deserialize_event(message, self._deserializer)), len(self._workers))
+        inbox = self._inboxes[index]
+        try:
+            assert inbox is not None, f"Worker {index} was never started"
+            inbox.send((message, sender))
+        except (BrokenPipeError, OSError):
+            logger.warning(f"Dropping message from {sender}, as worker {index} is down")
+
+    def _stop_workers(self):
+        for inbox in self._inboxes:
+            if inbox is not None:
+                inbox.close() # workers stop as soon as they notice
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for worker in self._workers:
+            if worker is None:
+                continue
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                worker.kill() # SDL turns SIGTERM into a QUIT event, which a busy worker may never get to
+                worker.join()
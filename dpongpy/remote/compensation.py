@@ -0,0 +1,78 @@
+from dpongpy.model import *
+from collections import deque
+from typing import Optional, Union
+import bisect
+
+
+DEFAULT_MAX_REWIND = 0.2
+
+PaddleStates = dict[Direction, tuple[Vector2, Vector2]] # positions and speeds of paddles
+
+
+class LagCompensator:
+    # remembers recent paddle states, so that inputs take effect when they were issued rather than when they arrived:
+    # the paddle is rewound to the input's time, then moved forward again, replaying all inputs it received since then.
+    # only paddles are rewound: they never interact with each other, and collisions with the ball are not revised
+
+    def __init__(self, max_rewind: float = DEFAULT_MAX_REWIND):
+        assert max_rewind >= 0, "Max rewind must be non-negative"
+        self.max_rewind = max_rewind
+        self.compensated = 0
+        self.clamped = 0 # inputs issued too long ago, applied as if they were issued max_rewind seconds ago
+        self._history: deque[tuple[float, PaddleStates]] = deque()
+        self._inputs: dict[Direction, list[tuple[float, Direction]]] = dict()
+
+    def record(self, pong: Pong):
+        self._history.append((pong.time, {paddle.side: (paddle.position, paddle.speed) for paddle in pong.paddles}))
+        horizon = pong.time - self.max_rewind
+        while len(self._history) > 1 and self._history[1][0] <= horizon:
+            self._history.popleft()
+        oldest = self._history[0][0]
+        for inputs in self._inputs.values():
+            while inputs and inputs[0][0] < oldest:
+                del inputs[0]
+
+    def forget(self, side: Direction):
+        self._inputs.pop(side, None)
+
+    def move_paddle(self, pong: Pong, side: Direction, direction: Direction, input_time: Optional[float] = None) -> float:
+        # returns how far back in time the input was applied
+        now = pong.time
+        time = now if input_time is None else min(input_time, now)
+        if time < now - self.max_rewind:
+            self.clamped += 1
+            time = now - self.max_rewind
+        inputs = self._inputs.setdefault(side, [])
+        base = self._base_for(side, time) if time < now else None
+        if base is None:
+            inputs.append((now, direction))
+            pong.move_paddle(side, direction)
+            return 0.0
+        bisect.insort(inputs, (time, direction), key=lambda input: input[0])
+        start, (position, speed) = base
+        paddle = pong.paddle(side)
+        paddle.position, paddle.speed = position, speed
+        # the paddle states recorded since then are rewritten along the way, as later inputs may rewind to them.
+        # at the same time, states come first, as they were recorded before the inputs of that time were applied
+        timeline: list[tuple[float, Union[Direction, PaddleStates]]] = \
+            [(issued, replayed) for issued, replayed in inputs if issued >= start]
+        timeline += [(recorded, paddles) for recorded, paddles in self._history if recorded > start and side in paddles]
+        timeline.sort(key=lambda entry: (entry[0], isinstance(entry[1], Direction)))
+        for moment, item in timeline:
+            if moment > start:
+                pong.update_paddle(side, moment - start)
+                start = moment
+            if isinstance(item, Direction):
+                pong.move_paddle(side, item)
+            else:
+                item[side] = (paddle.position, paddle.speed)
+        if now > start:
+            pong.update_paddle(side, now - start)
+        self.compensated += 1
+        return now - time
+
+    def _base_for(self, side: Direction, time: float) -> Optional[tuple[float, tuple[Vector2, Vector2]]]:
+        for recorded, paddles in reversed(self._history):
+            if recorded <= time:
+                return (recorded, paddles[side]) if side in paddles else None
+        return None
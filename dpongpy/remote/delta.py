@@ -0,0 +1,165 @@
+from dataclasses import replace
+from dpongpy.model import *
+from typing import Optional
+
+
+# snapshots of Pong are flattened into dictionaries, so that deltas can be computed field by field.
+# in deltas, None marks fields which were removed (e.g. the fields of a paddle which left the game)
+_PONG_FIELDS = ('size', 'config', 'time', 'updates')
+_OBJECT_FIELDS = ('size', 'position', 'speed')
+_PADDLE_SIDES = tuple(side for side in Direction.values() if side != Direction.NONE)
+
+
+def _object_keys(prefix: str) -> tuple[str, ...]:
+    return tuple(f'{prefix}.{field}' for field in _OBJECT_FIELDS)
+
+
+BALL_KEYS = _object_keys('ball')
+PADDLE_KEYS: dict[Direction, tuple[str, ...]] = {side: _object_keys(side.name.lower()) for side in _PADDLE_SIDES}
+# sequence number of the last input processed by the coordinator, for each paddle
+INPUT_KEYS: dict[Direction, str] = {side: f'{side.name.lower()}.input' for side in _PADDLE_SIDES}
+STATE_KEYS = _PONG_FIELDS + BALL_KEYS + tuple(key for keys in PADDLE_KEYS.values() for key in keys) + \
+    tuple(INPUT_KEYS.values())
+
+DEFAULT_KEYFRAME_INTERVAL = 60
+DEFAULT_HISTORY_SIZE = 64
+RESTART_GAP = 64 # keyframes this older than the latest snapshot are not late, but come from a restarted encoder
+
+
+def flatten(pong: Pong, inputs: dict[Direction, int] = None) -> dict:
+    state = {
+        'size': Vector2(pong.size),
+        'config': replace(pong.config),
+        'time': pong.time,
+        'updates': pong.updates,
+    }
+    _flatten_object(pong.ball, BALL_KEYS, state)
+    for paddle in pong.paddles:
+        _flatten_object(paddle, PADDLE_KEYS[paddle.side], state)
+    for side, seq in (inputs or {}).items():
+        state[INPUT_KEYS[side]] = seq
+    return state
+
+
+def _flatten_object(obj: GameObject, keys: tuple[str, ...], state: dict):
+    for key, field in zip(keys, _OBJECT_FIELDS):
+        state[key] = Vector2(getattr(obj, field))
+
+
+def to_pong(state: dict) -> Pong:
+    return apply(Pong(state['size'], state['config'], paddles=[]), state)
+
+
+def apply(pong: Pong, state: dict) -> Pong:
+    # writes the state into the existing objects of pong, only adding or removing paddles if needed
+    if state['size'] != pong.size:
+        pong.size = state['size']
+        pong.board = Board(pong.size)
+    pong.config = state['config']
+    pong.time = state['time']
+    pong.updates = state['updates']
+    _apply_to_object(pong.ball, BALL_KEYS, state)
+    for side, keys in PADDLE_KEYS.items():
+        if keys[0] in state:
+            if pong.has_paddle(side):
+                _apply_to_object(pong.paddle(side), keys, state)
+            else:
+                size, position, speed = (state[key] for key in keys)
+                pong.add_paddle(side, Paddle(size, side, position, speed))
+        elif pong.has_paddle(side):
+            pong.remove_paddle(side)
+    return pong
+
+
+def _apply_to_object(obj: GameObject, keys: tuple[str, ...], state: dict):
+    size, position, speed = keys
+    obj.size = state[size]
+    obj.position = state[position]
+    obj.speed = state[speed]
+
+
+def diff(base: dict, current: dict) -> dict:
+    delta = {key: value for key, value in current.items() if key not in base or base[key] != value}
+    for key in base:
+        if key not in current:
+            delta[key] = None
+    return delta
+
+
+def patch(base: dict, delta: dict) -> dict:
+    state = dict(base)
+    for key, value in delta.items():
+        if value is None:
+            state.pop(key, None)
+        else:
+            state[key] = value
+    return state
+
+
+class _History:
+    def __init__(self, size: int):
+        assert size > 0, "History size must be positive"
+        self.size = size
+        self._states: dict[int, dict] = dict()
+
+    def __contains__(self, seq) -> bool:
+        return seq in self._states
+
+    def __getitem__(self, seq: int) -> dict:
+        return self._states[seq]
+
+    def __setitem__(self, seq: int, state: dict):
+        self._states[seq] = state
+        # sequence numbers are mostly inserted in increasing order, so the oldest ones come first
+        while self._states and next(iter(self._states)) <= seq - self.size:
+            del self._states[next(iter(self._states))]
+
+
+class SnapshotEncoder:
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL, history_size: int = DEFAULT_HISTORY_SIZE):
+        assert keyframe_interval > 0, "Keyframe interval must be positive"
+        self.keyframe_interval = keyframe_interval
+        self.seq = -1
+        self._history = _History(history_size)
+
+    def push(self, pong: Pong, inputs: dict[Direction, int] = None) -> int:
+        self.seq += 1
+        self._history[self.seq] = flatten(pong, inputs)
+        return self.seq
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.seq % self.keyframe_interval == 0
+
+    def base_for(self, acked: Optional[int]) -> Optional[int]:
+        if acked is None or self.is_keyframe or acked not in self._history or acked >= self.seq:
+            return None
+        return acked
+
+    def delta(self, base: Optional[int]) -> dict:
+        current = self._history[self.seq]
+        if base is None:
+            return current
+        return diff(self._history[base], current)
+
+
+def is_restart(seq: int, base: Optional[int], last_seq: Optional[int]) -> bool:
+    # sequence numbers start over when coordinators are restarted, and the first snapshots they send are keyframes
+    return base is None and last_seq is not None and seq < last_seq - RESTART_GAP
+
+
+class SnapshotDecoder:
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE):
+        self._history = _History(history_size)
+        self.undecodable = 0
+
+    def decode(self, seq: int, base: Optional[int], delta: dict) -> Optional[dict]:
+        if base is None:
+            state = patch({}, delta)
+        elif base in self._history:
+            state = patch(self._history[base], delta)
+        else:
+            self.undecodable += 1
+            return None
+        self._history[seq] = state
+        return state
@@ -0,0 +1,83 @@
+from pygame.event import Event
+from dpongpy.model import Direction
+from dpongpy.controller import ControlEvent, EventQueue
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+DEFAULT_INGRESS_CAPACITY = 1024
+
+
+@dataclass
+class IngressStats:
+    posted: int = 0
+    coalesced: int = 0 # unstamped paddle moves superseded by a newer one for the same paddle, in the same batch
+    dropped: int = 0 # paddle moves refused, as the queue was full
+    forced: int = 0 # other events accepted, despite the queue being full
+    high_watermark: int = 0
+
+
+class IngressQueue(EventQueue):
+    # bounded queue between the thread receiving events and the one running the game, which drains it in batches.
+    # deque's append and popleft are atomic, hence no lock is needed with one producer and one consumer.
+    # when full, paddle moves are refused (terminals resend unacknowledged inputs), while other events never are
+
+    def __init__(self, capacity: int = DEFAULT_INGRESS_CAPACITY):
+        assert capacity > 0, "Capacity must be positive"
+        self.capacity = capacity
+        self.stats = IngressStats()
+        self._events: deque[Event] = deque()
+
+    def __len__(self):
+        return len(self._events)
+
+    @property
+    def backpressure(self) -> float:
+        return len(self._events) / self.capacity
+
+    def post(self, event: Event):
+        size = len(self._events)
+        if size >= self.capacity:
+            if ControlEvent.PADDLE_MOVE.matches(event):
+                self.stats.dropped += 1
+                return
+            self.stats.forced += 1
+        self._events.append(event)
+        self.stats.posted += 1
+        if size + 1 > self.stats.high_watermark:
+            self.stats.high_watermark = size + 1
+
+    def get(self, types: tuple[int, ...]) -> list[Event]:
+        batch: list[Event] = []
+        others: list[Event] = []
+        moves: dict[Optional[Direction], int] = dict() # paddle -> index of its latest coalescable move in batch
+        for _ in range(len(self._events)): # events posted meanwhile are left for the next batch
+            event = self._events.popleft()
+            if event.type not in types:
+                others.append(event)
+            elif _coalescable(event) and event.paddle_index in moves:
+                index = moves[event.paddle_index]
+                if _newer(event, batch[index]):
+                    batch[index] = event
+                self.stats.coalesced += 1
+            else:
+                side = event.dict.get('paddle_index')
+                if _coalescable(event):
+                    moves[side] = len(batch)
+                else:
+                    moves.pop(side, None) # e.g. joins or leaves: later moves of that paddle must not overtake them
+                batch.append(event)
+        self._events.extendleft(reversed(others))
+        return batch
+
+
+def _coalescable(event: Event) -> bool:
+    # stamped moves are applied (by lag compensation) when they were issued, hence none of them is superseded
+    return ControlEvent.PADDLE_MOVE.matches(event) and event.dict.get('input_time') is None
+
+
+def _newer(move: Event, other: Event) -> bool:
+    # resent inputs may arrive after newer ones
+    seq, other_seq = getattr(move, 'input_seq', None), getattr(other, 'input_seq', None)
+    return seq is None or other_seq is None or seq > other_seq
@@ -0,0 +1,63 @@
+from dpongpy.model import *
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+REDUNDANT_INPUTS = 3 # most recent inputs carried by each packet, so that losing a packet loses no input
+MIN_RESEND_INTERVAL = 0.1
+
+
+def is_packet(inputs) -> bool:
+    # packets come from the network, hence their shape is checked before unpacking them
+    return isinstance(inputs, list) and all(
+        isinstance(entry, list) and len(entry) == 3 and isinstance(entry[0], int) and isinstance(entry[1], Direction)
+        and (entry[2] is None or isinstance(entry[2], (int, float)))
+        for entry in inputs)
+
+
+@dataclass
+class SentInput:
+    seq: int
+    direction: Direction
+    stamp: Optional[float] = None # when the input was issued, according to the coordinator's (estimated) clock
+
+
+class InputBatcher:
+    # collects the inputs issued during a frame, to send at most one packet per frame.
+    # each packet carries the most recent inputs not acknowledged yet: it is resent, from time to time,
+    # until the coordinator acknowledges them (through the input sequence numbers in its snapshots)
+
+    def __init__(self, redundancy: int = REDUNDANT_INPUTS):
+        assert redundancy > 0, "At least one input per packet is required"
+        self.time = 0.0
+        self.acked_seq = 0
+        self.packets = 0
+        self._last_seq = 0
+        self._recent: deque[SentInput] = deque(maxlen=redundancy)
+        self._fresh = False
+        self._last_sent: Optional[float] = None
+
+    def input(self, direction: Direction, stamp: Optional[float] = None, seq: Optional[int] = None) -> int:
+        self._last_seq = self._last_seq + 1 if seq is None else seq
+        self._recent.append(SentInput(self._last_seq, direction, stamp))
+        self._fresh = True
+        return self._last_seq
+
+    def acknowledge(self, seq: int):
+        self.acked_seq = max(self.acked_seq, seq)
+
+    def advance(self, dt: float):
+        self.time += dt
+
+    def packet(self, resend_interval: float = MIN_RESEND_INTERVAL) -> Optional[list[list]]:
+        unacked = [sent for sent in self._recent if sent.seq > self.acked_seq]
+        if not unacked:
+            self._fresh = False
+            return None
+        if not self._fresh and self._last_sent is not None and self.time - self._last_sent < resend_interval:
+            return None
+        self._fresh = False
+        self._last_sent = self.time
+        self.packets += 1
+        return [[sent.seq, sent.direction, sent.stamp] for sent in unacked]
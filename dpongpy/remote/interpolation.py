@@ -0,0 +1,110 @@
+from dpongpy.model import *
+from dpongpy.remote.delta import BALL_KEYS, PADDLE_KEYS
+from typing import Iterable, Optional
+import bisect
+
+
+DEFAULT_INTERPOLATION_DELAY = 0.1
+DEFAULT_MAX_EXTRAPOLATION = 0.25
+DEFAULT_CAPACITY = 32
+CLOCK_CORRECTION = 0.1 # fraction of the playback clock's error which is recovered at each frame
+
+
+class InterpolationBuffer:
+    # buffers snapshots, and plays them back a fixed delay behind the coordinator's (estimated) game time:
+    # objects are rendered in between the two snapshots surrounding the playback time, or briefly
+    # extrapolated from the newest one if no newer snapshot arrived in time
+
+    def __init__(self,
+                 delay: float = DEFAULT_INTERPOLATION_DELAY,
+                 max_extrapolation: float = DEFAULT_MAX_EXTRAPOLATION,
+                 capacity: int = DEFAULT_CAPACITY):
+        assert delay >= 0, "Delay must be non-negative"
+        self.delay = delay
+        self.max_extrapolation = max_extrapolation
+        self.capacity = capacity
+        self.time: Optional[float] = None
+        self.extrapolated = 0
+        self._times: list[float] = []
+        self._states: list[dict] = []
+        self._since_newest = 0.0
+
+    def __len__(self):
+        return len(self._states)
+
+    def push(self, state: dict):
+        time = state['time']
+        index = bisect.bisect_left(self._times, time)
+        if index < len(self._times) and self._times[index] == time:
+            return
+        if index == len(self._times):
+            self._since_newest = 0.0
+        self._times.insert(index, time)
+        self._states.insert(index, state)
+        if len(self._states) > self.capacity:
+            del self._times[0], self._states[0]
+        if self.time is None:
+            self.time = self._target_time
+
+    @property
+    def _target_time(self) -> float:
+        return self._times[-1] + self._since_newest - self.delay
+
+    def advance(self, dt: float):
+        if self.time is None:
+            return
+        self._since_newest += dt
+        self.time += dt
+        error = self._target_time - self.time
+        if abs(error) > max(self.delay, dt):
+            self.time += error
+        else:
+            self.time += error * CLOCK_CORRECTION
+
+    def positions(self, keys: Iterable[str]) -> dict[str, Vector2]:
+        time = self.time
+        if time is None:
+            return dict()
+        index = bisect.bisect_right(self._times, time)
+        if index == 0:
+            return {key: self._states[0][key] for key in keys if key in self._states[0]}
+        if index == len(self._times):
+            return self._extrapolate(keys, time)
+        before, after = self._states[index - 1], self._states[index]
+        interval = self._times[index] - self._times[index - 1]
+        ratio = (time - self._times[index - 1]) / interval
+        result = dict()
+        for key in keys:
+            if key in before and key in after:
+                if self._teleported(key, before, after, interval):
+                    result[key] = after[key] if ratio >= 0.5 else before[key]
+                else:
+                    result[key] = before[key].lerp(after[key], ratio)
+        return result
+
+    @staticmethod
+    def _teleported(key: str, before: dict, after: dict, interval: float) -> bool:
+        # e.g. the ball being reset: sliding it across the board would be misleading
+        speed_key = key.replace('.position', '.speed')
+        speed = max(before.get(speed_key, Vector2()).length(), after.get(speed_key, Vector2()).length())
+        return before[key].distance_to(after[key]) > 2 * speed * interval + 1
+
+    def _extrapolate(self, keys: Iterable[str], time: float) -> dict[str, Vector2]:
+        newest = self._states[-1]
+        elapsed = min(time - self._times[-1], self.max_extrapolation)
+        if elapsed > 0:
+            self.extrapolated += 1
+        result = dict()
+        for key in keys:
+            if key in newest:
+                speed = newest.get(key.replace('.position', '.speed'))
+                result[key] = newest[key] if speed is None else newest[key] + speed * elapsed
+        return result
+
+    def interpolate(self, pong: Pong, exclude: Iterable[Direction] = ()):
+        objects = {BALL_KEYS[1]: pong.ball}
+        for paddle in pong.paddles:
+            if paddle.side not in exclude:
+                objects[PADDLE_KEYS[paddle.side][1]] = paddle
+        for key, position in self.positions(objects.keys()).items():
+            objects[key].position = position
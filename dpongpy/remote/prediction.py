@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from dpongpy.model import *
+from typing import Optional
+
+
+RTT_SMOOTHING = 0.125 # weight of new samples in the round-trip time estimate, as in TCP
+
+
+@dataclass
+class PendingInput:
+    seq: int
+    direction: Direction
+    time: float # when the input was issued, according to the predictor's clock
+    stamp: Optional[float] = None # when the input was issued, according to the coordinator's (estimated) clock
+
+
+class PaddlePredictor:
+    # moves the local paddle as soon as inputs are issued, rather than waiting for the coordinator.
+    # authoritative snapshots lag behind local inputs by (roughly) a round trip: when they arrive,
+    # inputs issued in the meanwhile (or not acknowledged yet) are replayed on top of them.
+
+    def __init__(self, side: Direction):
+        self.side = side
+        self.time = 0.0
+        self.rtt: Optional[float] = None
+        self.acked_seq = 0
+        self._last_seq = 0
+        self._pending: list[PendingInput] = []
+
+    @property
+    def pending(self) -> list[PendingInput]:
+        return list(self._pending)
+
+    def input(self, pong: Pong, direction: Direction, stamp: Optional[float] = None) -> int:
+        self._last_seq += 1
+        self._pending.append(PendingInput(self._last_seq, direction, self.time, stamp))
+        if pong.has_paddle(self.side):
+            pong.move_paddle(self.side, direction)
+        return self._last_seq
+
+    def advance(self, pong: Pong, dt: float):
+        self.time += dt
+        if pong.has_paddle(self.side):
+            pong.update_paddle(self.side, dt)
+
+    def reconcile(self, pong: Pong, processed_seq: int):
+        # pong has just been overwritten with an authoritative snapshot
+        acked = [pending for pending in self._pending if pending.seq <= processed_seq]
+        if acked and processed_seq > self.acked_seq:
+            self._sample_rtt(self.time - acked[-1].time)
+        self.acked_seq = max(self.acked_seq, processed_seq)
+        self._pending = [pending for pending in self._pending if pending.seq > processed_seq]
+        if not pong.has_paddle(self.side):
+            return
+        if self.rtt is not None:
+            start = self.time - self.rtt
+        else: # until an input gets acknowledged, snapshots are assumed not to reflect any pending input
+            start = self._pending[0].time if self._pending else self.time
+        for pending in self._pending:
+            if pending.time > start:
+                pong.update_paddle(self.side, pending.time - start)
+                start = pending.time
+            pong.move_paddle(self.side, pending.direction)
+        if self.time > start:
+            pong.update_paddle(self.side, self.time - start)
+
+    def _sample_rtt(self, sample: float):
+        if self.rtt is None:
+            self.rtt = sample
+        else:
+            self.rtt += RTT_SMOOTHING * (sample - self.rtt)
@@ -1,7 +1,10 @@
 from pygame.event import Event
 from dpongpy.model import *
 from dpongpy.controller import ControlEvent
+from dpongpy.remote.delta import STATE_KEYS
+from typing import Callable, Protocol
 import json
+import struct
 
 
 # if true, makes JSON output earies to read via newlines and spaces.
@@ -11,21 +14,49 @@ _DEBUG = False
 
 
 class Serializer:
-    primitives = [int, float, str, bool]
+    primitives = [int, float, str, bool, type(None)]
     containers = [list, tuple]
 
+    def __init__(self):
+        self._registry: dict[type, Callable[[object], dict]] = dict()
+        self._encoders: dict[type, Callable[[object], object]] = dict()
+
+    def register(self, klass: type, encode: Callable[[object], dict]):
+        self._registry[klass] = encode
+        self._encoders.clear()
+
     def serialize(self, obj) -> str:
         return json.dumps(self._serialize(obj), indent=2 if _DEBUG else None)
 
     def _serialize(self, obj):
-        if any(isinstance(obj, primitive) for primitive in self.primitives):
-            return self._serialize_primitive(obj)
-        elif isinstance(obj, dict):
-            return self._serialize_dict(obj)
-        elif any(isinstance(obj, container) for container in self.containers):
-            return self._serialize_iterable(obj)
-        else:
-            return self._serialize_any(obj)
+        encoder = self._encoders.get(type(obj))
+        if encoder is None:
+            encoder = self._encoders[type(obj)] = self._compile(type(obj))
+        return encoder(obj)
+
+    def _compile(self, klass: type):
+        # the encoder of each type is looked up once, then cached
+        for base in klass.mro():
+            if base in self._registry:
+                return self._registered_encoder(base.__name__, self._registry[base])
+        if any(issubclass(klass, primitive) for primitive in self.primitives):
+            return self._serialize_primitive
+        elif issubclass(klass, dict):
+            return self._serialize_dict
+        elif any(issubclass(klass, container) for container in self.containers):
+            return self._serialize_iterable
+        for base in klass.mro():
+            method_name = f"_serialize_{base.__name__.lower()}"
+            if hasattr(self, method_name):
+                return getattr(self, method_name)
+        raise NotImplementedError(f"Serialization for {klass.__name__} is not implemented")
+
+    def _registered_encoder(self, type_name: str, encode: Callable[[object], dict]):
+        def encoder(obj):
+            dict = {name: self._serialize(value) for name, value in encode(obj).items()}
+            dict["$type"] = type_name
+            return dict
+        return encoder
 
     def _serialize_iterable(self, obj):
         return [self._serialize(item) for item in obj]
@@ -36,13 +67,6 @@ class Serializer:
     def _serialize_primitive(self, obj):
         return obj
 
-    def _serialize_any(self, obj):
-        for klass in type(obj).mro():
-            method_name = f"_serialize_{klass.__name__.lower()}"
-            if hasattr(self, method_name):
-                return getattr(self, method_name)(obj)
-        raise NotImplementedError(f"Serialization for {type(obj).__name__} is not implemented")
-
     def _to_dict(self, obj, *attributes):
         dict = {name : self._serialize(getattr(obj, name)) for name in attributes}
         dict["$type"] = type(obj).__name__
@@ -73,14 +97,22 @@ class Serializer:
         return self._to_dict(rectangle, "top_left", "bottom_right")
 
     def _serialize_config(self, config: Config):
-        return self._to_dict(config, 'paddle_ratio', 'ball_ratio', 'ball_speed_ratio', 'paddle_speed_ratio', 'paddle_padding')
+        return self._to_dict(config, 'paddle_ratio', 'ball_ratio', 'ball_speed_ratio', 'paddle_speed_ratio', 'paddle_padding', 'swept_collisions')
 
     def _serialize_pong(self, pong: Pong):
         return self._to_dict(pong, 'paddles', 'ball', 'config', 'size', 'time', 'updates')
 
 
 class Deserializer:
-    def deserialize(self, input: str):
+    def __init__(self):
+        self._registry: dict[str, Callable[[dict], object]] = dict()
+        self._decoders: dict[str, Callable[[dict], object]] = dict()
+
+    def register(self, klass: type, decode: Callable[[dict], object]):
+        self._registry[klass.__name__] = decode
+        self._decoders.clear()
+
+    def deserialize(self, input: str | bytes):
         return self._deserialize(json.loads(input))
 
     def _deserialize(self, obj):
@@ -95,11 +127,24 @@ class Deserializer:
 
     def _deserialize_any(self, obj):
         type_name = obj["$type"]
+        decoder = self._decoders.get(type_name)
+        if decoder is None:
+            decoder = self._decoders[type_name] = self._compile(type_name)
+        return decoder(obj)
+
+    def _compile(self, type_name: str):
+        if type_name in self._registry:
+            return self._registered_decoder(self._registry[type_name])
         method_name = f"_deserialize_{type_name.lower()}"
         if hasattr(self, method_name):
-            return getattr(self, method_name)(obj)
+            return getattr(self, method_name)
         raise NotImplementedError(f"Deserialization for {type_name} is not implemented")
 
+    def _registered_decoder(self, decode: Callable[[dict], object]):
+        def decoder(obj):
+            return decode({name: self._deserialize(value) for name, value in obj.items() if name != "$type"})
+        return decoder
+
     def _from_dict(self, obj: dict, *attributes):
         return [self._deserialize(obj[name]) for name in attributes]
 
@@ -128,7 +173,7 @@ class Deserializer:
         return Ball(*self._from_dict(obj, "size", "position", "speed", "name"))
 
     def _deserialize_config(self, obj):
-        return Config(*self._from_dict(obj, 'paddle_ratio', 'ball_ratio', 'ball_speed_ratio', 'paddle_speed_ratio', 'paddle_padding'))
+        return Config(*self._from_dict(obj, 'paddle_ratio', 'ball_ratio', 'ball_speed_ratio', 'paddle_speed_ratio', 'paddle_padding', 'swept_collisions'))
 
     def _deserialize_pong(self, obj):
         pong = Pong(*self._from_dict(obj, 'size', 'config'), paddles=[])
@@ -139,13 +184,384 @@ class Deserializer:
         return pong
 
 
+# binary format: a version byte, followed by a tagged value.
+# values of known types have a fixed layout, containers are length-prefixed.
+# names of game objects are not transmitted: default names are restored upon deserialization.
+BINARY_VERSION = 5
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_INT = 3
+_TAG_FLOAT = 4
+_TAG_STR = 5
+_TAG_LIST = 6
+_TAG_DICT = 7
+_TAG_VECTOR2 = 8
+_TAG_DIRECTION = 9
+_TAG_CONTROL_EVENT = 10
+_TAG_EVENT = 11
+_TAG_CONFIG = 12
+_TAG_PONG = 13
+_TAG_PADDLE = 14
+_TAG_BALL = 15
+_TAG_RECTANGLE = 16
+_TAG_REGISTERED = 17 # type name, followed by a dictionary of fields
+
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_LENGTH = struct.Struct('<H')
+_VECTOR2 = struct.Struct('<2d')
+_RECTANGLE = struct.Struct('<4d')
+_GAME_OBJECT = struct.Struct('<6d') # size, position, speed
+_CONFIG = struct.Struct('<6d?')
+_PONG = struct.Struct('<3dqB') # size, time, updates, number of paddles
+
+_DIRECTIONS = Direction.values()
+_DIRECTION_INDEXES = {direction: index for index, direction in enumerate(_DIRECTIONS)}
+_CONTROL_EVENTS = list(ControlEvent.__members__.values())
+_CONTROL_EVENT_INDEXES = {event: index for index, event in enumerate(_CONTROL_EVENTS)}
+# most frequent keys of events' dictionaries are encoded as a single byte
+_KEYS = ('dt', 'status', 'paddle_index', 'direction', 'seq', 'base', 'delta', 'input_seq', 'input_time', 'inputs') + STATE_KEYS
+_KEY_INDEXES = {key: index for index, key in enumerate(_KEYS)}
+_KEY_NOT_INTERNED = 255
+
+
+class BinarySerializer:
+    def __init__(self):
+        self._encoders = {
+            type(None): self._encode_none,
+            bool: self._encode_bool,
+            int: self._encode_int,
+            float: self._encode_float,
+            str: self._encode_str,
+            list: self._encode_list,
+            tuple: self._encode_list,
+            dict: self._encode_dict,
+            Vector2: self._encode_vector2,
+            Rectangle: self._encode_rectangle,
+            Direction: self._encode_direction,
+            ControlEvent: self._encode_controlevent,
+            Event: self._encode_event,
+            Config: self._encode_config,
+            Pong: self._encode_pong,
+            Paddle: self._encode_paddle,
+            Ball: self._encode_ball,
+        }
+        self._compiled: dict[type, Callable[[object, bytearray], None]] = dict()
+
+    def register(self, klass: type, encode: Callable[[object], dict]):
+        self._encoders[klass] = self._registered_encoder(klass.__name__, encode)
+        self._compiled.clear()
+
+    def _registered_encoder(self, type_name: str, encode: Callable[[object], dict]):
+        def encoder(obj, buffer: bytearray):
+            buffer.append(_TAG_REGISTERED)
+            self._encode_raw_str(type_name, buffer)
+            self._encode_dict(encode(obj), buffer)
+        return encoder
+
+    def serialize(self, obj) -> bytes:
+        buffer = bytearray((BINARY_VERSION,))
+        self._encode(obj, buffer)
+        return bytes(buffer)
+
+    def _encode(self, obj, buffer: bytearray):
+        encoder = self._compiled.get(type(obj))
+        if encoder is None:
+            for klass in type(obj).mro():
+                if klass in self._encoders:
+                    encoder = self._compiled[type(obj)] = self._encoders[klass]
+                    break
+            else:
+                raise NotImplementedError(f"Serialization for {type(obj).__name__} is not implemented")
+        encoder(obj, buffer)
+
+    def _encode_none(self, obj, buffer: bytearray):
+        buffer.append(_TAG_NONE)
+
+    def _encode_bool(self, obj: bool, buffer: bytearray):
+        buffer.append(_TAG_TRUE if obj else _TAG_FALSE)
+
+    def _encode_int(self, obj: int, buffer: bytearray):
+        buffer.append(_TAG_INT)
+        buffer += _INT.pack(obj)
+
+    def _encode_float(self, obj: float, buffer: bytearray):
+        buffer.append(_TAG_FLOAT)
+        buffer += _FLOAT.pack(obj)
+
+    def _encode_str(self, obj: str, buffer: bytearray):
+        buffer.append(_TAG_STR)
+        self._encode_raw_str(obj, buffer)
+
+    def _encode_raw_str(self, obj: str, buffer: bytearray):
+        data = obj.encode()
+        buffer += _LENGTH.pack(len(data))
+        buffer += data
+
+    def _encode_list(self, obj: list | tuple, buffer: bytearray):
+        buffer.append(_TAG_LIST)
+        buffer += _LENGTH.pack(len(obj))
+        for item in obj:
+            self._encode(item, buffer)
+
+    def _encode_dict(self, obj: dict, buffer: bytearray):
+        buffer.append(_TAG_DICT)
+        buffer += _LENGTH.pack(len(obj))
+        for key, value in obj.items():
+            if key in _KEY_INDEXES:
+                buffer.append(_KEY_INDEXES[key])
+            else:
+                buffer.append(_KEY_NOT_INTERNED)
+                self._encode_raw_str(key, buffer)
+            self._encode(value, buffer)
+
+    def _encode_vector2(self, obj: Vector2, buffer: bytearray):
+        buffer.append(_TAG_VECTOR2)
+        buffer += _VECTOR2.pack(obj.x, obj.y)
+
+    def _encode_rectangle(self, obj: Rectangle, buffer: bytearray):
+        buffer.append(_TAG_RECTANGLE)
+        buffer += _RECTANGLE.pack(obj.left, obj.top, obj.right, obj.bottom)
+
+    def _encode_direction(self, obj: Direction, buffer: bytearray):
+        buffer.append(_TAG_DIRECTION)
+        buffer.append(_DIRECTION_INDEXES[obj])
+
+    def _encode_controlevent(self, obj: ControlEvent, buffer: bytearray):
+        buffer.append(_TAG_CONTROL_EVENT)
+        buffer.append(_CONTROL_EVENT_INDEXES[obj])
+
+    def _encode_event(self, obj: Event, buffer: bytearray):
+        buffer.append(_TAG_EVENT)
+        if ControlEvent.is_control_event(obj):
+            self._encode_controlevent(ControlEvent.by_value(obj.type), buffer)
+        else:
+            self._encode_int(obj.type, buffer)
+        self._encode_dict(obj.dict, buffer)
+
+    def _encode_config(self, obj: Config, buffer: bytearray):
+        buffer.append(_TAG_CONFIG)
+        buffer += _CONFIG.pack(*obj.paddle_ratio, obj.ball_ratio, obj.ball_speed_ratio, obj.paddle_speed_ratio,
+                               obj.paddle_padding, obj.swept_collisions)
+
+    def _encode_game_object(self, obj: GameObject, buffer: bytearray):
+        buffer += _GAME_OBJECT.pack(*obj.size, *obj.position, *obj.speed)
+
+    def _encode_ball(self, obj: Ball, buffer: bytearray):
+        buffer.append(_TAG_BALL)
+        self._encode_game_object(obj, buffer)
+
+    def _encode_paddle(self, obj: Paddle, buffer: bytearray):
+        buffer.append(_TAG_PADDLE)
+        buffer.append(_DIRECTION_INDEXES[obj.side])
+        self._encode_game_object(obj, buffer)
+
+    def _encode_pong(self, obj: Pong, buffer: bytearray):
+        buffer.append(_TAG_PONG)
+        paddles = obj.paddles
+        buffer += _PONG.pack(*obj.size, obj.time, obj.updates, len(paddles))
+        self._encode_config(obj.config, buffer)
+        self._encode_ball(obj.ball, buffer)
+        for paddle in paddles:
+            self._encode_paddle(paddle, buffer)
+
+
+class BinaryDeserializer:
+    def __init__(self):
+        self._decoders = {
+            _TAG_NONE: self._decode_none,
+            _TAG_FALSE: self._decode_false,
+            _TAG_TRUE: self._decode_true,
+            _TAG_INT: self._decode_int,
+            _TAG_FLOAT: self._decode_float,
+            _TAG_STR: self._decode_str,
+            _TAG_LIST: self._decode_list,
+            _TAG_DICT: self._decode_dict,
+            _TAG_VECTOR2: self._decode_vector2,
+            _TAG_RECTANGLE: self._decode_rectangle,
+            _TAG_DIRECTION: self._decode_direction,
+            _TAG_CONTROL_EVENT: self._decode_controlevent,
+            _TAG_EVENT: self._decode_event,
+            _TAG_CONFIG: self._decode_config,
+            _TAG_PONG: self._decode_pong,
+            _TAG_PADDLE: self._decode_paddle,
+            _TAG_BALL: self._decode_ball,
+            _TAG_REGISTERED: self._decode_registered,
+        }
+        self._registry: dict[str, Callable[[dict], object]] = dict()
+
+    def register(self, klass: type, decode: Callable[[dict], object]):
+        self._registry[klass.__name__] = decode
+
+    def deserialize(self, input: bytes):
+        if not input or input[0] != BINARY_VERSION:
+            raise ValueError(f"Unsupported binary format version: {input[0] if input else None}")
+        obj, _ = self._decode(input, 1)
+        return obj
+
+    def _decode(self, data: bytes, offset: int):
+        tag = data[offset]
+        if tag not in self._decoders:
+            raise NotImplementedError(f"Deserialization for tag {tag} is not implemented")
+        return self._decoders[tag](data, offset + 1)
+
+    def _expect(self, tag: int, data: bytes, offset: int):
+        if data[offset] != tag:
+            raise ValueError(f"Expected tag {tag} at offset {offset}, found {data[offset]}")
+        return self._decoders[tag](data, offset + 1)
+
+    def _decode_registered(self, data: bytes, offset: int):
+        type_name, offset = self._decode_str(data, offset)
+        if type_name not in self._registry:
+            raise NotImplementedError(f"Deserialization for {type_name} is not implemented")
+        fields, offset = self._expect(_TAG_DICT, data, offset)
+        return self._registry[type_name](fields), offset
+
+    def _decode_none(self, data: bytes, offset: int):
+        return None, offset
+
+    def _decode_false(self, data: bytes, offset: int):
+        return False, offset
+
+    def _decode_true(self, data: bytes, offset: int):
+        return True, offset
+
+    def _decode_int(self, data: bytes, offset: int):
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+
+    def _decode_float(self, data: bytes, offset: int):
+        return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+
+    def _decode_str(self, data: bytes, offset: int):
+        length, = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        return bytes(data[offset:offset + length]).decode(), offset + length
+
+    def _decode_list(self, data: bytes, offset: int):
+        length, = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        result = []
+        for _ in range(length):
+            item, offset = self._decode(data, offset)
+            result.append(item)
+        return result, offset
+
+    def _decode_dict(self, data: bytes, offset: int):
+        length, = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        result = dict()
+        for _ in range(length):
+            key_index = data[offset]
+            if key_index == _KEY_NOT_INTERNED:
+                key, offset = self._decode_str(data, offset + 1)
+            else:
+                key, offset = _KEYS[key_index], offset + 1
+            result[key], offset = self._decode(data, offset)
+        return result, offset
+
+    def _decode_vector2(self, data: bytes, offset: int):
+        return Vector2(_VECTOR2.unpack_from(data, offset)), offset + _VECTOR2.size
+
+    def _decode_rectangle(self, data: bytes, offset: int):
+        left, top, right, bottom = _RECTANGLE.unpack_from(data, offset)
+        return Rectangle(Vector2(left, top), Vector2(right, bottom)), offset + _RECTANGLE.size
+
+    def _decode_direction(self, data: bytes, offset: int):
+        return _DIRECTIONS[data[offset]], offset + 1
+
+    def _decode_controlevent(self, data: bytes, offset: int):
+        return _CONTROL_EVENTS[data[offset]], offset + 1
+
+    def _decode_event(self, data: bytes, offset: int):
+        event_type, offset = self._decode(data, offset)
+        if isinstance(event_type, ControlEvent):
+            event_type = event_type.value
+        event_dict, offset = self._expect(_TAG_DICT, data, offset)
+        return Event(event_type, event_dict), offset
+
+    def _decode_config(self, data: bytes, offset: int):
+        x, y, ball_ratio, ball_speed_ratio, paddle_speed_ratio, paddle_padding, swept_collisions = \
+            _CONFIG.unpack_from(data, offset)
+        config = Config(paddle_ratio=Vector2(x, y), ball_ratio=ball_ratio, ball_speed_ratio=ball_speed_ratio,
+                        paddle_speed_ratio=paddle_speed_ratio, paddle_padding=paddle_padding,
+                        swept_collisions=swept_collisions)
+        return config, offset + _CONFIG.size
+
+    def _decode_game_object(self, data: bytes, offset: int):
+        values = _GAME_OBJECT.unpack_from(data, offset)
+        return (values[0:2], values[2:4], values[4:6]), offset + _GAME_OBJECT.size
+
+    def _decode_ball(self, data: bytes, offset: int):
+        (size, position, speed), offset = self._decode_game_object(data, offset)
+        return Ball(size, position, speed), offset
+
+    def _decode_paddle(self, data: bytes, offset: int):
+        side = _DIRECTIONS[data[offset]]
+        (size, position, speed), offset = self._decode_game_object(data, offset + 1)
+        return Paddle(size, side, position, speed), offset
+
+    def _decode_pong(self, data: bytes, offset: int):
+        width, height, time, updates, paddles = _PONG.unpack_from(data, offset)
+        offset += _PONG.size
+        config, offset = self._expect(_TAG_CONFIG, data, offset)
+        pong = Pong((width, height), config, paddles=[])
+        pong.ball, offset = self._expect(_TAG_BALL, data, offset)
+        pong_paddles = []
+        for _ in range(paddles):
+            paddle, offset = self._expect(_TAG_PADDLE, data, offset)
+            pong_paddles.append(paddle)
+        pong.paddles = pong_paddles
+        pong.time = time
+        pong.updates = updates
+        return pong, offset
+
+
 DEFAULT_SERIALIZER = Serializer()
 DEFAULT_DESERIALIZER = Deserializer()
+BINARY_SERIALIZER = BinarySerializer()
+BINARY_DESERIALIZER = BinaryDeserializer()
+
+class Encoder(Protocol):
+    def register(self, klass: type, encode: Callable[[object], dict]):
+        ...
+
+    def serialize(self, obj) -> str | bytes:
+        ...
+
+
+class Decoder(Protocol):
+    def register(self, klass: type, decode: Callable[[dict], object]):
+        ...
+
+    def deserialize(self, input: bytes):
+        ...
+
+
+CODECS: dict[str, tuple[Encoder, Decoder]] = {
+    'json': (DEFAULT_SERIALIZER, DEFAULT_DESERIALIZER),
+    'binary': (BINARY_SERIALIZER, BINARY_DESERIALIZER),
+}
+
+
+def register(klass: type, encode: Callable[[object], dict], decode: Callable[[dict], object]):
+    # encode turns an object into a dictionary of fields (which are in turn serialized), decode does the opposite
+    for serializer, deserializer in CODECS.values():
+        serializer.register(klass, encode)
+        deserializer.register(klass, decode)
 
 
 def serialize(obj, serializer=DEFAULT_SERIALIZER):
     return serializer.serialize(obj)
 
 
-def deserialize(input: str, deserializer=DEFAULT_DESERIALIZER):
+def deserialize(input: str | bytes, deserializer=DEFAULT_DESERIALIZER):
     return deserializer.deserialize(input)
+
+
+def deserialize_event(input: str | bytes, deserializer=DEFAULT_DESERIALIZER) -> Event:
+    event = deserialize(input, deserializer)
+    if not isinstance(event, Event):
+        raise ValueError(f"Expected {Event}, got {type(event)}")
+    return event
@@ -1,7 +1,9 @@
 from dpongpy.log import logger
 from dpongpy.remote import *
+from typing import Protocol
 import os
 import random
+import select
 
 
 THRESHOLD_DGRAM_SIZE = 65536
@@ -21,7 +23,13 @@ def udp_socket(bind_to: Address | int = Address.any_local_port()) -> socket.sock
     return sock
 
 
-def udp_send(sock: socket.socket, address:Address, payload: bytes | str) -> int:
+class DatagramSender(Protocol):
+    # either a socket, or an asyncio transport (which returns None, as it buffers the payload)
+    def sendto(self, data: bytes, address: tuple, /) -> int | None:
+        ...
+
+
+def udp_send(sock: DatagramSender, address:Address, payload: bytes | str) -> int:
     if isinstance(payload, str):
         payload = payload.encode()
     if len(payload) > THRESHOLD_DGRAM_SIZE:
@@ -31,11 +39,17 @@ def udp_send(sock: socket.socket, address:Address, payload: bytes | str) -> int:
         logger.warning(f"Pretend to send {result} bytes to {address}: {payload!r}")
     else:
         result = sock.sendto(payload, address.as_tuple())
+        if result is None: # asyncio transports buffer the payload, rather than returning the amount of sent bytes
+            result = len(payload)
         logger.debug(f"Sent {result} bytes to {address}: {payload!r}")
     return result
 
 
-def udp_receive(sock: socket.socket, decode=True) -> tuple[str | bytes | None, Address | None]:
+def udp_receive(sock: socket.socket, decode=True, timeout: float | None = None) -> tuple[str | bytes | None, Address | None]:
+    if timeout is not None:
+        readable, _, _ = select.select([sock], [], [], timeout)
+        if not readable:
+            return None, None
     payload, address = sock.recvfrom(THRESHOLD_DGRAM_SIZE)
     address = Address(*address)
     logger.debug(f"Received {len(payload)} bytes from {address}: {payload!r}")
@@ -67,14 +81,14 @@ class UdpSession(Session):
     def send(self, payload: bytes | str):
         return udp_send(self._socket, self.remote_address, payload)
 
-    def receive(self, decode=True):
+    def receive(self, decode=True, timeout: float | None = None):
         if self._first_message is not None:
             payload = self._first_message
             if decode and isinstance(payload, bytes):
                 payload = payload.decode()
             self._first_message = None
             return payload
-        payload, address = udp_receive(self._socket, decode)
+        payload, address = udp_receive(self._socket, decode, timeout)
         if address is not None:
             if self._received_messages == 0:
                 self._remote_address = address
@@ -110,8 +124,8 @@ class UdpServer(Server):
             first_message=payload
         )
 
-    def receive(self, decode=True) -> tuple[str | bytes | None, Address | None]:
-        return udp_receive(self._socket, decode)
+    def receive(self, decode=True, timeout: float | None = None) -> tuple[str | bytes | None, Address | None]:
+        return udp_receive(self._socket, decode, timeout)
 
     def send(self, address: Address, payload: bytes | str):
         return udp_send(self._socket, address, payload)
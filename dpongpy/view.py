@@ -2,7 +2,9 @@ import pygame
 
 from .model import *
 from pygame import draw, Surface, Rect
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Iterable, Optional
+import threading
 
 
 def rect(rectangle: Rectangle) -> pygame.Rect:
@@ -12,68 +14,207 @@ def rect(rectangle: Rectangle) -> pygame.Rect:
 class PongView:
     def __init__(self, pong: Pong):
         self._pong = pong
+        self._previous_positions: dict[str, Vector2] = dict()
+        self._interpolation = 1.0
 
-    def render(self):
-        raise NotImplemented
+    def before_update(self):
+        self._previous_positions = {obj.name: obj.position for obj in [self._pong.ball, *self._pong.paddles]}
+
+    def position_of(self, obj: GameObject) -> Vector2:
+        previous = self._previous_positions.get(obj.name)
+        if previous is None or self._interpolation >= 1:
+            return obj.position
+        return previous.lerp(obj.position, self._interpolation)
+
+    def bounding_box_of(self, obj: GameObject) -> Rectangle:
+        position = self.position_of(obj)
+        if position is obj.position:
+            return obj.bounding_box
+        half_size = obj.size / 2
+        return Rectangle(position - half_size, position + half_size)
+
+    def render(self, interpolation: float = 1.0):
+        raise NotImplementedError
+
+    def update_display(self):
+        pygame.display.flip()
 
 
 class ShowNothingPongView(PongView):
-    def render(self):
+    def render(self, interpolation: float = 1.0):
+        pass
+
+    def update_display(self):
         pass
 
 
-class ScreenPongView(PongView):
-    debug_color = "green"
+@dataclass(frozen=True)
+class Frame:
+    # what is needed to render a game, copied out of it: later updates to the game do not affect the frame
+    size: Vector2
+    ball: Ball
+    paddles: tuple[Paddle, ...]
+    previous_positions: dict[str, Vector2]
+    interpolation: float = 1.0
+
+    @classmethod
+    def of(cls, pong: Pong, previous_positions: dict[str, Vector2] = None, interpolation: float = 1.0) -> 'Frame':
+        ball = Ball(pong.ball.size, pong.ball.position, pong.ball.speed, pong.ball.name)
+        paddles = tuple(Paddle(p.size, p.side, p.position, p.speed, p.name) for p in pong.paddles)
+        previous = {name: Vector2(position) for name, position in (previous_positions or {}).items()}
+        return cls(Vector2(pong.size), ball, paddles, previous, interpolation)
+
+    def apply_to(self, pong: Pong):
+        # the frame's objects are shared, not copied, so pong must be only read until the next frame is applied
+        pong.size = self.size
+        pong.ball = self.ball
+        pong.paddles = self.paddles
+
 
-    def __init__(self, pong: Pong, screen: Surface = None, debug: bool = False):
+class FramePublisher(PongView):
+    # renders games into frames, for another thread to show them: only the latest frame is kept
+
+    def __init__(self, pong: Pong):
         super().__init__(pong)
-        self._screen = screen or pygame.display.set_mode(pong.size)
-        self._debug = debug
-
-    def __getattr__(self, name):
-        if not name.startswith("draw_"):
-            raise AttributeError(f"{type(self).__name__} has no attribute '{name}'")
-        name = name[5:]
-        debug = False
-        if name.startswith("debug_"):
-            name = name[6:]
-            debug = True
-        function = getattr(draw, name)
-        if debug:
-            def debug_draw(*args, **kwargs):
-                if self._debug:
-                    function(self._screen, self.debug_color, *args, **kwargs)
-            return debug_draw
-        return lambda *args, **kwargs: function(self._screen, *args, **kwargs)
-
-    def render(self):
-        self._screen.fill("black")
-        self.render_arena(self._pong)
-        self.render_ball(self._pong.ball)
-        self.render_paddles(self._pong.paddles)
+        self._lock = threading.Lock()
+        self._latest: Optional[Frame] = None
+        self.published = 0
+        self.skipped = 0 # frames replaced by newer ones, before being shown
+
+    def render(self, interpolation: float = 1.0):
+        frame = Frame.of(self._pong, self._previous_positions, interpolation)
+        with self._lock:
+            if self._latest is not None:
+                self.skipped += 1
+            self._latest = frame
+            self.published += 1
+
+    def update_display(self):
+        pass
+
+    def take(self) -> Optional[Frame]:
+        with self._lock:
+            frame, self._latest = self._latest, None
+        return frame
+
+
+class SpriteCache:
+    # objects are rasterized once per size, into surfaces matching the display format, then just blitted
+
+    def __init__(self, color: str = "white"):
+        self.color = color
+        self._sprites: dict[str, Surface] = dict() # kind of object -> its latest sprite
+        self.rasterized = 0
+
+    def ball(self, size: tuple[int, int]) -> Surface:
+        return self._sprite('ball', size)
+
+    def paddle(self, size: tuple[int, int]) -> Surface:
+        return self._sprite('paddle', size)
+
+    def _sprite(self, kind: str, size: tuple[int, int]) -> Surface:
+        sprite = self._sprites.get(kind)
+        if sprite is None or sprite.get_size() != size:
+            sprite = self._sprites[kind] = self._rasterize(kind, size)
+        return sprite
+
+    def _rasterize(self, kind: str, size: tuple[int, int]) -> Surface:
+        self.rasterized += 1
+        if kind == 'ball':
+            sprite = Surface(size, pygame.SRCALPHA)
+            draw.ellipse(sprite, self.color, sprite.get_rect(), width=0)
+        else:
+            sprite = Surface(size)
+            sprite.fill(self.color)
+        if pygame.display.get_surface() is None: # converting requires a display
+            return sprite
+        return sprite.convert_alpha() if kind == 'ball' else sprite.convert()
+
+
+class DebugLayer:
+    color = "green"
+    speed_color = "blue"
+
+    def __init__(self, view: PongView, screen: Surface):
+        self._view = view
+        self._screen = screen
+
+    def render(self, pong: Pong):
+        self.render_arena(pong)
+        for obj in [pong.ball, *pong.paddles]:
+            self.render_bounds(obj)
+            self.render_speed(obj)
 
     def render_arena(self, pong: Pong):
-        self.draw_debug_line((0, pong.height / 2), (pong.width, pong.height / 2), width=1)
-        self.draw_debug_line((pong.width / 2, 0), (pong.width / 2, pong.height), width=1)
-        self.draw_debug_rect(Rect((0, 0), pong.size), width=1)
+        draw.line(self._screen, self.color, (0, pong.height / 2), (pong.width, pong.height / 2), width=1)
+        draw.line(self._screen, self.color, (pong.width / 2, 0), (pong.width / 2, pong.height), width=1)
+        draw.rect(self._screen, self.color, Rect((0, 0), pong.size), width=1)
 
     def render_bounds(self, obj: GameObject):
-        self.draw_debug_rect(rect(obj.bounding_box), width=1)
+        draw.rect(self._screen, self.color, rect(self._view.bounding_box_of(obj)), width=1)
 
     def render_speed(self, obj: GameObject):
-        if self._debug:
-            self.draw_line("blue", obj.position, obj.position + obj.speed, width=2)
+        position = self._view.position_of(obj)
+        draw.line(self._screen, self.speed_color, position, position + obj.speed, width=2)
+
+    def region_of(self, obj: GameObject) -> Rect:
+        start, end = self._view.position_of(obj), self._view.position_of(obj) + obj.speed
+        return Rect(min(start.x, end.x), min(start.y, end.y), abs(end.x - start.x), abs(end.y - start.y)).inflate(4, 4)
+
+
+class ScreenPongView(PongView):
+    def __init__(self, pong: Pong, screen: Surface = None, debug: bool = False, dirty_rects: bool = False):
+        super().__init__(pong)
+        self._screen = screen or pygame.display.set_mode(pong.size)
+        self._sprites = SpriteCache()
+        self.debug_layer = DebugLayer(self, self._screen) if debug else None
+        self._dirty_rects = dirty_rects
+        self._drawn: Optional[list[Rect]] = None # regions of the moving objects, as drawn at the last frame
+        self.dirty: Optional[list[Rect]] = None # regions changed by the last frame, None meaning the whole screen
+
+    def invalidate(self):
+        self._drawn = None
+
+    def show(self, frame: Frame):
+        frame.apply_to(self._pong)
+        self._previous_positions = frame.previous_positions
+        self.render(frame.interpolation)
+
+    def render(self, interpolation: float = 1.0):
+        self._interpolation = interpolation
+        previous = self._drawn if self._dirty_rects else None
+        if previous is None:
+            self._screen.fill("black")
+        else:
+            for region in previous: # only erase where objects were, the rest of the screen is unchanged
+                self._screen.fill("black", region)
+        self._drawn = [self.region_of(obj) for obj in [self._pong.ball, *self._pong.paddles]]
+        self.dirty = None if previous is None else previous + self._drawn
+        self.render_ball(self._pong.ball)
+        self.render_paddles(self._pong.paddles)
+        if self.debug_layer is not None:
+            self.debug_layer.render(self._pong)
+
+    def update_display(self):
+        if self.dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty)
+
+    def region_of(self, obj: GameObject) -> Rect:
+        region = rect(self.bounding_box_of(obj)).inflate(2, 2) # rounding may shift drawings by a pixel
+        if self.debug_layer is not None:
+            region.union_ip(self.debug_layer.region_of(obj))
+        return region.clip(self._screen.get_rect())
 
     def render_ball(self, ball: Ball):
-        self.draw_ellipse("white", rect(ball.bounding_box), width=0)
-        self.render_bounds(ball)
-        self.render_speed(ball)
+        area = rect(self.bounding_box_of(ball))
+        self._screen.blit(self._sprites.ball(area.size), area)
 
     def render_paddles(self, paddles: Iterable[Paddle]):
         for paddle in paddles:
             self.render_paddle(paddle)
 
     def render_paddle(self, paddle: Paddle):
-        self.draw_rect("white", rect(paddle.bounding_box), width=0)
-        self.render_bounds(paddle)
-        self.render_speed(paddle)
+        area = rect(self.bounding_box_of(paddle))
+        self._screen.blit(self._sprites.paddle(area.size), area)
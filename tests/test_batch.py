@@ -0,0 +1,98 @@
+import unittest
+from dpongpy.model import *
+from dpongpy.batch import BatchPong, PADDLE_SIDES
+from random import Random
+
+
+class TestBatchPong(unittest.TestCase):
+    sides = [
+        (Direction.LEFT, Direction.RIGHT),
+        (Direction.LEFT,),
+        (Direction.RIGHT,),
+        (Direction.UP, Direction.DOWN),
+    ]
+
+    def setUp(self) -> None:
+        self.pongs = [Pong(size=(800, 600), paddles=self.sides[i % len(self.sides)], random=Random(i)) for i in range(16)]
+        self.batch = BatchPong.from_pongs(self.pongs)
+
+    def assertPongAlmostEqual(self, actual: Pong, expected: Pong):
+        self.assertEqual(actual.size, expected.size)
+        self.assertEqual(actual.updates, expected.updates)
+        self.assertAlmostEqual(actual.time, expected.time)
+        for attribute in ['size', 'position', 'speed']:
+            for i in range(2):
+                self.assertAlmostEqual(getattr(actual.ball, attribute)[i], getattr(expected.ball, attribute)[i])
+        self.assertEqual([p.side for p in actual.paddles], [p.side for p in expected.paddles])
+        for actual_paddle, expected_paddle in zip(actual.paddles, expected.paddles):
+            for attribute in ['size', 'position', 'speed']:
+                for i in range(2):
+                    self.assertAlmostEqual(getattr(actual_paddle, attribute)[i], getattr(expected_paddle, attribute)[i])
+
+    def test_paddle_sides_follow_pong_order(self):
+        pong = Pong(size=(800, 600), paddles=Direction.values()[1:])
+        self.assertEqual(list(PADDLE_SIDES), [paddle.side for paddle in pong.paddles])
+
+    def test_swept_collisions_are_refused(self):
+        pong = Pong(size=(800, 600), config=Config(swept_collisions=True))
+        with self.assertRaises(ValueError):
+            self.batch.load(0, pong)
+        with self.assertRaises(ValueError):
+            BatchPong.from_pongs([pong])
+
+    def test_conversion_round_trip(self):
+        for i, pong in enumerate(self.pongs):
+            with self.subTest(match=i):
+                self.assertEqual(self.batch.to_pong(i), pong)
+
+    def test_load(self):
+        pong = Pong(size=(400, 300), paddles=[Direction.UP], random=Random(42))
+        pong.update(0.5)
+        self.batch.load(3, pong)
+        self.assertEqual(self.batch.to_pong(3), pong)
+        self.assertEqual(self.batch.to_pong(2), self.pongs[2])
+
+    def test_create(self):
+        batch = BatchPong(4, size=(800, 600), paddles=[Direction.LEFT])
+        self.assertEqual(len(batch), 4)
+        for pong in batch.to_pongs():
+            self.assertEqual([p.side for p in pong.paddles], [Direction.LEFT])
+
+    def test_move_paddle(self):
+        for i, pong in enumerate(self.pongs):
+            for paddle in pong.paddles:
+                for direction in Direction.values():
+                    with self.subTest(match=i, paddle=paddle.side, direction=direction):
+                        pong.move_paddle(paddle.side, direction)
+                        self.batch.move_paddle(i, paddle.side, direction)
+                        self.assertEqual(self.batch.to_pong(i), pong)
+
+    def test_move_missing_paddle(self):
+        with self.assertRaises(KeyError):
+            self.batch.move_paddle(1, Direction.RIGHT, Direction.UP)
+
+    def test_update_matches_pong(self):
+        random = Random(0)
+        for step in range(300):
+            if step % 50 == 0:
+                for i, pong in enumerate(self.pongs):
+                    for paddle in pong.paddles:
+                        direction = random.choice(Direction.values())
+                        pong.move_paddle(paddle.side, direction)
+                        self.batch.move_paddle(i, paddle.side, direction)
+            for pong in self.pongs:
+                pong.update(0.05)
+            self.batch.update(0.05)
+        for i, pong in enumerate(self.pongs):
+            with self.subTest(match=i):
+                self.assertPongAlmostEqual(self.batch.to_pong(i), pong)
+
+    def test_update_with_per_match_delta_time(self):
+        delta_times = [0.01 * (i + 1) for i in range(len(self.pongs))]
+        for _ in range(100):
+            for pong, dt in zip(self.pongs, delta_times):
+                pong.update(dt)
+            self.batch.update(delta_times)
+        for i, pong in enumerate(self.pongs):
+            with self.subTest(match=i):
+                self.assertPongAlmostEqual(self.batch.to_pong(i), pong)
@@ -0,0 +1,205 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import unittest
+import asyncio
+import pygame
+import time
+from pygame.event import Event
+from dpongpy import Settings
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent
+from dpongpy.remote.udp import UdpServer, UdpClient, Address
+from dpongpy.remote.aioudp import AsyncUdpClient
+from dpongpy.remote.presentation import serialize, deserialize
+from dpongpy.remote.delta import flatten
+from dpongpy.remote.centralised import PongTerminal, PongCoordinator, AsyncPongCoordinator
+
+
+class BaseTerminalTest(unittest.TestCase):
+    TEST_PORT = 54323
+
+    def setUp(self):
+        pygame.init()
+        self.server = UdpServer(self.TEST_PORT)
+        settings = Settings(port=self.TEST_PORT, gui=False, initial_paddles=[Direction.LEFT])
+        self.terminal = PongTerminal(settings)
+        self.terminal_address = Address('localhost', self.terminal.client.local_address.port)
+        self.state = flatten(Pong(size=(800, 600)))
+        pygame.event.clear()
+
+    def tearDown(self):
+        self.terminal.client.close()
+        self.server.close()
+        pygame.quit()
+
+    def send(self, *events: Event):
+        for event in events:
+            self.server.send(self.terminal_address, serialize(event))
+
+    def snapshot(self, seq: int) -> Event:
+        return Event(ControlEvent.TIME_ELAPSED.value, dt=0.1, seq=seq, base=None, delta=self.state)
+
+    def intake(self) -> list[Event]:
+        time.sleep(0.05) # let datagrams reach the terminal
+        self.terminal._handle_ingoing_messages()
+        return pygame.event.get(list(ControlEvent.all_types()))
+
+
+class TestTerminalIntake(BaseTerminalTest):
+    def test_intake_does_not_block(self):
+        start = time.time()
+        self.terminal._handle_ingoing_messages()
+        self.assertLess(time.time() - start, 0.05)
+        self.assertEqual(pygame.event.get(list(ControlEvent.all_types())), [])
+
+    def test_latest_snapshot_wins(self):
+        leave = Event(ControlEvent.PLAYER_LEAVE.value, paddle_index=Direction.RIGHT)
+        self.send(self.snapshot(0), self.snapshot(1), leave, self.snapshot(2))
+        events = self.intake()
+        self.assertEqual(events, [leave, self.snapshot(2)])
+        self.assertEqual(self.terminal.stats.received, 3)
+        self.assertEqual(self.terminal.stats.skipped, 2)
+
+    def test_dropped_snapshots(self):
+        self.send(self.snapshot(10))
+        self.intake()
+        self.send(self.snapshot(13))
+        self.intake()
+        self.assertEqual(self.terminal.stats.dropped, 2)
+        self.assertEqual(self.terminal.stats.skipped, 0)
+
+
+class TestOutOfOrderSnapshots(BaseTerminalTest):
+    def apply(self, events: list[Event]):
+        for event in events:
+            if ControlEvent.TIME_ELAPSED.matches(event):
+                self.terminal.controller.on_time_elapsed(self.terminal.pong, **event.dict)
+
+    def test_newest_snapshot_wins_regardless_of_arrival_order(self):
+        self.send(self.snapshot(2), self.snapshot(1))
+        self.assertEqual(self.intake(), [self.snapshot(2)])
+        self.assertEqual(self.terminal.stats.reordered, 1)
+        self.assertEqual(self.terminal.stats.dropped, 0)
+
+    def test_stale_snapshots_are_discarded(self):
+        self.send(self.snapshot(0), self.snapshot(5))
+        self.apply(self.intake())
+        self.assertEqual(self.terminal._applied_seq, 5)
+        self.send(self.snapshot(3))
+        self.assertEqual(self.intake(), [])
+        self.assertEqual(self.terminal.stats.stale, 1)
+        self.assertEqual(self.terminal.stats.reordered, 1)
+        self.assertEqual(self.terminal.stats.dropped, 3)
+
+    def test_restarted_coordinators_are_followed(self):
+        self.send(self.snapshot(1000))
+        self.apply(self.intake())
+        self.send(self.snapshot(0))
+        events = self.intake()
+        self.assertEqual(events, [self.snapshot(0)])
+        self.apply(events)
+        self.assertEqual(self.terminal._applied_seq, 0)
+        self.assertEqual(self.terminal.stats.stale, 0)
+        self.assertEqual(self.terminal.stats.reordered, 0)
+
+    def test_duplicates_are_discarded(self):
+        self.send(self.snapshot(0), self.snapshot(0))
+        self.assertEqual(self.intake(), [self.snapshot(0)])
+        self.assertEqual(self.terminal.stats.duplicated, 1)
+        self.assertEqual(self.terminal.stats.received, 1)
+
+
+class TestCoordinatorReceiver(unittest.TestCase):
+    TEST_PORT = 54326
+    coordinator: PongCoordinator
+    client: UdpClient
+
+    # coordinators keep their ports bound while receiving, hence they are shared by all tests
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.coordinator = PongCoordinator(Settings(port=cls.TEST_PORT))
+        cls.client = UdpClient(Address('localhost', cls.TEST_PORT))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.coordinator.running = False
+        cls.client.close()
+        cls.coordinator.server.close()
+        pygame.quit()
+
+    def setUp(self):
+        self.coordinator.ingress.get(tuple(ControlEvent.all_types()))
+        self.coordinator._processed_inputs.clear()
+
+    def test_malformed_messages_are_skipped(self):
+        join = Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT)
+        self.client.send(b'not a message')
+        self.client.send(serialize([1, 2, 3]))
+        self.client.send(serialize(join))
+        time.sleep(0.05) # let datagrams reach the receiver thread
+        self.assertTrue(self.coordinator._thread_receiver.is_alive())
+        self.assertEqual(self.coordinator.ingress.get((ControlEvent.PLAYER_JOIN.value,)), [join])
+
+
+    def test_inputs_are_unpacked_into_moves(self):
+        inputs = Event(ControlEvent.PADDLE_INPUTS.value, paddle_index=Direction.LEFT,
+                       inputs=[[1, Direction.UP, None], [2, Direction.DOWN, 0.5]])
+        self.coordinator._processed_inputs[Direction.LEFT] = 1
+        self.coordinator._handle_ingoing_event(inputs, Address('localhost', 10001))
+        moves = self.coordinator.ingress.get((ControlEvent.PADDLE_MOVE.value,))
+        self.assertEqual([(move.input_seq, move.direction, move.input_time) for move in moves], [(2, Direction.DOWN, 0.5)])
+
+    def test_malformed_inputs_are_refused(self):
+        for inputs in (None, [[1, Direction.UP]], [[1, 'up', None]], [['1', Direction.UP, None]], [[1, Direction.UP, 'now']]):
+            with self.subTest(inputs=inputs):
+                event = Event(ControlEvent.PADDLE_INPUTS.value, paddle_index=Direction.LEFT, inputs=inputs)
+                with self.assertRaises(ValueError):
+                    self.coordinator._handle_ingoing_event(event, Address('localhost', 10001))
+        self.assertEqual(len(self.coordinator.ingress), 0)
+
+    def test_all_stamped_inputs_of_a_packet_reach_the_game(self):
+        inputs = Event(ControlEvent.PADDLE_INPUTS.value, paddle_index=Direction.LEFT,
+                       inputs=[[1, Direction.UP, 0.1], [2, Direction.NONE, 0.15]])
+        self.coordinator._handle_ingoing_event(inputs, Address('localhost', 10001))
+        moves = self.coordinator.ingress.get((ControlEvent.PADDLE_MOVE.value,))
+        self.assertEqual([(move.input_seq, move.direction, move.input_time) for move in moves],
+                         [(1, Direction.UP, 0.1), (2, Direction.NONE, 0.15)])
+
+
+class TestAsyncCoordinator(unittest.IsolatedAsyncioTestCase):
+    TEST_PORT = 54325
+
+    async def asyncSetUp(self):
+        self.coordinator = AsyncPongCoordinator(Settings(port=self.TEST_PORT, use_asyncio=True))
+        self.run = asyncio.create_task(self.coordinator.run_async())
+        self.client = AsyncUdpClient(Address('localhost', self.TEST_PORT))
+
+    async def asyncTearDown(self):
+        self.coordinator.stop()
+        await asyncio.wait_for(self.run, timeout=1)
+        self.client.close()
+
+    async def receive_snapshot(self) -> Event:
+        while True:
+            event = deserialize(await self.client.receive(decode=False, timeout=1))
+            if ControlEvent.TIME_ELAPSED.matches(event):
+                return event
+
+    async def test_join_is_answered_with_a_keyframe(self):
+        self.client.send(serialize(Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT)))
+        snapshot = await self.receive_snapshot()
+        self.assertIsNone(snapshot.base)
+        self.assertIn('left.position', snapshot.delta)
+
+    async def test_malformed_messages_are_skipped(self):
+        self.client.send(b'not a message')
+        self.client.send(serialize(Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT)))
+        snapshot = await self.receive_snapshot()
+        self.assertIsNone(snapshot.base)
+
+    async def test_stop_ends_the_game_loop(self):
+        self.coordinator.stop()
+        await asyncio.wait_for(self.run, timeout=1)
+        self.assertTrue(self.run.done())
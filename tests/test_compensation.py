@@ -0,0 +1,87 @@
+import unittest
+from dpongpy.model import *
+from dpongpy.remote.compensation import LagCompensator
+
+
+class TestLagCompensator(unittest.TestCase):
+    side = Direction.LEFT
+    dt = 0.01
+
+    def setUp(self):
+        self.pong = self.create_pong()
+        self.compensator = LagCompensator(max_rewind=0.2)
+
+    def create_pong(self) -> Pong:
+        pong = Pong(size=(800, 600), paddles=[self.side])
+        pong.reset_ball(Vector2(0))
+        return pong
+
+    def run_for(self, steps: int, pong: Pong = None, compensator: LagCompensator = None):
+        for _ in range(steps):
+            (pong or self.pong).update(self.dt)
+            (compensator or self.compensator).record(pong or self.pong)
+
+    def reference(self, inputs: dict[int, Direction], steps: int) -> Pong:
+        # same game, with inputs applied exactly at the given steps
+        pong, compensator = self.create_pong(), LagCompensator(0)
+        compensator.record(pong)
+        for step in range(steps):
+            if step in inputs:
+                pong.move_paddle(self.side, inputs[step])
+            self.run_for(1, pong, compensator)
+        return pong
+
+    def assertSamePaddle(self, expected: Pong, actual: Pong):
+        self.assertAlmostEqual(actual.paddle(self.side).y, expected.paddle(self.side).y)
+        self.assertEqual(actual.paddle(self.side).speed, expected.paddle(self.side).speed)
+
+    def test_unstamped_inputs_are_applied_immediately(self):
+        self.compensator.record(self.pong)
+        self.run_for(10)
+        rewound = self.compensator.move_paddle(self.pong, self.side, Direction.UP)
+        self.assertEqual(rewound, 0)
+        self.run_for(10)
+        self.assertSamePaddle(self.reference({10: Direction.UP}, 20), self.pong)
+
+    def test_late_inputs_are_backdated(self):
+        self.compensator.record(self.pong)
+        self.run_for(20)
+        rewound = self.compensator.move_paddle(self.pong, self.side, Direction.UP, input_time=self.pong.time - 0.1)
+        self.assertAlmostEqual(rewound, 0.1)
+        self.run_for(10)
+        self.assertSamePaddle(self.reference({10: Direction.UP}, 30), self.pong)
+        self.assertEqual(self.compensator.compensated, 1)
+
+    def test_later_inputs_are_replayed(self):
+        self.compensator.record(self.pong)
+        self.run_for(15)
+        self.compensator.move_paddle(self.pong, self.side, Direction.NONE)
+        self.run_for(5)
+        self.compensator.move_paddle(self.pong, self.side, Direction.UP, input_time=self.pong.time - 0.1)
+        self.run_for(10)
+        self.assertSamePaddle(self.reference({10: Direction.UP, 15: Direction.NONE}, 30), self.pong)
+
+    def test_successive_late_inputs_rewind_to_compensated_states(self):
+        self.compensator.record(self.pong)
+        self.run_for(20)
+        self.compensator.move_paddle(self.pong, self.side, Direction.UP, input_time=0.10)
+        self.run_for(2)
+        self.compensator.move_paddle(self.pong, self.side, Direction.NONE, input_time=0.15)
+        self.run_for(8)
+        self.assertSamePaddle(self.reference({10: Direction.UP, 15: Direction.NONE}, 30), self.pong)
+        self.assertAlmostEqual(self.pong.paddle(self.side).y, 294.0)
+
+    def test_rewind_is_bounded(self):
+        self.compensator.record(self.pong)
+        self.run_for(50)
+        rewound = self.compensator.move_paddle(self.pong, self.side, Direction.UP, input_time=0)
+        self.assertAlmostEqual(rewound, 0.2)
+        self.assertEqual(self.compensator.clamped, 1)
+        self.assertSamePaddle(self.reference({30: Direction.UP}, 50), self.pong)
+
+    def test_inputs_from_the_future_are_applied_immediately(self):
+        self.compensator.record(self.pong)
+        self.run_for(10)
+        rewound = self.compensator.move_paddle(self.pong, self.side, Direction.DOWN, input_time=self.pong.time + 1)
+        self.assertEqual(rewound, 0)
+        self.assertEqual(self.compensator.compensated, 0)
@@ -0,0 +1,49 @@
+import unittest
+from pygame.event import Event
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent, EventHandler, LocalEventQueue, create_event
+
+
+class RecordingHandler(EventHandler):
+    def __init__(self, pong: Pong):
+        super().__init__(pong)
+        self.event_queue = LocalEventQueue()
+        self.calls: list[tuple] = []
+
+    def on_player_join(self, pong: Pong, paddle_index: Direction):
+        self.calls.append(('join', paddle_index))
+
+    def on_game_over(self, pong: Pong):
+        self.calls.append(('over',))
+
+    def on_paddle_move(self, pong: Pong, paddle_index: Direction, direction: Direction, input_seq: int = None):
+        self.calls.append(('move', paddle_index, direction, input_seq))
+
+
+class TestEventDispatch(unittest.TestCase):
+    def setUp(self):
+        self.handler = RecordingHandler(Pong(size=(800, 600)))
+
+    def test_events_reach_overridden_handlers(self):
+        for event in (Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT),
+                      Event(ControlEvent.PADDLE_MOVE.value, paddle_index=Direction.LEFT, direction=Direction.UP, input_seq=3),
+                      Event(ControlEvent.SNAPSHOT_ACK.value, seq=1),
+                      Event(ControlEvent.GAME_OVER.value)):
+            self.handler.event_queue.post(event)
+        self.handler.handle_events()
+        self.assertEqual(self.handler.calls, [('join', Direction.LEFT), ('move', Direction.LEFT, Direction.UP, 3), ('over',)])
+
+    def test_lookup_by_value(self):
+        for control_event in ControlEvent.all():
+            self.assertIs(ControlEvent.by_value(control_event.value), control_event)
+            self.assertTrue(ControlEvent.is_control_event(Event(control_event.value)))
+        with self.assertRaises(KeyError):
+            ControlEvent.by_value(-1)
+        self.assertFalse(ControlEvent.is_control_event(Event(ControlEvent.PLAYER_JOIN.value + 1000)))
+
+    def test_events_are_copied_only_when_extended(self):
+        event = Event(ControlEvent.SNAPSHOT_ACK.value, seq=1)
+        self.assertIs(create_event(event), event)
+        extended = create_event(event, room='a')
+        self.assertEqual(extended.dict, dict(seq=1, room='a'))
+        self.assertEqual(event.dict, dict(seq=1))
@@ -0,0 +1,107 @@
+import unittest
+from dpongpy.model import *
+from dpongpy.remote.delta import *
+import dpongpy.remote.presentation as presentation
+
+
+class TestSnapshotDeltas(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong(size=(800, 600), paddles=[Direction.LEFT, Direction.UP])
+        self.pong.ball.speed = Vector2(10, 5)
+
+    def test_round_trip(self):
+        self.pong.update(0.5)
+        self.assertEqual(to_pong(flatten(self.pong)), self.pong)
+
+    def test_delta_only_contains_changes(self):
+        base = flatten(self.pong)
+        self.pong.update(0.5)
+        delta = diff(base, flatten(self.pong))
+        self.assertEqual(set(delta), {'time', 'updates', 'ball.position'})
+        self.assertEqual(to_pong(patch(base, delta)), self.pong)
+
+    def test_removed_paddle(self):
+        base = flatten(self.pong)
+        self.pong.remove_paddle(Direction.UP)
+        delta = diff(base, flatten(self.pong))
+        self.assertEqual(delta, {key: None for key in PADDLE_KEYS[Direction.UP]})
+        self.assertEqual(to_pong(patch(base, delta)), self.pong)
+
+    def test_delta_is_serializable(self):
+        base = flatten(self.pong)
+        self.pong.update(0.5)
+        self.pong.remove_paddle(Direction.UP)
+        delta = diff(base, flatten(self.pong))
+        for serializer, deserializer in presentation.CODECS.values():
+            with self.subTest(serializer=type(serializer).__name__):
+                serialized = presentation.serialize(delta, serializer)
+                self.assertEqual(presentation.deserialize(serialized, deserializer), delta)
+
+
+class TestSnapshotCodecs(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong(size=(800, 600))
+        self.pong.ball.speed = Vector2(10, 5)
+        self.encoder = SnapshotEncoder(keyframe_interval=10)
+        self.decoder = SnapshotDecoder()
+
+    def send(self, acked):
+        self.pong.update(0.1)
+        seq = self.encoder.push(self.pong)
+        base = self.encoder.base_for(acked)
+        return seq, base, self.encoder.delta(base)
+
+    def test_first_snapshot_is_keyframe(self):
+        seq, base, delta = self.send(acked=None)
+        self.assertIsNone(base)
+        self.assertEqual(to_pong(self.decoder.decode(seq, base, delta)), self.pong)
+
+    def test_deltas_are_relative_to_acknowledged_snapshot(self):
+        acked = None
+        for _ in range(25):
+            seq, base, delta = self.send(acked)
+            self.assertEqual(base is None, acked is None or seq % 10 == 0)
+            self.assertEqual(to_pong(self.decoder.decode(seq, base, delta)), self.pong)
+            if seq % 3 == 0: # some acks get lost
+                acked = seq
+
+    def test_unknown_base_is_not_decodable(self):
+        self.send(acked=None) # lost
+        seq, base, delta = self.send(acked=0)
+        self.assertEqual(base, 0)
+        self.assertIsNone(self.decoder.decode(seq, base, delta))
+        self.assertEqual(self.decoder.undecodable, 1)
+
+    def test_history_is_bounded(self):
+        encoder = SnapshotEncoder(keyframe_interval=1000, history_size=4)
+        for _ in range(10):
+            encoder.push(self.pong)
+        self.assertIsNone(encoder.base_for(5))
+        self.assertEqual(encoder.base_for(6), 6)
+
+
+class TestInPlaceApplication(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong(size=(800, 600), paddles=[Direction.LEFT, Direction.UP])
+        self.pong.ball.speed = Vector2(10, 5)
+        self.target = Pong(size=(800, 600), paddles=[Direction.LEFT, Direction.RIGHT])
+
+    def test_apply_reuses_objects(self):
+        ball, left, board = self.target.ball, self.target.paddle(Direction.LEFT), self.target.board
+        self.pong.update(0.5)
+        self.pong.move_paddle(Direction.LEFT, Direction.DOWN)
+        self.assertIs(apply(self.target, flatten(self.pong)), self.target)
+        self.assertEqual(self.target, self.pong)
+        self.assertIs(self.target.ball, ball)
+        self.assertIs(self.target.paddle(Direction.LEFT), left)
+        self.assertIs(self.target.board, board)
+
+    def test_apply_adds_and_removes_paddles(self):
+        apply(self.target, flatten(self.pong))
+        self.assertEqual([paddle.side for paddle in self.target.paddles], [Direction.LEFT, Direction.UP])
+
+    def test_apply_resizes_board(self):
+        pong = Pong(size=(400, 300))
+        apply(self.target, flatten(pong))
+        self.assertEqual(self.target, pong)
+        self.assertEqual(self.target.board, pong.board)
@@ -0,0 +1,100 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import unittest
+import threading
+import time
+import pygame
+from pygame.event import Event
+from dpongpy import Settings
+from dpongpy.controller import ControlEvent
+from dpongpy.remote.udp import Address
+from dpongpy.remote.presentation import serialize
+from dpongpy.remote.centralised.directory import Directory, request_room, REPORT_TIMEOUT
+from dpongpy.remote.centralised.rooms import MultiRoomCoordinator
+
+
+class TestAssignments(unittest.TestCase):
+    TEST_PORT = 54340
+
+    def setUp(self):
+        self.directory = Directory(self.TEST_PORT)
+        self.busy = Address('127.0.0.1', 10001)
+        self.idle = Address('127.0.0.1', 10002)
+
+    def tearDown(self):
+        self.directory.server.close()
+
+    def test_no_coordinators(self):
+        self.assertIsNone(self.directory.assign())
+
+    def test_new_rooms_go_to_least_loaded_coordinator(self):
+        self.directory.update(self.busy, {'a': 2}, capacity=4, load=0.5)
+        self.directory.update(self.idle, {}, capacity=4, load=0.1)
+        self.assertEqual(self.directory.assign(), (self.idle, 'room-1'))
+
+    def test_waiting_rooms_are_filled_first(self):
+        self.directory.update(self.busy, {'a': 1}, capacity=4, load=0.5)
+        self.directory.update(self.idle, {}, capacity=4, load=0.1)
+        self.assertEqual(self.directory.assign(), (self.busy, 'a'))
+        self.assertEqual(self.directory.assign(), (self.idle, 'room-1'))
+        self.assertEqual(self.directory.assign(), (self.idle, 'room-1'))
+
+    def test_named_rooms_are_found(self):
+        self.directory.update(self.busy, {'a': 2}, capacity=4, load=0.5)
+        self.directory.update(self.idle, {}, capacity=4, load=0.1)
+        self.assertEqual(self.directory.assign('a'), (self.busy, 'a'))
+        self.assertEqual(self.directory.assign('b'), (self.idle, 'b'))
+
+    def test_full_coordinators_are_skipped(self):
+        self.directory.update(self.idle, {'a': 2}, capacity=1, load=0.1)
+        self.assertIsNone(self.directory.assign())
+
+    def test_new_rooms_are_not_named_after_existing_ones(self):
+        # e.g. after a restart of the directory
+        self.directory.update(self.busy, {'room-1': 2, 'room-2': 2}, capacity=4, load=0.5)
+        self.assertEqual(self.directory.assign(), (self.busy, 'room-3'))
+
+    def test_malformed_messages_are_discarded(self):
+        for event in (Event(ControlEvent.COORDINATOR_REPORT.value, rooms=[1], capacity=4, load=0.1),
+                      Event(ControlEvent.COORDINATOR_REPORT.value, rooms={'a': 'many'}, capacity=4, load=0.1),
+                      Event(ControlEvent.COORDINATOR_REPORT.value, rooms={}),
+                      Event(ControlEvent.ROOM_REQUEST.value, room=5)):
+            with self.subTest(event=event):
+                with self.assertRaises(ValueError):
+                    self.directory._handle_ingoing_message(serialize(event).encode(), self.busy)
+        self.assertEqual(self.directory.coordinators, {})
+
+    def test_silent_coordinators_are_forgotten(self):
+        self.directory.update(self.idle, {}, capacity=1, load=0.1, now=0)
+        self.assertIsNone(self.directory.assign(now=REPORT_TIMEOUT + 1))
+        self.assertEqual(self.directory.coordinators, {})
+
+
+class TestDirectoryOnLocalhost(unittest.TestCase):
+    DIRECTORY_PORT = 54341
+    COORDINATOR_PORT = 54342
+
+    def setUp(self):
+        pygame.init()
+        self.directory = Directory(self.DIRECTORY_PORT)
+        self.thread = threading.Thread(target=self.directory.run, daemon=True)
+        self.thread.start()
+        settings = Settings(port=self.COORDINATOR_PORT, max_rooms=2, directory=f"localhost:{self.DIRECTORY_PORT}")
+        self.coordinator = MultiRoomCoordinator(settings)
+
+    def tearDown(self):
+        self.coordinator.server.close()
+        self.directory.stop()
+        self.thread.join(timeout=5)
+        pygame.quit()
+
+    def test_terminals_are_sent_to_reporting_coordinators(self):
+        with self.assertRaises(ConnectionError):
+            request_room(Address('localhost', self.DIRECTORY_PORT))
+        self.coordinator._report()
+        time.sleep(0.1)
+        coordinator, room = request_room(Address('localhost', self.DIRECTORY_PORT))
+        self.assertEqual(coordinator.port, self.COORDINATOR_PORT)
+        self.assertEqual(room, 'room-1')
+        self.assertEqual(request_room(Address('localhost', self.DIRECTORY_PORT))[1], 'room-1')
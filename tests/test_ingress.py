@@ -0,0 +1,82 @@
+import unittest
+import threading
+from pygame.event import Event
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent
+from dpongpy.remote.ingress import IngressQueue
+
+
+ALL = tuple(ControlEvent.all_types())
+
+
+def move(side: Direction, direction: Direction, **kwargs) -> Event:
+    return Event(ControlEvent.PADDLE_MOVE.value, paddle_index=side, direction=direction, **kwargs)
+
+
+def join(side: Direction) -> Event:
+    return Event(ControlEvent.PLAYER_JOIN.value, paddle_index=side)
+
+
+class TestIngressQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = IngressQueue(capacity=4)
+
+    def test_moves_are_coalesced_per_paddle(self):
+        events = [join(Direction.LEFT), move(Direction.LEFT, Direction.UP), move(Direction.RIGHT, Direction.UP),
+                  move(Direction.LEFT, Direction.NONE)]
+        for event in events:
+            self.queue.post(event)
+        self.assertEqual(self.queue.get(ALL), [events[0], events[3], events[2]])
+        self.assertEqual(self.queue.stats.coalesced, 1)
+        self.assertEqual(len(self.queue), 0)
+
+    def test_resent_moves_do_not_supersede_newer_ones(self):
+        newer, resent = move(Direction.LEFT, Direction.UP, input_seq=2), move(Direction.LEFT, Direction.DOWN, input_seq=1)
+        self.queue.post(newer)
+        self.queue.post(resent)
+        self.assertEqual(self.queue.get(ALL), [newer])
+
+    def test_stamped_moves_are_not_coalesced(self):
+        events = [move(Direction.LEFT, Direction.UP, input_seq=1, input_time=1.0),
+                  move(Direction.LEFT, Direction.NONE, input_seq=2, input_time=1.1)]
+        for event in events:
+            self.queue.post(event)
+        self.assertEqual(self.queue.get(ALL), events)
+        self.assertEqual(self.queue.stats.coalesced, 0)
+
+    def test_moves_do_not_overtake_joins_and_leaves(self):
+        leave = Event(ControlEvent.PLAYER_LEAVE.value, paddle_index=Direction.LEFT)
+        events = [move(Direction.LEFT, Direction.UP, input_seq=7), leave, join(Direction.LEFT),
+                  move(Direction.LEFT, Direction.DOWN, input_seq=1)]
+        for event in events:
+            self.queue.post(event)
+        self.assertEqual(self.queue.get(ALL), events)
+
+    def test_only_moves_are_refused_when_full(self):
+        for _ in range(4):
+            self.queue.post(move(Direction.LEFT, Direction.UP))
+        self.assertEqual(self.queue.backpressure, 1.0)
+        self.queue.post(move(Direction.LEFT, Direction.DOWN))
+        self.queue.post(join(Direction.RIGHT))
+        self.assertEqual(self.queue.stats.dropped, 1)
+        self.assertEqual(self.queue.stats.forced, 1)
+        self.assertEqual(self.queue.get(ALL), [move(Direction.LEFT, Direction.UP), join(Direction.RIGHT)])
+        self.assertEqual(self.queue.stats.high_watermark, 5)
+
+    def test_other_types_are_kept_for_later(self):
+        self.queue.post(join(Direction.LEFT))
+        self.queue.post(move(Direction.LEFT, Direction.UP))
+        self.assertEqual(self.queue.get((ControlEvent.PADDLE_MOVE.value,)), [move(Direction.LEFT, Direction.UP)])
+        self.assertEqual(self.queue.get(ALL), [join(Direction.LEFT)])
+
+    def test_concurrent_producer_loses_nothing(self):
+        queue = IngressQueue(capacity=100_000)
+        joins = [join(Direction.LEFT) for _ in range(20_000)]
+        producer = threading.Thread(target=lambda: [queue.post(event) for event in joins])
+        producer.start()
+        received = []
+        while producer.is_alive() or len(queue):
+            received.extend(queue.get(ALL))
+        producer.join()
+        received.extend(queue.get(ALL))
+        self.assertEqual(len(received), len(joins))
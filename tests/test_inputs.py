@@ -0,0 +1,39 @@
+import unittest
+from dpongpy.model import *
+from dpongpy.remote.inputs import InputBatcher
+
+
+class TestInputBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batcher = InputBatcher(redundancy=2)
+
+    def test_one_packet_per_frame(self):
+        self.assertIsNone(self.batcher.packet())
+        self.batcher.input(Direction.UP, stamp=1.0)
+        self.batcher.input(Direction.NONE, stamp=1.5)
+        self.assertEqual(self.batcher.packet(), [[1, Direction.UP, 1.0], [2, Direction.NONE, 1.5]])
+        self.assertIsNone(self.batcher.packet())
+        self.assertEqual(self.batcher.packets, 1)
+
+    def test_packets_carry_recent_unacknowledged_inputs(self):
+        for direction in (Direction.UP, Direction.NONE, Direction.DOWN):
+            self.batcher.input(direction)
+        self.assertEqual([seq for seq, _, _ in self.batcher.packet()], [2, 3])
+        self.batcher.acknowledge(2)
+        self.batcher.input(Direction.NONE)
+        self.assertEqual([seq for seq, _, _ in self.batcher.packet()], [3, 4])
+
+    def test_unacknowledged_inputs_are_resent(self):
+        self.batcher.input(Direction.UP)
+        self.assertIsNotNone(self.batcher.packet(resend_interval=0.1))
+        self.batcher.advance(0.05)
+        self.assertIsNone(self.batcher.packet(resend_interval=0.1))
+        self.batcher.advance(0.05)
+        self.assertEqual(self.batcher.packet(resend_interval=0.1), [[1, Direction.UP, None]])
+        self.batcher.acknowledge(1)
+        self.batcher.advance(1)
+        self.assertIsNone(self.batcher.packet(resend_interval=0.1))
+
+    def test_sequence_numbers_can_be_given(self):
+        self.assertEqual(self.batcher.input(Direction.UP, seq=7), 7)
+        self.assertEqual(self.batcher.input(Direction.NONE), 8)
@@ -0,0 +1,87 @@
+import unittest
+from dpongpy.model import *
+from dpongpy.remote.delta import flatten, BALL_KEYS, PADDLE_KEYS
+from dpongpy.remote.interpolation import InterpolationBuffer
+
+
+BALL = BALL_KEYS[1]
+LEFT = PADDLE_KEYS[Direction.LEFT][1]
+
+
+class TestInterpolationBuffer(unittest.TestCase):
+    snapshot_rate = 20
+    frame = 1 / 60
+
+    def setUp(self):
+        self.server = Pong(size=(800, 600), paddles=[Direction.LEFT, Direction.RIGHT])
+        self.server.reset_ball(Vector2(200, 100))
+        self.buffer = InterpolationBuffer(delay=0.1)
+
+    def snapshot(self) -> dict:
+        state = flatten(self.server)
+        self.server.update(1 / self.snapshot_rate)
+        return state
+
+    def test_interpolates_between_surrounding_snapshots(self):
+        first, second = self.snapshot(), self.snapshot()
+        self.buffer.push(first)
+        self.buffer.push(second)
+        self.buffer.time = first['time'] + 0.025
+        position = self.buffer.positions([BALL])[BALL]
+        self.assertEqual(position, first[BALL].lerp(second[BALL], 0.5))
+
+    def test_snapshots_are_kept_in_time_order(self):
+        first, second, third = self.snapshot(), self.snapshot(), self.snapshot()
+        for state in (first, third, second, second):
+            self.buffer.push(state)
+        self.assertEqual(len(self.buffer), 3)
+        self.buffer.time = second['time']
+        self.assertEqual(self.buffer.positions([BALL])[BALL], second[BALL])
+
+    def test_extrapolates_briefly_when_snapshots_are_missing(self):
+        state = self.snapshot()
+        self.buffer.push(state)
+        self.buffer.time = state['time'] + 0.05
+        self.assertEqual(self.buffer.positions([BALL])[BALL], state[BALL] + state[BALL_KEYS[2]] * 0.05)
+        self.buffer.time = state['time'] + 10
+        limit = state[BALL] + state[BALL_KEYS[2]] * self.buffer.max_extrapolation
+        self.assertEqual(self.buffer.positions([BALL])[BALL], limit)
+        self.assertEqual(self.buffer.extrapolated, 2)
+
+    def test_teleports_are_not_interpolated(self):
+        first = self.snapshot()
+        self.server.reset_ball(Vector2(200, 100))
+        second = self.snapshot()
+        self.buffer.push(first)
+        self.buffer.push(second)
+        self.buffer.time = first['time'] + 0.01
+        self.assertEqual(self.buffer.positions([BALL])[BALL], first[BALL])
+        self.buffer.time = first['time'] + 0.04
+        self.assertEqual(self.buffer.positions([BALL])[BALL], second[BALL])
+
+    def test_playback_lags_behind_by_delay(self):
+        # 20 snapshots per second, rendered at 60 frames per second
+        newest = None
+        for frame in range(120):
+            if frame % 3 == 0:
+                newest = self.snapshot()
+                self.buffer.push(newest)
+            self.buffer.advance(self.frame)
+            since_newest = (frame % 3 + 1) * self.frame
+            self.assertAlmostEqual(self.buffer.time, newest['time'] + since_newest - self.buffer.delay)
+        self.assertEqual(self.buffer.extrapolated, 0)
+
+    def test_own_paddle_can_be_excluded(self):
+        self.server.move_paddle(Direction.LEFT, Direction.UP)
+        self.server.move_paddle(Direction.RIGHT, Direction.DOWN)
+        first, second = self.snapshot(), self.snapshot()
+        self.buffer.push(first)
+        self.buffer.push(second)
+        self.buffer.time = first['time'] + 0.025
+        client = Pong(size=(800, 600), paddles=[Direction.LEFT, Direction.RIGHT])
+        own = client.paddle(Direction.LEFT).position
+        self.buffer.interpolate(client, exclude=[Direction.LEFT])
+        self.assertEqual(client.paddle(Direction.LEFT).position, own)
+        right = PADDLE_KEYS[Direction.RIGHT][1]
+        self.assertEqual(client.paddle(Direction.RIGHT).position, first[right].lerp(second[right], 0.5))
+        self.assertEqual(client.ball.position, first[BALL].lerp(second[BALL], 0.5))
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pygame.event import Event
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent, LocalEventQueue
+from dpongpy.controller.local import PongEventHandler
+from dpongpy.remote.delta import flatten
+from dpongpy.journal import MatchJournal, MatchReplay, room_journal, INDEX_SUFFIX
+
+
+class ServerLikeHandler(PongEventHandler):
+    def __init__(self, pong: Pong):
+        super().__init__(pong)
+        self.event_queue = LocalEventQueue()
+
+    def on_player_join(self, pong: Pong, paddle_index: Direction):
+        super().on_player_join(pong, paddle_index)
+        pong.reset_ball() # random, as on coordinators
+
+    def on_player_leave(self, pong: Pong, paddle_index: Direction):
+        pong.remove_paddle(paddle_index)
+        pong.reset_ball()
+
+
+class TestJournal(unittest.TestCase):
+    dt = 0.02
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'match.dpj')
+        self.pong = Pong(size=(800, 600), paddles=[])
+        self.handler = ServerLikeHandler(self.pong)
+        self.journal = MatchJournal(self.path, keyframe_interval=25)
+        self.journal.attach(self.handler)
+        self.states = self.record({0: [self.join(Direction.LEFT), self.join(Direction.RIGHT)],
+                                   10: [self.move(Direction.LEFT, Direction.UP)],
+                                   40: [self.move(Direction.LEFT, Direction.NONE), self.move(Direction.RIGHT, Direction.DOWN)],
+                                   60: [Event(ControlEvent.PLAYER_LEAVE.value, paddle_index=Direction.RIGHT)]}, ticks=100)
+        self.journal.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def join(self, side: Direction) -> Event:
+        return Event(ControlEvent.PLAYER_JOIN.value, paddle_index=side)
+
+    def move(self, side: Direction, direction: Direction) -> Event:
+        return Event(ControlEvent.PADDLE_MOVE.value, paddle_index=side, direction=direction)
+
+    def record(self, events: dict[int, list[Event]], ticks: int) -> dict[int, dict]:
+        # the state at some tick is the one after that update, and after the events dispatched before the next one
+        states = dict()
+        for tick in range(ticks):
+            for event in events.get(tick, []) + [Event(ControlEvent.TIME_ELAPSED.value, dt=self.dt)]:
+                self.handler.event_queue.post(event)
+                self.handler.handle_events()
+                states[self.pong.updates] = flatten(self.pong)
+        return states
+
+    def test_any_tick_can_be_reached(self):
+        replay = MatchReplay(self.path)
+        try:
+            self.assertEqual([tick for tick, _ in replay.keyframes], [0, 25, 50, 75, 100])
+            for tick in (1, 10, 24, 25, 26, 61, 99, 100, 37, 3):
+                with self.subTest(tick=tick):
+                    self.assertEqual(flatten(replay.seek(tick)), self.states[tick])
+        finally:
+            replay.close()
+
+    def test_replay_goes_through_all_ticks(self):
+        replay = MatchReplay(self.path)
+        try:
+            replay.seek(30)
+            while replay.step():
+                self.assertEqual(flatten(replay.pong), self.states[replay.tick])
+            self.assertEqual(replay.tick, 100)
+        finally:
+            replay.close()
+
+    def test_events_are_recorded(self):
+        replay = MatchReplay(self.path)
+        try:
+            events = replay.events()
+        finally:
+            replay.close()
+        self.assertEqual([(tick, ControlEvent.by_value(event.type)) for tick, event in events],
+                         [(0, ControlEvent.PLAYER_JOIN), (0, ControlEvent.PLAYER_JOIN), (10, ControlEvent.PADDLE_MOVE),
+                          (40, ControlEvent.PADDLE_MOVE), (40, ControlEvent.PADDLE_MOVE), (60, ControlEvent.PLAYER_LEAVE)])
+
+    def test_journals_survive_missing_indexes_and_truncation(self):
+        os.remove(self.path + INDEX_SUFFIX)
+        with open(self.path, 'r+b') as journal:
+            journal.truncate(os.path.getsize(self.path) - 5)
+        replay = MatchReplay(self.path)
+        try:
+            self.assertEqual([tick for tick, _ in replay.keyframes], [0, 25, 50, 75])
+            self.assertEqual(flatten(replay.seek(80)), self.states[80])
+            while replay.step():
+                pass
+            self.assertEqual(replay.tick, 100) # only the last keyframe was truncated
+        finally:
+            replay.close()
+
+    def test_journals_are_compact(self):
+        self.assertLess(os.path.getsize(self.path), 100 * 20 + 5 * 400)
+
+
+class TestJournalFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.prefix = os.path.join(self.directory, 'match')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_journals_are_never_overwritten(self):
+        MatchJournal(self.prefix).close()
+        with self.assertRaises(FileExistsError):
+            MatchJournal(self.prefix)
+        self.assertGreater(os.path.getsize(self.prefix), 0)
+
+    def test_reopened_rooms_get_a_journal_each(self):
+        journals = [room_journal(self.prefix, 'r') for _ in range(3)]
+        for journal in journals:
+            journal.close()
+        self.assertEqual(len({journal.path for journal in journals}), 3)
+
+    def test_room_ids_stay_within_the_directory(self):
+        journal = room_journal(self.prefix, '../x/y')
+        journal.close()
+        self.assertEqual(os.path.dirname(journal.path), self.directory)
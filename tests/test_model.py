@@ -225,6 +225,27 @@ class TestRectangle(unittest.TestCase):
             self.assertEqual(hits, {})
 
 
+class TestGameObject(unittest.TestCase):
+    def test_bounding_box_follows_moves(self):
+        obj = GameObject(size=(2, 2), position=(1, 1))
+        self.assertEqual(obj.bounding_box, Rectangle((0, 0), (2, 2)))
+        obj.position = Vector2(3, 3)
+        self.assertEqual(obj.bounding_box, Rectangle((2, 2), (4, 4)))
+        obj.size = Vector2(4, 4)
+        self.assertEqual(obj.bounding_box, Rectangle((1, 1), (5, 5)))
+        obj.speed = Vector2(1, 0)
+        obj.update(1)
+        self.assertEqual(obj.bounding_box, Rectangle((2, 1), (6, 5)))
+
+    def test_delegates_to_bounding_box(self):
+        obj = GameObject(size=(2, 2), position=(1, 1))
+        other = GameObject(size=(2, 2), position=(2, 1))
+        self.assertTrue(obj.overlaps(other))
+        self.assertEqual(obj.intersection_with(other), Rectangle((1, 0), (2, 2)))
+        self.assertEqual(obj.hits(other), {Direction.RIGHT: 1})
+        self.assertFalse(obj.is_inside(other))
+
+
 class TestPong(unittest.TestCase):
     def setUp(self) -> None:
         self.screen_size = Vector2(800, 600)
@@ -278,6 +299,15 @@ class TestPong(unittest.TestCase):
         self.assertEqual(self.pong.paddles[0].position.x, padding)
         self.assertEqual(self.pong.paddles[1].position.x, self.screen_size.x - padding)
 
+    def test_paddles_are_sorted_anticlockwise(self):
+        self.pong.add_paddle(Direction.UP)
+        self.pong.add_paddle(Direction.DOWN)
+        paddles = self.pong.paddles
+        self.assertEqual([p.side for p in paddles], [Direction.LEFT, Direction.DOWN, Direction.RIGHT, Direction.UP])
+        self.pong.remove_paddle(Direction.DOWN)
+        self.assertEqual([p.side for p in self.pong.paddles], [Direction.LEFT, Direction.RIGHT, Direction.UP])
+        self.assertEqual(len(paddles), 4)
+
     def test_update(self):
         self.pong.move_paddle(1, Direction.DOWN)
         self.pong.move_paddle(0, Direction.UP)
@@ -348,3 +378,59 @@ class TestPong(unittest.TestCase):
 
     def test_collision_with_right_paddle(self):
         self._test_collisions(Direction.RIGHT)
+
+
+class TestSweptCollisions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.screen_size = Vector2(800, 600)
+        self.pong = Pong(size=self.screen_size, config=Config(swept_collisions=True))
+        self.discrete_pong = Pong(size=self.screen_size)
+
+    def test_sweep(self):
+        rect = TestRectangle.rect(tl=(0, 0), size=(2, 2))
+        wall = TestRectangle.rect(tl=(10, -5), size=(1, 10))
+        with self.subTest(moving='towards the wall'):
+            self.assertEqual(rect.sweep(wall, Vector2(16, 0)), (0.5, Direction.RIGHT))
+        with self.subTest(moving='not enough to reach the wall'):
+            self.assertIsNone(rect.sweep(wall, Vector2(4, 0)))
+        with self.subTest(moving='away from the wall'):
+            self.assertIsNone(rect.sweep(wall, Vector2(-16, 0)))
+        with self.subTest(moving='past the wall'):
+            self.assertIsNone(rect.sweep(wall, Vector2(16, 20)))
+        with self.subTest(moving='diagonally towards the wall'):
+            self.assertEqual(rect.sweep(wall, Vector2(16, 2)), (0.5, Direction.RIGHT))
+
+    def _shoot_at_left_paddle(self, pong: Pong, dt=0.39):
+        paddle = pong.paddle(Direction.LEFT)
+        pong.ball.position = Vector2(self.screen_size.x / 2, paddle.y)
+        pong.ball.speed = Vector2(-1000, 0)
+        pong.update(dt)
+        return paddle
+
+    def test_discrete_collisions_tunnel_through_paddles(self):
+        paddle = self._shoot_at_left_paddle(self.discrete_pong)
+        self.assertLess(self.discrete_pong.ball.x, paddle.x)
+
+    def test_swept_collisions_do_not_tunnel_through_paddles(self):
+        paddle = self._shoot_at_left_paddle(self.pong)
+        self.assertGreater(self.pong.ball.x, paddle.x)
+        self.assertEqual(self.pong.ball.speed, Vector2(1000, 0))
+        contact_x = paddle.bounding_box.right + self.pong.ball.width / 2
+        expected_x = contact_x + (390 - (self.screen_size.x / 2 - contact_x))
+        self.assertAlmostEqual(self.pong.ball.x, expected_x)
+
+    def test_multiple_bounces_per_update(self):
+        for side in list(self.pong.paddles):
+            self.pong.remove_paddle(side.side)
+        self.pong.ball.speed = Vector2(2000, 0)
+        self.pong.update(1)
+        self.assertEqual(self.pong.ball.speed, Vector2(-2000, 0))
+        self.assertAlmostEqual(self.pong.ball.x, 710)
+
+    def test_swept_update_matches_discrete_update_at_high_fps(self):
+        self.discrete_pong.ball.speed = self.pong.ball.speed = Vector2(-100, 0)
+        for _ in range(100):
+            self.pong.update(1 / 60)
+            self.discrete_pong.update(1 / 60)
+        self.assertEqual(self.pong.ball.speed, self.discrete_pong.ball.speed)
+        self.assertAlmostEqual(self.pong.ball.x, self.discrete_pong.ball.x)
@@ -0,0 +1,60 @@
+import unittest
+from dpongpy.model import *
+from dpongpy.remote.delta import flatten, apply, INPUT_KEYS
+from dpongpy.remote.prediction import PaddlePredictor
+
+
+class TestPaddlePredictor(unittest.TestCase):
+    side = Direction.LEFT
+    dt = 0.01
+    latency = 0.05 # one way
+
+    def setUp(self):
+        self.server = Pong(size=(800, 600), paddles=[self.side])
+        self.server.reset_ball(Vector2(0))
+        self.client = apply(Pong(size=(800, 600), paddles=[]), flatten(self.server))
+        self.predictor = PaddlePredictor(self.side)
+
+    def test_input_is_applied_immediately(self):
+        self.predictor.input(self.client, Direction.UP)
+        self.assertEqual(self.client.paddle(self.side).speed.y, -120)
+        y = self.client.paddle(self.side).y
+        self.predictor.advance(self.client, 0.5)
+        self.assertAlmostEqual(self.client.paddle(self.side).y, y - 60)
+        self.assertEqual([pending.seq for pending in self.predictor.pending], [1])
+
+    def simulate(self, inputs: dict[int, Direction], steps: int):
+        to_server: list[tuple[float, int, Direction]] = []
+        to_client: list[tuple[float, dict]] = [] # snapshots in flight, with their arrival times
+        processed = 0
+        client_ys: list[float] = []
+        server_ys: list[float] = []
+        for step in range(steps):
+            time = step * self.dt
+            self.predictor.advance(self.client, self.dt)
+            if step in inputs:
+                seq = self.predictor.input(self.client, inputs[step])
+                to_server.append((time + self.latency, seq, inputs[step]))
+            while to_client and to_client[0][0] <= time + 1e-9:
+                apply(self.client, to_client[0][1])
+                self.predictor.reconcile(self.client, to_client.pop(0)[1][INPUT_KEYS[self.side]])
+            while to_server and to_server[0][0] <= time + 1e-9:
+                _, processed, direction = to_server.pop(0)
+                self.server.move_paddle(self.side, direction)
+            self.server.update(self.dt)
+            to_client.append((time + self.latency, flatten(self.server, {self.side: processed})))
+            client_ys.append(self.client.paddle(self.side).y)
+            server_ys.append(self.server.paddle(self.side).y)
+        return client_ys, server_ys
+
+    def test_prediction_is_ahead_of_coordinator_by_latency(self):
+        inputs = {10: Direction.UP, 50: Direction.NONE, 70: Direction.DOWN, 90: Direction.NONE}
+        client_ys, server_ys = self.simulate(inputs, 150)
+        ahead = round(self.latency / self.dt)
+        tolerance = 120 * self.dt * 2
+        for step in range(len(client_ys) - ahead):
+            with self.subTest(step=step):
+                self.assertAlmostEqual(client_ys[step], server_ys[step + ahead], delta=tolerance)
+        self.assertAlmostEqual(client_ys[-1], server_ys[-1])
+        self.assertEqual(self.predictor.pending, [])
+        self.assertAlmostEqual(self.predictor.rtt, 2 * self.latency, delta=self.dt * 1.5)
@@ -1,9 +1,12 @@
 import unittest
 from dpongpy import Pong
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent
 import dpongpy.remote.presentation as presentation
 from pygame.event import Event
 import json
 import pathlib
+from unittest.mock import patch
 
 
 DIR_CURRENT = pathlib.Path(__file__).parent
@@ -25,4 +28,104 @@ class TestPresentation(unittest.TestCase):
     def test_deserialize_event(self):
         actual = presentation.deserialize(self.serialized_event)
         expected = self.event
-        self.assertEqual(actual, expected)
\ No newline at end of file
+        self.assertEqual(actual, expected)
+
+class TestBinaryPresentation(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong(size=(800, 600), paddles=[Direction.LEFT, Direction.UP])
+        self.pong.ball.speed = (1, 1)
+        self.pong.update(1.5)
+        self.serializer = presentation.BINARY_SERIALIZER
+        self.deserializer = presentation.BINARY_DESERIALIZER
+
+    def assertRoundTrip(self, obj):
+        serialized = presentation.serialize(obj, self.serializer)
+        self.assertIsInstance(serialized, bytes)
+        self.assertEqual(serialized[0], presentation.BINARY_VERSION)
+        self.assertEqual(presentation.deserialize(serialized, self.deserializer), obj)
+        return serialized
+
+    def test_primitives_and_containers(self):
+        for obj in [None, True, False, 42, -1.5, "hello", [1, "a", None], {"key": [1.0, 2.0]}]:
+            with self.subTest(obj=obj):
+                self.assertRoundTrip(obj)
+
+    def test_model_objects(self):
+        for obj in [Vector2(1, 2), Rectangle((0, 0), (1, 2)), Direction.UP, ControlEvent.PADDLE_MOVE,
+                    Config(swept_collisions=True), self.pong.ball, self.pong.paddle(Direction.UP), self.pong]:
+            with self.subTest(obj=obj):
+                self.assertRoundTrip(obj)
+
+    def test_events(self):
+        events = [
+            Event(1, {"state": self.pong}),
+            Event(ControlEvent.PADDLE_MOVE.value, paddle_index=Direction.LEFT, direction=Direction.UP),
+            Event(ControlEvent.TIME_ELAPSED.value, dt=0.016, status=self.pong),
+        ]
+        for event in events:
+            with self.subTest(event=event):
+                self.assertRoundTrip(event)
+
+    def test_smaller_than_json(self):
+        event = Event(ControlEvent.TIME_ELAPSED.value, dt=0.016, status=self.pong)
+        binary = presentation.serialize(event, self.serializer)
+        self.assertLess(len(binary) * 4, len(presentation.serialize(event).encode()))
+
+    def test_version_mismatch(self):
+        serialized = bytearray(presentation.serialize(self.pong, self.serializer))
+        serialized[0] = presentation.BINARY_VERSION + 1
+        with self.assertRaises(ValueError):
+            presentation.deserialize(bytes(serialized), self.deserializer)
+
+
+class Score:
+    def __init__(self, points: dict):
+        self.points = points
+
+    def __eq__(self, other):
+        return isinstance(other, Score) and self.points == other.points
+
+
+class TestRegisteredTypes(unittest.TestCase):
+    def setUp(self):
+        self.score = Score({"left": 3, "right": Vector2(1, 2)})
+
+    def register(self, serializer, deserializer):
+        serializer.register(Score, lambda score: {"points": score.points})
+        deserializer.register(Score, lambda fields: Score(fields["points"]))
+
+    def test_json(self):
+        serializer, deserializer = presentation.Serializer(), presentation.Deserializer()
+        with self.assertRaises(NotImplementedError):
+            serializer.serialize(self.score)
+        self.register(serializer, deserializer)
+        serialized = serializer.serialize(self.score)
+        self.assertEqual(json.loads(serialized)["$type"], "Score")
+        self.assertEqual(deserializer.deserialize(serialized), self.score)
+
+    def test_binary(self):
+        serializer, deserializer = presentation.BinarySerializer(), presentation.BinaryDeserializer()
+        self.register(serializer, deserializer)
+        self.assertEqual(deserializer.deserialize(serializer.serialize([self.score])), [self.score])
+
+    def test_registration_overrides_cached_encoders(self):
+        serializer, deserializer = presentation.Serializer(), presentation.Deserializer()
+        ball = Ball(size=(1, 1))
+        self.assertEqual(json.loads(serializer.serialize(ball))["$type"], "Ball")
+        serializer.register(Ball, lambda ball: {"size": ball.size})
+        deserializer.register(Ball, lambda fields: Ball(fields["size"]))
+        self.assertEqual(json.loads(serializer.serialize(ball)), {"size": {"x": 1, "y": 1, "$type": "Vector2"}, "$type": "Ball"})
+        self.assertEqual(deserializer.deserialize(serializer.serialize(ball)), ball)
+
+    def test_register_in_all_codecs(self):
+        # registrations are global: fresh codecs keep them from leaking into other tests
+        fresh = {'json': (presentation.Serializer(), presentation.Deserializer()),
+                 'binary': (presentation.BinarySerializer(), presentation.BinaryDeserializer())}
+        with patch.dict(presentation.CODECS, fresh):
+            presentation.register(Score, lambda score: {"points": score.points}, lambda fields: Score(fields["points"]))
+            for serializer, deserializer in presentation.CODECS.values():
+                with self.subTest(serializer=type(serializer).__name__):
+                    serialized = presentation.serialize(self.score, serializer)
+                    self.assertEqual(presentation.deserialize(serialized, deserializer), self.score)
+        with self.assertRaises(NotImplementedError):
+            presentation.serialize(self.score)
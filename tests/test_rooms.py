@@ -0,0 +1,127 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import unittest
+import pygame
+import time
+from pygame.event import Event
+from dpongpy import Settings
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent, LocalEventQueue
+from dpongpy.remote.udp import UdpClient, Address
+from dpongpy.remote.presentation import serialize, deserialize
+from dpongpy.remote.centralised.rooms import MultiRoomCoordinator, DEFAULT_ROOM
+
+
+class TestLocalEventQueue(unittest.TestCase):
+    def test_only_requested_types_are_consumed(self):
+        queue = LocalEventQueue()
+        join = Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT)
+        move = Event(ControlEvent.PADDLE_MOVE.value, paddle_index=Direction.LEFT, direction=Direction.UP)
+        for event in (join, move, join):
+            queue.post(event)
+        self.assertEqual(queue.get((ControlEvent.PLAYER_JOIN.value,)), [join, join])
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(queue.get((ControlEvent.PADDLE_MOVE.value,)), [move])
+
+
+class TestMultiRoomCoordinator(unittest.TestCase):
+    TEST_PORT = 54324
+
+    def setUp(self):
+        pygame.init()
+        pygame.event.clear()
+        self.coordinator = MultiRoomCoordinator(Settings(port=self.TEST_PORT, max_rooms=2))
+        self.coordinator.dt = 0.01
+        self.alice = Address('localhost', 10001)
+        self.bob = Address('localhost', 10002)
+
+    def tearDown(self):
+        self.coordinator.server.close()
+        pygame.quit()
+
+    def join(self, sender: Address, side: Direction, room: str = None):
+        data = dict(paddle_index=side) if room is None else dict(paddle_index=side, room=room)
+        self.coordinator._route(Event(ControlEvent.PLAYER_JOIN.value, data), sender)
+
+    def test_rooms_are_independent(self):
+        self.join(self.alice, Direction.LEFT, room='a')
+        self.join(self.bob, Direction.RIGHT, room='b')
+        self.coordinator.run_frame()
+        rooms = self.coordinator.rooms
+        self.assertEqual(set(rooms.keys()), {'a', 'b'})
+        self.assertEqual([paddle.side for paddle in rooms['a'].pong.paddles], [Direction.LEFT])
+        self.assertEqual([paddle.side for paddle in rooms['b'].pong.paddles], [Direction.RIGHT])
+        self.assertEqual(rooms['a'].peers, {self.alice})
+        self.assertEqual(rooms['b'].peers, {self.bob})
+        self.assertEqual(pygame.event.get(list(ControlEvent.all_types())), [])
+
+    def test_messages_without_room_go_to_default_room(self):
+        self.join(self.alice, Direction.LEFT)
+        self.assertEqual(set(self.coordinator.rooms.keys()), {DEFAULT_ROOM})
+
+    def test_rooms_are_bounded(self):
+        for room in ('a', 'b', 'c'):
+            self.join(self.alice, Direction.LEFT, room=room)
+        self.assertEqual(set(self.coordinator.rooms.keys()), {'a', 'b'})
+
+    def test_empty_rooms_are_closed(self):
+        self.join(self.alice, Direction.LEFT, room='a')
+        self.coordinator.run_frame()
+        leave = Event(ControlEvent.PLAYER_LEAVE.value, paddle_index=Direction.LEFT, room='a')
+        self.coordinator._route(leave, self.alice)
+        self.coordinator.run_frame()
+        self.assertEqual(self.coordinator.rooms, {})
+
+    def test_repeated_joins_are_ignored(self):
+        for _ in range(2):
+            self.join(self.alice, Direction.LEFT, room='a')
+            self.coordinator.run_frame()
+        self.assertTrue(self.coordinator.rooms['a'].running)
+        self.assertEqual([paddle.side for paddle in self.coordinator.rooms['a'].pong.paddles], [Direction.LEFT])
+
+    def test_malformed_messages_do_not_stop_rooms(self):
+        self.join(self.alice, Direction.LEFT, room='a')
+        self.coordinator.run_frame()
+        client = UdpClient(Address('localhost', self.TEST_PORT))
+        try:
+            for message in (b'garbage', serialize([1, 2]),
+                            serialize(Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.RIGHT, room=5)),
+                            serialize(Event(ControlEvent.PLAYER_JOIN.value, paddle_index='right', room='b')),
+                            serialize(Event(ControlEvent.PADDLE_MOVE.value, paddle_index=Direction.LEFT,
+                                            direction=Direction.UP, extra=1, room='a')),
+                            serialize(Event(ControlEvent.TIME_ELAPSED.value, dt=10, room='a'))):
+                client.send(message)
+            time.sleep(0.05)
+            for _ in range(3):
+                self.coordinator.run_frame()
+        finally:
+            client.close()
+        self.assertEqual(set(self.coordinator.rooms.keys()), {'a'})
+        self.assertTrue(self.coordinator.rooms['a'].running)
+        self.assertLess(self.coordinator.rooms['a'].pong.time, 1)
+
+    def test_rooms_run_even_if_their_journal_cannot_be_opened(self):
+        self.coordinator.settings.journal = os.path.join(os.devnull, 'journal') # not a directory
+        self.join(self.alice, Direction.LEFT, room='a')
+        self.coordinator.run_frame()
+        self.assertIsNone(self.coordinator.rooms['a'].journal)
+        self.assertTrue(self.coordinator.rooms['a'].running)
+
+    def test_snapshots_reach_peers_of_each_room(self):
+        clients = {room: UdpClient(Address('localhost', self.TEST_PORT)) for room in ('a', 'b')}
+        try:
+            for room, client in clients.items():
+                join = Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT, room=room)
+                client.send(serialize(join))
+            time.sleep(0.05)
+            self.coordinator.run_frame()
+            for room, client in clients.items():
+                snapshot = deserialize(client.receive(timeout=1))
+                self.assertTrue(ControlEvent.TIME_ELAPSED.matches(snapshot))
+                self.assertIn('left.position', snapshot.delta)
+                self.assertNotIn('right.position', snapshot.delta)
+                self.assertIsNone(client.receive(timeout=0.05))
+        finally:
+            for client in clients.values():
+                client.close()
@@ -0,0 +1,129 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import unittest
+import pygame
+import time
+from pygame.event import Event
+from dpongpy import Settings
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent
+from dpongpy.remote.udp import UdpServer, Address
+from dpongpy.remote.presentation import serialize
+from dpongpy.remote.delta import flatten
+from dpongpy.remote.centralised import PongCoordinator
+from dpongpy.remote.centralised.spectators import PongRelay, PongSpectator, Subscription
+
+
+class TestSnapshotRates(unittest.TestCase):
+    TEST_PORT = 54350
+
+    def setUp(self):
+        pygame.init()
+        self.coordinator = PongCoordinator(Settings(port=self.TEST_PORT))
+        self.sent: list[Address] = []
+        self.coordinator.server.send = lambda payload, address: self.sent.append(address)
+
+    def tearDown(self):
+        self.coordinator.running = False
+        self.coordinator.server.close()
+        pygame.quit()
+
+    def test_spectators_may_ask_for_fewer_snapshots(self):
+        player, spectator = Address('localhost', 10001), Address('localhost', 10002)
+        self.coordinator.add_peer(player)
+        self.coordinator._handle_ingoing_event(Event(ControlEvent.SPECTATE.value, rate=10), spectator)
+        for _ in range(100):
+            self.coordinator.dt = 0.01
+            self.coordinator.run_frame()
+        self.assertEqual(self.sent.count(player), 100)
+        self.assertIn(self.sent.count(spectator), {10, 11})
+
+
+class TestSubscription(unittest.TestCase):
+    def test_subscriptions_are_resent_while_silent(self):
+        subscription = Subscription(interval=1.0)
+        self.assertTrue(subscription.due(0))
+        self.assertFalse(subscription.due(0.5))
+        self.assertTrue(subscription.due(0.5))
+        subscription.received()
+        self.assertFalse(subscription.due(0.9))
+
+
+class TestRelays(unittest.TestCase):
+    COORDINATOR_PORT = 54351
+    RELAY_PORT = 54352
+
+    # coordinators keep their ports bound while receiving, hence they are shared by all tests
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.event.clear()
+        cls.coordinator = PongCoordinator(Settings(port=cls.COORDINATOR_PORT))
+        cls.relay = PongRelay(Settings(port=cls.RELAY_PORT, upstream=f"localhost:{cls.COORDINATOR_PORT}"))
+        cls.spectator = PongSpectator(Settings(port=cls.RELAY_PORT, gui=False))
+        cls.player = Address('localhost', 10001)
+
+    @classmethod
+    def tearDownClass(cls):
+        for game in (cls.coordinator, cls.relay):
+            game.running = False
+            game.server.close()
+        cls.relay.upstream.close()
+        cls.spectator.client.close()
+        pygame.quit()
+
+    def test_relays_are_read_only(self):
+        join = Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT)
+        self.relay._handle_ingoing_event(join, self.player)
+        self.assertNotIn(self.player, self.relay.peers)
+        self.assertEqual(len(self.relay.ingress), 0)
+
+    def test_spectators_follow_the_game_through_relays(self):
+        self.coordinator._handle_ingoing_event(Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT), self.player)
+        self.spectator.before_run()
+        for _ in range(50):
+            for game in (self.coordinator, self.relay, self.spectator):
+                game.dt = 0.02
+                game.run_frame()
+            time.sleep(0.005)
+        self.assertEqual(len(self.coordinator.peers), 2) # the player and the relay, but not the spectator
+        self.assertEqual(len(self.relay.peers), 1)
+        self.assertGreater(self.spectator.stats.received, 0)
+        self.assertEqual([paddle.side for paddle in self.spectator.pong.paddles], [Direction.LEFT])
+        self.assertAlmostEqual(self.spectator.pong.time, self.coordinator.pong.time, delta=0.1)
+
+
+class TestRelayUpstreamRestarts(unittest.TestCase):
+    UPSTREAM_PORT = 54353
+    RELAY_PORT = 54354
+    upstream: UdpServer
+    relay: PongRelay
+    relay_address: Address
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.upstream = UdpServer(cls.UPSTREAM_PORT)
+        cls.relay = PongRelay(Settings(port=cls.RELAY_PORT, upstream=f"localhost:{cls.UPSTREAM_PORT}"))
+        cls.relay_address = Address('localhost', cls.relay.upstream.local_address.port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.relay.running = False
+        cls.relay.server.close()
+        cls.relay.upstream.close()
+        cls.upstream.close()
+        pygame.quit()
+
+    def follow(self, seq: int):
+        keyframe = Event(ControlEvent.TIME_ELAPSED.value, dt=0.1, seq=seq, base=None, delta=flatten(Pong(size=(800, 600))))
+        self.upstream.send(self.relay_address, serialize(keyframe))
+        time.sleep(0.05) # let the datagram reach the relay
+        self.relay._follow_upstream(0)
+
+    def test_restarted_upstreams_are_followed(self):
+        self.follow(1000)
+        self.assertEqual(self.relay._upstream_seq, 1000)
+        self.follow(0)
+        self.assertEqual(self.relay._upstream_seq, 0)
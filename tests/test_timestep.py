@@ -0,0 +1,45 @@
+import unittest
+from dpongpy import FixedTimestep
+from dpongpy.model import *
+from dpongpy.view import ShowNothingPongView
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def setUp(self) -> None:
+        self.timestep = FixedTimestep(tick_rate=20, max_ticks_per_frame=3)
+
+    def test_ticks_are_independent_of_frame_rate(self):
+        ticks = sum(self.timestep.advance(1 / 144) for _ in range(144))
+        self.assertIn(ticks, {19, 20})
+        ticks = sum(self.timestep.advance(1 / 10) for _ in range(10))
+        self.assertIn(ticks, {20, 21})
+
+    def test_interpolation(self):
+        self.assertEqual(self.timestep.advance(0.025), 0)
+        self.assertAlmostEqual(self.timestep.interpolation, 0.5)
+        self.assertEqual(self.timestep.advance(0.05), 1)
+        self.assertAlmostEqual(self.timestep.interpolation, 0.5)
+
+    def test_catch_up_is_capped(self):
+        self.assertEqual(self.timestep.advance(10), 3)
+        self.assertLess(self.timestep.accumulator, self.timestep.step)
+        self.assertEqual(self.timestep.advance(0), 0)
+
+
+class TestViewInterpolation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pong = Pong(size=(800, 600))
+        self.view = ShowNothingPongView(self.pong)
+
+    def test_position_without_previous_state(self):
+        self.view._interpolation = 0.5
+        self.assertIs(self.view.position_of(self.pong.ball), self.pong.ball.position)
+
+    def test_position_is_interpolated(self):
+        self.pong.ball.speed = Vector2(10, 0)
+        before = self.pong.ball.position
+        self.view.before_update()
+        self.pong.update(1)
+        self.view._interpolation = 0.25
+        self.assertEqual(self.view.position_of(self.pong.ball), before + Vector2(2.5, 0))
+        self.assertEqual(self.view.bounding_box_of(self.pong.ball).position, before + Vector2(2.5, 0))
@@ -1,6 +1,8 @@
 import unittest
 from dpongpy.remote.udp import *
+from dpongpy.remote.aioudp import *
 from typing import Optional
+import asyncio
 
 
 class BaseUdpTest(unittest.TestCase):
@@ -55,4 +57,44 @@ class TestUdpServerListening(BaseUdpTest):
                 self.assertEqual(server_session.remote_address.port, client.local_address.port)
                 self.assertEqual(server_session.receive(), self.message1)
                 server_session.send(self.message2)
-                self.assertEqual(client.receive(), self.message2)   
+                self.assertEqual(client.receive(), self.message2)
+
+
+class TestAsyncUdpClientAndServer(unittest.IsolatedAsyncioTestCase):
+    TEST_PORT = 54322
+    server_address = Address('localhost', TEST_PORT)
+    message1 = "Hello, World!"
+    message2 = "Goodbye, World!"
+
+    async def asyncSetUp(self) -> None:
+        self.server = AsyncUdpServer(self.TEST_PORT)
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+
+    def test_server_is_initially_bound(self):
+        self.assertEqual(self.server.local_address, Address('0.0.0.0', self.TEST_PORT))
+
+    async def test_communication(self):
+        async with AsyncUdpClient(self.server_address) as client:
+            client.send(self.message1)
+            message, sender = await self.server.receive()
+            self.assertEqual(self.message1, message)
+            self.server.send(sender, self.message2)
+            self.assertEqual(await client.receive(), self.message2)
+
+    async def test_interoperability_with_blocking_client(self):
+        with UdpClient(self.server_address) as client:
+            client.send(self.message1.encode())
+            message, sender = await asyncio.wait_for(self.server.receive(decode=False), timeout=1)
+            self.assertEqual(self.message1.encode(), message)
+            self.assertEqual(sender.port, client.local_address.port)
+
+    async def test_server_listening(self):
+        async with AsyncUdpClient(self.server_address) as client:
+            client.send(self.message1)
+            async with await self.server.listen() as server_session:
+                self.assertEqual(server_session.remote_address.port, client.local_address.port)
+                self.assertEqual(await server_session.receive(), self.message1)
+                server_session.send(self.message2)
+                self.assertEqual(await client.receive(), self.message2)
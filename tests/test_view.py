@@ -0,0 +1,140 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import unittest
+import threading
+import pygame
+from dpongpy import PongGame, Settings
+from dpongpy.model import *
+from dpongpy.view import ScreenPongView, FramePublisher, Frame, rect
+
+
+class TestDirtyRects(unittest.TestCase):
+    size = (200, 100)
+
+    def setUp(self):
+        self.pong = Pong(size=self.size, paddles=[Direction.LEFT, Direction.RIGHT])
+        self.pong.reset_ball(Vector2(200, 100))
+
+    def views(self, debug: bool):
+        full = ScreenPongView(self.pong, screen=pygame.Surface(self.size), debug=debug)
+        dirty = ScreenPongView(self.pong, screen=pygame.Surface(self.size), debug=debug, dirty_rects=True)
+        return full, dirty
+
+    def assertSameScreen(self, view: ScreenPongView, other: ScreenPongView):
+        self.assertEqual(pygame.image.tobytes(view._screen, 'RGB'), pygame.image.tobytes(other._screen, 'RGB'))
+
+    def test_first_frame_is_fully_drawn(self):
+        _, dirty = self.views(debug=False)
+        dirty.render()
+        self.assertIsNone(dirty.dirty)
+
+    def test_dirty_frames_match_full_ones(self):
+        for debug in (False, True):
+            with self.subTest(debug=debug):
+                full, dirty = self.views(debug)
+                self.pong.move_paddle(Direction.LEFT, Direction.UP)
+                for _ in range(30):
+                    full.render()
+                    dirty.render()
+                    self.assertSameScreen(full, dirty)
+                    self.pong.update(0.05)
+
+    def test_only_moving_objects_are_updated(self):
+        _, dirty = self.views(debug=False)
+        dirty.render()
+        ball = rect(self.pong.ball.bounding_box)
+        self.pong.update(0.05)
+        dirty.render()
+        self.assertEqual(len(dirty.dirty), 2 * (1 + len(self.pong.paddles)))
+        self.assertTrue(any(region.contains(ball) for region in dirty.dirty))
+        screen = self.size[0] * self.size[1]
+        self.assertLess(sum(region.w * region.h for region in dirty.dirty), screen / 4)
+
+    def test_invalidated_views_are_fully_redrawn(self):
+        _, dirty = self.views(debug=False)
+        dirty.render()
+        dirty.render()
+        self.assertIsNotNone(dirty.dirty)
+        dirty.invalidate()
+        dirty.render()
+        self.assertIsNone(dirty.dirty)
+
+
+class TestSprites(unittest.TestCase):
+    size = (200, 100)
+
+    def setUp(self):
+        self.pong = Pong(size=self.size, paddles=[Direction.LEFT, Direction.RIGHT])
+        self.pong.reset_ball(Vector2(200, 100))
+        self.view = ScreenPongView(self.pong, screen=pygame.Surface(self.size))
+
+    def test_sprites_look_like_drawings(self):
+        expected = pygame.Surface(self.size)
+        pygame.draw.ellipse(expected, "white", rect(self.pong.ball.bounding_box), width=0)
+        for paddle in self.pong.paddles:
+            pygame.draw.rect(expected, "white", rect(paddle.bounding_box), width=0)
+        self.view.render()
+        self.assertEqual(pygame.image.tobytes(self.view._screen, 'RGB'), pygame.image.tobytes(expected, 'RGB'))
+
+    def test_sprites_are_rasterized_once_per_size(self):
+        for _ in range(10):
+            self.view.render()
+            self.pong.update(0.05)
+        self.assertEqual(self.view._sprites.rasterized, 2)
+        self.pong.ball.size = self.pong.ball.size * 2
+        self.view.render()
+        self.assertEqual(self.view._sprites.rasterized, 3)
+
+
+class TestFrames(unittest.TestCase):
+    def setUp(self):
+        self.pong = Pong(size=(200, 100))
+        self.pong.reset_ball(Vector2(200, 100))
+        self.publisher = FramePublisher(self.pong)
+
+    def test_frames_are_not_affected_by_later_updates(self):
+        self.publisher.before_update()
+        frame = Frame.of(self.pong, self.publisher._previous_positions)
+        ball = Vector2(self.pong.ball.position)
+        self.pong.move_paddle(Direction.LEFT, Direction.UP)
+        self.pong.update(0.1)
+        self.assertEqual(frame.ball.position, ball)
+        self.assertEqual(frame.previous_positions['ball'], ball)
+        self.assertEqual([paddle.speed for paddle in frame.paddles], [Vector2(0), Vector2(0)])
+
+    def test_only_latest_frame_is_kept(self):
+        self.assertIsNone(self.publisher.take())
+        self.publisher.render()
+        self.pong.update(0.1)
+        self.publisher.render(0.5)
+        frame = self.publisher.take()
+        self.assertEqual(frame.ball.position, self.pong.ball.position)
+        self.assertEqual(frame.interpolation, 0.5)
+        self.assertIsNone(self.publisher.take())
+        self.assertEqual((self.publisher.published, self.publisher.skipped), (2, 1))
+
+    def test_frames_are_shown_as_games(self):
+        screen = ScreenPongView(Pong(size=(200, 100), paddles=[]), screen=pygame.Surface((200, 100)))
+        expected = ScreenPongView(self.pong, screen=pygame.Surface((200, 100)))
+        self.publisher.render()
+        screen.show(self.publisher.take())
+        expected.render()
+        self.assertEqual(pygame.image.tobytes(screen._screen, 'RGB'), pygame.image.tobytes(expected._screen, 'RGB'))
+
+
+class TestPipelinedGame(unittest.TestCase):
+    def test_game_runs_aside_from_main_thread(self):
+        game = PongGame(Settings(size=(200, 100), fps=100, pipelined=True))
+        threads = set()
+        run_frame = game.run_frame
+        def recording_run_frame():
+            threads.add(threading.current_thread())
+            run_frame()
+            if game.pong.time > 0.2:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+        game.run_frame = recording_run_frame
+        game.run()
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertGreater(game.view.published, 0)
+        self.assertEqual([p.side for p in game.screen._pong.paddles], [Direction.LEFT, Direction.RIGHT])
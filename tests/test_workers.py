@@ -0,0 +1,93 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import unittest
+import threading
+import time
+from pygame.event import Event
+from dpongpy import Settings
+from dpongpy.model import *
+from dpongpy.controller import ControlEvent
+from dpongpy.remote.udp import UdpClient, Address
+from dpongpy.remote.presentation import serialize, deserialize
+from dpongpy.remote.centralised.workers import ShardedCoordinator, shard_for, worker_port
+
+
+TIMEOUT = 10
+
+
+def wait_until(condition, timeout: float = TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Condition not met in time")
+        time.sleep(0.05)
+
+
+class TestSharding(unittest.TestCase):
+    def test_rooms_stick_to_workers(self):
+        rooms = [f"room-{index}" for index in range(100)]
+        shards = [shard_for(room, 4) for room in rooms]
+        self.assertEqual(shards, [shard_for(room, 4) for room in rooms])
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+
+
+class TestShardedCoordinator(unittest.TestCase):
+    TEST_PORT = 54330
+    WORKERS = 2
+
+    def setUp(self):
+        self.coordinator = ShardedCoordinator(Settings(port=self.TEST_PORT, workers=self.WORKERS))
+        self.thread = threading.Thread(target=self.coordinator.run, daemon=True)
+        self.thread.start()
+        self.clients: list[UdpClient] = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        self.coordinator.stop()
+        self.thread.join(timeout=TIMEOUT)
+        self.assertFalse(self.thread.is_alive())
+        for worker in self.coordinator._workers:
+            self.assertFalse(worker is not None and worker.is_alive())
+
+    def join(self, room: str) -> tuple[UdpClient, Event]:
+        # workers may still be starting: joining is retried until a snapshot arrives
+        client = UdpClient(Address('localhost', self.TEST_PORT))
+        self.clients.append(client)
+        join = serialize(Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT, room=room))
+        deadline = time.monotonic() + TIMEOUT
+        while time.monotonic() < deadline:
+            client.send(join)
+            message = client.receive(timeout=0.5)
+            if message is not None:
+                return client, deserialize(message)
+        raise TimeoutError(f"No answer from room {room}")
+
+    def test_peers_are_served_by_the_worker_of_their_room(self):
+        rooms = {shard_for(room, self.WORKERS): room for room in ('a', 'b', 'c', 'd', 'e')}
+        self.assertEqual(len(rooms), self.WORKERS)
+        for index, room in rooms.items():
+            client, snapshot = self.join(room)
+            self.assertTrue(ControlEvent.TIME_ELAPSED.matches(snapshot))
+            self.assertEqual(client.remote_address.port, worker_port(self.TEST_PORT, index))
+
+    def test_malformed_messages_are_dropped(self):
+        client = UdpClient(Address('localhost', self.TEST_PORT))
+        self.clients.append(client)
+        for message in (b'garbage', serialize([1, 2]),
+                        serialize(Event(ControlEvent.PLAYER_JOIN.value, paddle_index=Direction.LEFT, room=5))):
+            client.send(message)
+        _, snapshot = self.join('a')
+        self.assertTrue(ControlEvent.TIME_ELAPSED.matches(snapshot))
+        self.assertTrue(self.thread.is_alive())
+        self.assertEqual(self.coordinator.restarts, 0)
+
+    def test_dead_workers_are_restarted(self):
+        wait_until(lambda: all(worker is not None and worker.is_alive() for worker in self.coordinator._workers))
+        worker = self.coordinator._workers[0]
+        worker.kill()
+        wait_until(lambda: self.coordinator.restarts == 1)
+        restarted = self.coordinator._workers[0]
+        self.assertNotEqual(restarted.pid, worker.pid)
+        self.assertTrue(restarted.is_alive())